@@ -0,0 +1,185 @@
+"""
+Compares decoding of Hamster API responses: the previous ``response.json()`` +
+pydantic path against the msgspec ``Struct`` decoders used by ``HamsterKombat``.
+
+Run from the project root:
+
+    python -m benchmarks.hamster_models [--upgrades 400] [--number 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import timeit
+from datetime import datetime
+from typing import Callable, Optional, Self
+
+from pydantic import BaseModel, Field, model_validator
+
+from src.hamster.models.responses import decode_clicker_user, decode_upgrades
+
+
+class LegacyCondition(BaseModel):
+    level: Optional[int] = 0
+    upgrade_type: Optional[str] = Field(None, alias="upgradeId")
+    link: Optional[str] = None
+    links: Optional[list] = None
+    type: Optional[str] = Field(None, alias="_type")
+
+
+class LegacyUpgrade(BaseModel):
+    type: str = Field(..., alias="id")
+    name: Optional[str] = None
+    condition: Optional[LegacyCondition] = None
+    section: Optional[str] = None
+    level: Optional[int] = 0
+    price: Optional[float] = 0.0
+    profit_per_time: Optional[float] = Field(0.0, alias="profitPerTime")
+    profit_per_hour: Optional[float] = Field(0.0, alias="profitPerHour")
+    cooldown_seconds: Optional[int] = Field(0, alias="cooldownSeconds")
+    is_expired: Optional[bool] = Field(None, alias="isExpired")
+    is_active: Optional[bool] = Field(None, alias="isAvailable")
+    snapshot_referrals_count: Optional[int] = Field(
+        None, alias="snapshotReferralsCount"
+    )
+    last_upgrade_at: Optional[float | datetime] = Field(None, alias="lastUpgradeAt")
+
+    @model_validator(mode="after")
+    def timestamp2datetime(self) -> Self:
+        if self.last_upgrade_at is not None and isinstance(self.last_upgrade_at, float):
+            self.last_upgrade_at = datetime.fromtimestamp(self.last_upgrade_at)
+
+        return self
+
+
+class LegacyUpgrades(BaseModel):
+    upgrades: Optional[list[LegacyUpgrade]] = Field(None, alias="upgradesForBuy")
+
+
+class LegacyData(BaseModel):
+    id: str
+    total_coins: Optional[float] = Field(0.0, alias="totalCoins")
+    balance_coins: Optional[float] = Field(0.0, alias="balanceCoins")
+    level: Optional[int] = Field(0, alias="level")
+    available_taps: Optional[int] = Field(0, alias="availableTaps")
+    last_sync_update: Optional[int] = Field(0, alias="lastSyncUpdate")
+    referrals_count: Optional[int] = Field(0, alias="referralsCount")
+    max_taps: Optional[int] = Field(0, alias="maxTaps")
+    earn_per_tap: Optional[int] = Field(0, alias="earnPerTap")
+    earn_passive_per_sec: Optional[float] = Field(0.0, alias="earnPassivePerSec")
+    earn_passive_per_hour: Optional[float] = Field(0.0, alias="earnPassivePerHour")
+    last_passive_earn: Optional[float] = Field(0.0, alias="lastPassiveEarn")
+    taps_recover_per_sec: Optional[float] = Field(0.0, alias="tapsRecoverPerSec")
+    upgrades: Optional[dict[str, LegacyUpgrade]] = None
+
+    @model_validator(mode="after")
+    def timestamp2datetime(self) -> Self:
+        if self.last_sync_update is not None:
+            self.last_sync_update = datetime.fromtimestamp(self.last_sync_update)
+
+        return self
+
+
+def build_upgrades_payload(count: int) -> bytes:
+    sections: list[str] = ["PR&Team", "Markets", "Legal", "Specials", "Web3"]
+    upgrades: list[dict] = []
+    for index in range(count):
+        upgrade: dict = {
+            "id": f"upgrade_{index}",
+            "name": f"Upgrade {index}",
+            "price": random.randint(1_000, 10_000_000),
+            "profitPerHour": random.randint(10, 100_000),
+            "profitPerHourDelta": random.randint(10, 10_000),
+            "section": random.choice(sections),
+            "level": random.randint(0, 25),
+            "currentProfitPerHour": random.randint(0, 100_000),
+            "isAvailable": random.random() > 0.2,
+            "isExpired": random.random() > 0.9,
+            "cooldownSeconds": random.choice([0, 0, 0, 3600]),
+            "lastUpgradeAt": 1_724_000_000.0 + index,
+        }
+        if index % 4 == 0:
+            upgrade["condition"] = {
+                "_type": "ByUpgrade",
+                "upgradeId": f"upgrade_{max(index - 1, 0)}",
+                "level": random.randint(1, 10),
+            }
+        upgrades.append(upgrade)
+
+    return json.dumps({"upgradesForBuy": upgrades, "sections": []}).encode()
+
+
+def build_clicker_user_payload(count: int) -> bytes:
+    return json.dumps(
+        {
+            "clickerUser": {
+                "id": "1",
+                "totalCoins": 123456789.5,
+                "balanceCoins": 12345678.5,
+                "level": 7,
+                "availableTaps": 1500,
+                "lastSyncUpdate": 1_724_000_000,
+                "maxTaps": 6500,
+                "earnPerTap": 12,
+                "earnPassivePerSec": 120.5,
+                "earnPassivePerHour": 433800.0,
+                "lastPassiveEarn": 1500.1,
+                "tapsRecoverPerSec": 12,
+                "upgrades": {
+                    f"upgrade_{index}": {
+                        "id": f"upgrade_{index}",
+                        "level": index % 20,
+                        "lastUpgradeAt": 1_724_000_000.0 + index,
+                        "snapshotReferralsCount": 0,
+                    }
+                    for index in range(count)
+                },
+            }
+        }
+    ).encode()
+
+
+def run(name: str, func: Callable[[], object], number: int) -> float:
+    elapsed: float = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {name:<22} {elapsed * 1_000_000:>10.1f} µs/response")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--upgrades", type=int, default=400)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    upgrades_payload: bytes = build_upgrades_payload(args.upgrades)
+    clicker_user_payload: bytes = build_clicker_user_payload(args.upgrades)
+
+    print(f"upgrades-for-buy ({args.upgrades} upgrades, {len(upgrades_payload)} B)")
+    legacy: float = run(
+        "json + pydantic",
+        lambda: LegacyUpgrades(**json.loads(upgrades_payload)),
+        args.number,
+    )
+    current: float = run(
+        "msgspec Struct", lambda: decode_upgrades.decode(upgrades_payload), args.number
+    )
+    print(f"  speedup: x{legacy / current:.1f}")
+
+    print(f"sync ({args.upgrades} upgrades, {len(clicker_user_payload)} B)")
+    legacy: float = run(
+        "json + pydantic",
+        lambda: LegacyData(**json.loads(clicker_user_payload)["clickerUser"]),
+        args.number,
+    )
+    current: float = run(
+        "msgspec Struct",
+        lambda: decode_clicker_user.decode(clicker_user_payload),
+        args.number,
+    )
+    print(f"  speedup: x{legacy / current:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Optional
 
-from apscheduler import AsyncScheduler
+from apscheduler import AsyncScheduler, SchedulerRole
 from apscheduler.datastores.sqlalchemy import SQLAlchemyDataStore
 from apscheduler.eventbrokers.asyncpg import AsyncpgEventBroker
 from pydantic import BaseModel, SecretStr
@@ -10,14 +10,10 @@ from pydantic_settings import BaseSettings
 from pydantic_settings import SettingsConfigDict
 from redis.asyncio import ConnectionPool, Redis
 from sqlalchemy import URL
-from sqlalchemy.ext.asyncio import (
-    async_sessionmaker,
-    AsyncEngine,
-    AsyncSession,
-    create_async_engine,
-)
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncEngine, AsyncSession
 
-from src.database import Base
+from src.database import Base, create_pool
+from src.enums import SchedulerMode
 
 
 class _BaseSettings(BaseSettings):
@@ -37,6 +33,17 @@ class CommonConfig(_BaseSettings, env_prefix="COMMON_"):
 
 class HamsterConfig(_BaseSettings, env_prefix="HAMSTER_"):
     base_url: str
+    session_pool_size: int = 512
+    session_idle_ttl: int = 300
+    shared_cache: bool = True
+    proxy_check_ttl: int = 120
+    proxy_monitor_interval: int = 300
+    proxy_monitor_concurrency: int = 50
+    proxy_monitor_failures: int = 2
+    max_inflight: int = 4
+    sync_all_concurrency: int = 10
+    sync_all_proxy_concurrency: int = 1
+    sync_all_progress_interval: float = 3.0
 
 
 class PostgresConfig(_BaseSettings, env_prefix="POSTGRES_"):
@@ -45,6 +52,15 @@ class PostgresConfig(_BaseSettings, env_prefix="POSTGRES_"):
     db: str
     user: str
     password: SecretStr
+    pool_size: int = 20
+    max_overflow: int = 30
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 100
+    pgbouncer: bool = False
+    metrics_interval: int = 60
+    write_behind_interval: float = 0.0
 
     def build_dsn(self) -> URL:
         return URL.create(
@@ -59,20 +75,33 @@ class PostgresConfig(_BaseSettings, env_prefix="POSTGRES_"):
     def create_pool(
         self, dsn: Optional[str | URL] = None, enable_logging: bool = False
     ) -> tuple[AsyncEngine, async_sessionmaker[AsyncSession]]:
-        if not dsn:
-            dsn = self.build_dsn()
-
-        engine: AsyncEngine = create_async_engine(url=dsn, echo=enable_logging)
-        return engine, async_sessionmaker(engine, expire_on_commit=False)
+        return create_pool(
+            dsn=dsn or self.build_dsn(),
+            enable_logging=enable_logging,
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_timeout=self.pool_timeout,
+            pool_recycle=self.pool_recycle,
+            pool_pre_ping=self.pool_pre_ping,
+            statement_cache_size=self.statement_cache_size,
+            pgbouncer=self.pgbouncer,
+        )
 
     @staticmethod
-    def build_scheduler(engine: AsyncEngine) -> AsyncScheduler:
+    def build_scheduler(
+        engine: AsyncEngine,
+        identity: str = "schd",
+        role: SchedulerRole = SchedulerRole.both,
+    ) -> AsyncScheduler:
         data_store = SQLAlchemyDataStore(
             engine_or_url=engine, schema=Base.metadata.schema
         )
         event_broker = AsyncpgEventBroker.from_async_sqla_engine(engine)
         return AsyncScheduler(
-            data_store=data_store, event_broker=event_broker, identity="schd"
+            data_store=data_store,
+            event_broker=event_broker,
+            identity=identity,
+            role=role,
         )
 
 
@@ -91,11 +120,34 @@ class RedisConfig(_BaseSettings, env_prefix="REDIS_"):
         )
 
 
+class SchedulerConfig(_BaseSettings, env_prefix="SCHEDULER_"):
+    mode: SchedulerMode = SchedulerMode.APSCHEDULER
+    tick_interval: int = 5
+    tick_batch_size: int = 500
+    tick_workers: int = 64
+    run_jobs_in_bot: bool = True
+    shard_count: int = 1
+    shard_index: int = 0
+    pipeline_window: int = 120
+
+
+class TelegramConfig(_BaseSettings, env_prefix="TELEGRAM_"):
+    rate_limit: float = 25.0
+    chat_rate_limit: float = 1.0
+    broadcast_page_size: int = 100
+    broadcast_concurrency: int = 10
+    send_queue_workers: int = 4
+    send_queue_redis: bool = False
+    digest_interval: int = 3600
+
+
 class AppConfig(BaseModel):
     common: CommonConfig
     hamster: HamsterConfig
     postgres: PostgresConfig
     redis: RedisConfig
+    scheduler: SchedulerConfig
+    telegram: TelegramConfig
 
     @classmethod
     def create(cls) -> AppConfig:
@@ -104,4 +156,6 @@ class AppConfig(BaseModel):
             hamster=HamsterConfig(),
             postgres=PostgresConfig(),
             redis=RedisConfig(),
+            scheduler=SchedulerConfig(),
+            telegram=TelegramConfig(),
         )
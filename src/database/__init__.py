@@ -1,5 +1,6 @@
 from .context import SQLSessionContext
 from .create_pool import create_pool
+from .metrics import log_pool_stats, MeasuredQueuePool, PoolStats
 from .models import (
     Base,
 )
@@ -10,11 +11,13 @@ from .repositories import (
     CiphersRepository,
     ProxiesRepository,
     Repository,
+    SchedulesRepository,
     TasksRepository,
     UpgradesRepository,
     UsersRepository,
 )
 from .uow import UoW
+from .write_behind import AccountStateBuffer
 
 __all__ = [
     "Base",
@@ -29,5 +32,10 @@ __all__ = [
     "UpgradesRepository",
     "TasksRepository",
     "AirdropTasksRepository",
+    "SchedulesRepository",
     "create_pool",
+    "AccountStateBuffer",
+    "log_pool_stats",
+    "MeasuredQueuePool",
+    "PoolStats",
 ]
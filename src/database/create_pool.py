@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from typing import Any
+from uuid import uuid4
+
 from sqlalchemy import URL
 from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
@@ -8,9 +11,43 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
+from .metrics import MeasuredQueuePool
+
 
 def create_pool(
-    dsn: str | URL, enable_logging: bool = False
+    dsn: str | URL,
+    enable_logging: bool = False,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_timeout: float = 30.0,
+    pool_recycle: int = -1,
+    pool_pre_ping: bool = False,
+    statement_cache_size: int = 100,
+    pgbouncer: bool = False,
 ) -> tuple[AsyncEngine, async_sessionmaker[AsyncSession]]:
-    engine: AsyncEngine = create_async_engine(url=dsn, echo=enable_logging)
+    connect_args: dict[str, Any] = {
+        "statement_cache_size": statement_cache_size,
+        "prepared_statement_cache_size": statement_cache_size,
+    }
+    if pgbouncer:
+        # PgBouncer in transaction mode may run the statements of one client
+        # on different server connections: prepared statements get unique
+        # names and are not cached.
+        connect_args: dict[str, Any] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+
+    engine: AsyncEngine = create_async_engine(
+        url=dsn,
+        echo=enable_logging,
+        poolclass=MeasuredQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=pool_recycle,
+        pool_pre_ping=pool_pre_ping,
+        connect_args=connect_args,
+    )
     return engine, async_sessionmaker(engine, expire_on_commit=False)
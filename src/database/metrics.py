@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from src.utils.loggers import database
+
+
+class PoolStats(BaseModel):
+    size: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_avg: float
+    wait_max: float
+
+
+class PoolMetrics:
+    """
+    Counters of the connection checkouts since the last snapshot.
+    """
+
+    __slots__ = ("checkouts", "timeouts", "wait_total", "wait_max")
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.checkouts: int = 0
+        self.timeouts: int = 0
+        self.wait_total: float = 0.0
+        self.wait_max: float = 0.0
+
+    def observe(self, wait: float, is_timeout: bool = False) -> None:
+        self.checkouts += 1
+        self.timeouts += int(is_timeout)
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+
+
+class MeasuredQueuePool(AsyncAdaptedQueuePool):
+    """
+    ``AsyncAdaptedQueuePool`` that measures how long a checkout waits for a
+    free connection, including the connect of a new one.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics: PoolMetrics = PoolMetrics()
+
+    def connect(self) -> PoolProxiedConnection:
+        started_at: float = time.perf_counter()
+        try:
+            connection: PoolProxiedConnection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.observe(time.perf_counter() - started_at, is_timeout=True)
+            raise
+
+        self.metrics.observe(time.perf_counter() - started_at)
+        return connection
+
+    def stats(self, reset: bool = True) -> PoolStats:
+        metrics: PoolMetrics = self.metrics
+        stats: PoolStats = PoolStats(
+            size=self.size(),
+            checked_out=self.checkedout(),
+            overflow=max(self.overflow(), 0),
+            checkouts=metrics.checkouts,
+            timeouts=metrics.timeouts,
+            wait_avg=(
+                metrics.wait_total / metrics.checkouts if metrics.checkouts else 0.0
+            ),
+            wait_max=metrics.wait_max,
+        )
+        if reset:
+            metrics.reset()
+        return stats
+
+
+async def log_pool_stats(engine: AsyncEngine, interval: int) -> None:
+    """
+    Log the pool stats of ``engine`` every ``interval`` seconds.
+    """
+    while True:
+        await asyncio.sleep(interval)
+
+        if not isinstance(engine.pool, MeasuredQueuePool):
+            return
+
+        stats: PoolStats = engine.pool.stats()
+        database.info(
+            "Pool: size %d, checked out %d, overflow %d | checkouts %d, "
+            "timeouts %d, wait avg %.3f s, max %.3f s",
+            stats.size,
+            stats.checked_out,
+            stats.overflow,
+            stats.checkouts,
+            stats.timeouts,
+            stats.wait_avg,
+            stats.wait_max,
+        )
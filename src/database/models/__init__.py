@@ -6,6 +6,7 @@ from .general import (
     DBAccountCipher,
     DBAccountConfig,
     DBAccountProxy,
+    DBAccountSchedule,
     DBAccountTask,
     DBAccountUpgrade,
     DBUser,
@@ -22,4 +23,5 @@ __all__ = [
     "DBAccountTask",
     "DBAccountAirdropTasks",
     "DBAccountCipher",
+    "DBAccountSchedule",
 ]
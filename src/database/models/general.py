@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Optional
 
-from sqlalchemy import false, ForeignKey, func, true
+from sqlalchemy import false, ForeignKey, func, Index, text, true, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.enums.protocols import ProxyProtocol
@@ -12,6 +12,7 @@ from .base import (
     Base,
     Int64,
     IntPK,
+    StrPK,
     TimeStampMixin,
 )
 
@@ -66,6 +67,7 @@ class DBAccount(Base, TimeStampMixin):
     full_name: Mapped[str]
     username: Mapped[Optional[str]]
     token: Mapped[str]
+    user_agent: Mapped[Optional[str]]
     photos: Mapped[Optional[list]]
     referrals_count: Mapped[Optional[int]]
     level: Mapped[Optional[int]]
@@ -127,6 +129,7 @@ class DBAccount(Base, TimeStampMixin):
         token: str,
         user_id: Optional[int] = None,
         username: Optional[str] = None,
+        user_agent: Optional[str] = None,
         **kwargs: Any,
     ) -> DBAccount:
         return cls(
@@ -135,6 +138,7 @@ class DBAccount(Base, TimeStampMixin):
             full_name=full_name,
             token=token,
             username=username,
+            user_agent=user_agent,
             **kwargs,
         )
 
@@ -157,7 +161,7 @@ class DBAccountCipher(Base, TimeStampMixin):
 
     id: Mapped[IntPK]
     account_id: Mapped[Int64] = mapped_column(
-        ForeignKey("accounts.id", ondelete="CASCADE")
+        ForeignKey("accounts.id", ondelete="CASCADE"), index=True
     )
     bonus_coins: Mapped[Optional[int]] = mapped_column(server_default="0")
     cipher: Mapped[Optional[str]]
@@ -201,9 +205,10 @@ class DBAccountConfig(Base, TimeStampMixin):
 
     id: Mapped[IntPK]
     account_id: Mapped[Int64] = mapped_column(
-        ForeignKey("accounts.id", ondelete="CASCADE")
+        ForeignKey("accounts.id", ondelete="CASCADE"), index=True
     )
     autofarm_interval: Mapped[Optional[int]] = mapped_column(server_default="1800")
+    autofarm_fill_percent: Mapped[Optional[int]] = mapped_column(server_default="90")
     is_autofarm_notifications: Mapped[Optional[bool]] = mapped_column(
         server_default=true()
     )
@@ -217,6 +222,9 @@ class DBAccountConfig(Base, TimeStampMixin):
     is_autosync_notifications: Mapped[Optional[bool]] = mapped_column(
         server_default=false()
     )
+    is_digest_notifications: Mapped[Optional[bool]] = mapped_column(
+        server_default=false()
+    )
     is_autofarm: Mapped[Optional[bool]] = mapped_column(server_default=false())
     is_autoupgrade: Mapped[Optional[bool]] = mapped_column(server_default=false())
     is_autosync: Mapped[Optional[bool]] = mapped_column(server_default=true())
@@ -235,6 +243,7 @@ class DBAccountConfig(Base, TimeStampMixin):
         cls,
         account_id: int,
         autofarm_interval: Optional[int] = 600,
+        autofarm_fill_percent: Optional[int] = 90,
         is_autofarm_notifications: Optional[bool] = None,
         autoupgrade_interval: Optional[int] = 600,
         autoupgrade_limit: Optional[int] = 0,
@@ -242,6 +251,7 @@ class DBAccountConfig(Base, TimeStampMixin):
         is_autoupgrade_notifications: Optional[bool] = None,
         autosync_interval: Optional[int] = 3600,
         is_autosync_notifications: Optional[bool] = None,
+        is_digest_notifications: Optional[bool] = None,
         is_autofarm: Optional[bool] = None,
         is_autoupgrade: Optional[bool] = None,
         is_active: Optional[bool] = None,
@@ -249,6 +259,7 @@ class DBAccountConfig(Base, TimeStampMixin):
         return cls(
             account_id=account_id,
             autofarm_interval=autofarm_interval,
+            autofarm_fill_percent=autofarm_fill_percent,
             is_autofarm_notifications=is_autofarm_notifications,
             autoupgrade_interval=autoupgrade_interval,
             autoupgrade_limit=autoupgrade_limit,
@@ -256,6 +267,7 @@ class DBAccountConfig(Base, TimeStampMixin):
             is_autoupgrade_notifications=is_autoupgrade_notifications,
             autosync_interval=autosync_interval,
             is_autosync_notifications=is_autosync_notifications,
+            is_digest_notifications=is_digest_notifications,
             is_autofarm=is_autofarm,
             is_autoupgrade=is_autoupgrade,
             is_active=is_active,
@@ -271,6 +283,9 @@ class DBAccountConfig(Base, TimeStampMixin):
     def set_autofarm_interval(self, autofarm_interval: int) -> None:
         self.autofarm_interval = autofarm_interval
 
+    def set_autofarm_fill_percent(self, autofarm_fill_percent: int) -> None:
+        self.autofarm_fill_percent = autofarm_fill_percent
+
     def set_autofarm_notifications(self, is_autofarm_notifications: bool) -> None:
         self.is_autofarm_notifications = is_autofarm_notifications
 
@@ -292,6 +307,9 @@ class DBAccountConfig(Base, TimeStampMixin):
     def set_autosync_notifications(self, is_autosync_notifications: bool) -> None:
         self.is_autosync_notifications = is_autosync_notifications
 
+    def set_digest_notifications(self, is_digest_notifications: bool) -> None:
+        self.is_digest_notifications = is_digest_notifications
+
     def set_is_autofarm(self, is_autofarm: bool) -> None:
         self.is_autofarm = is_autofarm
 
@@ -310,7 +328,7 @@ class DBAccountProxy(Base, TimeStampMixin):
 
     id: Mapped[IntPK]
     config_id: Mapped[Int64] = mapped_column(
-        ForeignKey("account_configs.id", ondelete="CASCADE")
+        ForeignKey("account_configs.id", ondelete="CASCADE"), index=True
     )
     protocol: Mapped[ProxyProtocol]
     host: Mapped[str]
@@ -319,6 +337,9 @@ class DBAccountProxy(Base, TimeStampMixin):
     password: Mapped[str]
     timeout: Mapped[Optional[int]] = mapped_column(server_default="0")
     is_active: Mapped[bool] = mapped_column(server_default=true())
+    checked_at: Mapped[Optional[datetime]]
+    latency: Mapped[Optional[float]]
+    failures: Mapped[int] = mapped_column(server_default="0")
 
     config: Mapped[DBAccountConfig] = relationship(
         back_populates="proxies", lazy="noload"
@@ -363,6 +384,11 @@ class DBAccountProxy(Base, TimeStampMixin):
 
 class DBAccountBoost(Base, TimeStampMixin):
     __tablename__ = "account_boosts"
+    __table_args__ = (
+        UniqueConstraint(
+            "account_id", "type", name="uq_account_boosts_account_id_type"
+        ),
+    )
 
     id: Mapped[IntPK]
     type: Mapped[str]
@@ -425,6 +451,16 @@ class DBAccountBoost(Base, TimeStampMixin):
 
 class DBAccountUpgrade(Base, TimeStampMixin):
     __tablename__ = "account_upgrades"
+    __table_args__ = (
+        UniqueConstraint(
+            "account_id", "type", name="uq_account_upgrades_account_id_type"
+        ),
+        Index(
+            "ix_account_upgrades_account_id_available",
+            "account_id",
+            postgresql_where=text("is_active AND NOT is_expired"),
+        ),
+    )
 
     id: Mapped[IntPK]
     type: Mapped[str]
@@ -492,6 +528,9 @@ class DBAccountUpgrade(Base, TimeStampMixin):
 
 class DBAccountTask(Base, TimeStampMixin):
     __tablename__ = "account_tasks"
+    __table_args__ = (
+        UniqueConstraint("account_id", "type", name="uq_account_tasks_account_id_type"),
+    )
 
     id: Mapped[IntPK]
     type: Mapped[str]
@@ -558,3 +597,45 @@ class DBAccountAirdropTasks(Base, TimeStampMixin):
         return cls(
             type=airdrop_task_type, account_id=account_id, completed_at=completed_at
         )
+
+
+class DBAccountSchedule(Base, TimeStampMixin):
+    __tablename__ = "account_schedules"
+
+    id: Mapped[StrPK]
+    task_id: Mapped[str]
+    account_id: Mapped[Optional[Int64]] = mapped_column(
+        ForeignKey("accounts.id", ondelete="CASCADE")
+    )
+    interval: Mapped[int]
+    next_run_at: Mapped[datetime] = mapped_column(index=True)
+    is_paused: Mapped[bool] = mapped_column(server_default=false())
+    kwargs: Mapped[Optional[dict]]
+
+    @classmethod
+    def create(
+        cls,
+        schedule_id: str,
+        task_id: str,
+        interval: int,
+        next_run_at: datetime,
+        account_id: Optional[int] = None,
+        is_paused: bool = False,
+        kwargs: Optional[dict] = None,
+    ) -> DBAccountSchedule:
+        return cls(
+            id=schedule_id,
+            task_id=task_id,
+            account_id=account_id,
+            interval=interval,
+            next_run_at=next_run_at,
+            is_paused=is_paused,
+            kwargs=kwargs,
+        )
+
+    def set_data(self, **kwargs) -> None:
+        try:
+            for key, value in kwargs.items():
+                self.__setattr__(key, value)
+        except AttributeError:
+            pass
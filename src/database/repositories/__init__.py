@@ -6,6 +6,7 @@ from .ciphers import CiphersRepository
 from .configs import ConfigsRepository
 from .general import Repository
 from .proxies import ProxiesRepository
+from .schedules import SchedulesRepository
 from .tasks import TasksRepository
 from .upgrades import UpgradesRepository
 from .users import UsersRepository
@@ -22,4 +23,5 @@ __all__ = [
     "TasksRepository",
     "CiphersRepository",
     "AirdropTasksRepository",
+    "SchedulesRepository",
 ]
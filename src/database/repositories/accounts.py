@@ -1,6 +1,5 @@
 from typing import Optional
 
-from sqlalchemy import select
 from sqlalchemy.orm import Mapped
 
 from .base import BaseRepository
@@ -14,14 +13,11 @@ class AccountsRepository(BaseRepository):
         account_id: Optional[int] = None,
         user_id: Optional[int] = None,
     ) -> Optional[DBAccount]:
-        self.statement = select(DBAccount).where(
-            (DBAccount.id == account_id) | (account_id is None),
-            (DBAccount.user_id == user_id) | (user_id is None),
-        )
+        self.select(DBAccount, id=account_id, user_id=user_id)
 
         self.load(*relations)
 
-        return await self._session.scalar(self.statement)
+        return await self._session.scalar(self.statement, self.params)
 
     async def get_all(
         self,
@@ -29,13 +25,11 @@ class AccountsRepository(BaseRepository):
         user_id: Optional[int] = None,
         limit_value: Optional[int] = None,
     ) -> list[Optional[DBAccount]]:
-        self.statement = select(DBAccount).where(
-            (DBAccount.user_id == user_id) | (user_id is None)
-        )
+        self.select(DBAccount, user_id=user_id)
 
         self.load(*data)
         self.sort(*data)
         self.limit(limit_value)
 
-        results = await self._session.scalars(self.statement)
+        results = await self._session.scalars(self.statement, self.params)
         return results.unique().all()
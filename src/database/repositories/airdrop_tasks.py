@@ -1,6 +1,5 @@
 from typing import Optional
 
-from sqlalchemy import select
 from sqlalchemy.orm import Mapped
 
 from .base import BaseRepository
@@ -11,13 +10,11 @@ class AirdropTasksRepository(BaseRepository):
     async def get_one(
         self, *relations: Mapped, user_id: int
     ) -> Optional[DBAccountAirdropTasks]:
-        self.statement = select(DBAccountAirdropTasks).where(
-            DBAccountAirdropTasks.id == user_id
-        )
+        self.select(DBAccountAirdropTasks, id=user_id)
 
         self.load(*relations)
 
-        return await self._session.scalar(self.statement)
+        return await self._session.scalar(self.statement, self.params)
 
     async def get_all(
         self,
@@ -25,11 +22,11 @@ class AirdropTasksRepository(BaseRepository):
         sort_column: Optional[Mapped] = None,
         limit_value: Optional[int] = None,
     ) -> list[Optional[DBAccountAirdropTasks]]:
-        self.statement = select(DBAccountAirdropTasks)
+        self.select(DBAccountAirdropTasks)
 
         self.load(*relations)
         self.sort(sort_column)
         self.limit(limit_value)
 
-        results = await self._session.scalars(self.statement)
+        results = await self._session.scalars(self.statement, self.params)
         return results.unique().all()
@@ -1,19 +1,50 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any, Optional
 
-from sqlalchemy import Select, UnaryExpression
+from sqlalchemy import bindparam, select, Select, UnaryExpression
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, selectinload
 
+from ..models import Base
+
+
+@lru_cache(maxsize=256)
+def _build_select(model: type[Base], columns: tuple[str, ...]) -> Select:
+    return select(model).where(
+        *[getattr(model, column) == bindparam(f"filter_{column}") for column in columns]
+    )
+
 
 class BaseRepository:
     _session: AsyncSession
     statement: Select | Any
+    params: dict[str, Any]
 
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
         self.statement = None
+        self.params = {}
+
+    def select(self, model: type[Base], **filters: Any) -> None:
+        """
+        Start a statement for ``model`` with an equality clause for each of
+        the ``filters`` that was passed, ``None`` means no filter.
+
+        The statement is built once per set of filtered columns and the
+        values go to ``params``, so every query shape has one SQL text for
+        the compiled and the prepared statement caches.
+        """
+        self.params = {
+            f"filter_{column}": value
+            for column, value in filters.items()
+            if value is not None
+        }
+        self.statement = _build_select(
+            model,
+            tuple(column for column, value in filters.items() if value is not None),
+        )
 
     def load(self, *relations: Mapped) -> None:
         if not relations:
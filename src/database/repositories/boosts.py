@@ -1,6 +1,5 @@
 from typing import Optional
 
-from sqlalchemy import select
 from sqlalchemy.orm import Mapped
 
 from .base import BaseRepository
@@ -15,15 +14,11 @@ class BoostsRepository(BaseRepository):
         boost_type: Optional[str] = None,
         account_id: Optional[int] = None,
     ) -> Optional[DBAccountBoost]:
-        self.statement = select(DBAccountBoost).where(
-            (DBAccountBoost.id == boost_id) | (boost_id is None),
-            (DBAccountBoost.type == boost_type) | (boost_type is None),
-            (DBAccountBoost.account_id == account_id) | (account_id is None),
-        )
+        self.select(DBAccountBoost, id=boost_id, type=boost_type, account_id=account_id)
 
         self.load(*relations)
 
-        return await self._session.scalar(self.statement)
+        return await self._session.scalar(self.statement, self.params)
 
     async def get_all(
         self,
@@ -33,14 +28,11 @@ class BoostsRepository(BaseRepository):
         sort_column: Optional[Mapped] = None,
         limit_value: Optional[int] = None,
     ) -> list[Optional[DBAccountBoost]]:
-        self.statement = select(DBAccountBoost).where(
-            (DBAccountBoost.type == boost_type) | (boost_type is None),
-            (DBAccountBoost.account_id == account_id) | (account_id is None),
-        )
+        self.select(DBAccountBoost, type=boost_type, account_id=account_id)
 
         self.load(*relations)
         self.sort(sort_column)
         self.limit(limit_value)
 
-        results = await self._session.scalars(self.statement)
+        results = await self._session.scalars(self.statement, self.params)
         return results.unique().all()
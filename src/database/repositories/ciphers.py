@@ -1,6 +1,5 @@
 from typing import Optional
 
-from sqlalchemy import select
 from sqlalchemy.orm import Mapped
 
 from .base import BaseRepository
@@ -14,14 +13,11 @@ class CiphersRepository(BaseRepository):
         config_id: Optional[int] = None,
         account_id: Optional[int] = None,
     ) -> Optional[DBAccountCipher]:
-        self.statement = select(DBAccountCipher).where(
-            (DBAccountCipher.id == config_id) | (config_id is None),
-            (DBAccountCipher.account_id == account_id) | (account_id is None),
-        )
+        self.select(DBAccountCipher, id=config_id, account_id=account_id)
 
         self.load(*relations)
 
-        return await self._session.scalar(self.statement)
+        return await self._session.scalar(self.statement, self.params)
 
     async def get_all(
         self,
@@ -30,13 +26,11 @@ class CiphersRepository(BaseRepository):
         sort_column: Optional[Mapped] = None,
         limit_value: Optional[int] = None,
     ) -> list[Optional[DBAccountCipher]]:
-        self.statement = select(DBAccountCipher).where(
-            (DBAccountCipher.is_claimed == is_claimed) | (is_claimed is None)
-        )
+        self.select(DBAccountCipher, is_claimed=is_claimed)
 
         self.load(*relations)
         self.sort(sort_column)
         self.limit(limit_value)
 
-        results = await self._session.scalars(self.statement)
+        results = await self._session.scalars(self.statement, self.params)
         return results.unique().all()
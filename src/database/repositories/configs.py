@@ -1,10 +1,9 @@
 from typing import Optional
 
-from sqlalchemy import select
 from sqlalchemy.orm import Mapped
 
 from .base import BaseRepository
-from ..models import DBAccountConfig
+from ..models import DBAccount, DBAccountConfig
 
 
 class ConfigsRepository(BaseRepository):
@@ -14,14 +13,11 @@ class ConfigsRepository(BaseRepository):
         config_id: Optional[int] = None,
         account_id: Optional[int] = None,
     ) -> Optional[DBAccountConfig]:
-        self.statement = select(DBAccountConfig).where(
-            (DBAccountConfig.id == config_id) | (config_id is None),
-            (DBAccountConfig.account_id == account_id) | (account_id is None),
-        )
+        self.select(DBAccountConfig, id=config_id, account_id=account_id)
 
         self.load(*relations)
 
-        return await self._session.scalar(self.statement)
+        return await self._session.scalar(self.statement, self.params)
 
     async def get_all(
         self,
@@ -33,17 +29,20 @@ class ConfigsRepository(BaseRepository):
         sort_column: Optional[Mapped] = None,
         limit_value: Optional[int] = None,
     ) -> list[Optional[DBAccountConfig]]:
-        self.statement = select(DBAccountConfig).where(
-            (DBAccountConfig.account.user_id == user_id) | (user_id is None),
-            (DBAccountConfig.is_autofarm == is_autofarm) | (is_autofarm is None),
-            (DBAccountConfig.is_autoupgrade == is_autoupgrade)
-            | (is_autoupgrade is None),
-            (DBAccountConfig.is_active == is_active) | (is_active is None),
+        self.select(
+            DBAccountConfig,
+            is_autofarm=is_autofarm,
+            is_autoupgrade=is_autoupgrade,
+            is_active=is_active,
         )
+        if user_id is not None:
+            self.statement = self.statement.where(
+                DBAccountConfig.account.has(DBAccount.user_id == user_id)
+            )
 
         self.load(*relations)
         self.sort(sort_column)
         self.limit(limit_value)
 
-        results = await self._session.scalars(self.statement)
+        results = await self._session.scalars(self.statement, self.params)
         return results.unique().all()
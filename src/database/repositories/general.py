@@ -9,6 +9,7 @@ from .boosts import BoostsRepository
 from .ciphers import CiphersRepository
 from .configs import ConfigsRepository
 from .proxies import ProxiesRepository
+from .schedules import SchedulesRepository
 from .tasks import TasksRepository
 from .upgrades import UpgradesRepository
 from .users import UsersRepository
@@ -28,6 +29,7 @@ class Repository(BaseRepository):
     tasks: TasksRepository
     ciphers: CiphersRepository
     airdrop_tasks: AirdropTasksRepository
+    schedules: SchedulesRepository
 
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session=session)
@@ -40,3 +42,4 @@ class Repository(BaseRepository):
         self.ciphers = CiphersRepository(session=session)
         self.tasks = TasksRepository(session=session)
         self.airdrop_tasks = AirdropTasksRepository(session=session)
+        self.schedules = SchedulesRepository(session=session)
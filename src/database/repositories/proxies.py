@@ -1,6 +1,5 @@
 from typing import Optional
 
-from sqlalchemy import select
 from sqlalchemy.orm import Mapped
 
 from .base import BaseRepository
@@ -14,14 +13,11 @@ class ProxiesRepository(BaseRepository):
         proxy_id: Optional[int] = None,
         config_id: Optional[int] = None,
     ) -> Optional[DBAccountProxy]:
-        self.statement = select(DBAccountProxy).where(
-            (DBAccountProxy.id == proxy_id) | (proxy_id is None),
-            (DBAccountProxy.config_id == config_id) | (config_id is None),
-        )
+        self.select(DBAccountProxy, id=proxy_id, config_id=config_id)
 
         self.load(*relations)
 
-        return await self._session.scalar(self.statement)
+        return await self._session.scalar(self.statement, self.params)
 
     async def get_all(
         self,
@@ -30,13 +26,11 @@ class ProxiesRepository(BaseRepository):
         sort_column: Optional[Mapped] = None,
         limit_value: Optional[int] = None,
     ) -> list[Optional[DBAccountProxy]]:
-        self.statement = select(DBAccountProxy).where(
-            (DBAccountProxy.is_active == is_active) | (is_active is None)
-        )
+        self.select(DBAccountProxy, is_active=is_active)
 
         self.load(*relations)
         self.sort(sort_column)
         self.limit(limit_value)
 
-        results = await self._session.scalars(self.statement)
+        results = await self._session.scalars(self.statement, self.params)
         return results.unique().all()
@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Mapped
+
+from .base import BaseRepository
+from ..models import DBAccountSchedule
+
+
+class SchedulesRepository(BaseRepository):
+    async def get_one(
+        self,
+        *relations: Mapped,
+        schedule_id: str,
+    ) -> Optional[DBAccountSchedule]:
+        self.select(DBAccountSchedule, id=schedule_id)
+
+        self.load(*relations)
+
+        return await self._session.scalar(self.statement, self.params)
+
+    async def get_due(
+        self,
+        due_at: datetime,
+        shard_count: int = 1,
+        shard_index: int = 0,
+        limit_value: Optional[int] = None,
+    ) -> list[DBAccountSchedule]:
+        """
+        Lock the due schedules for the current transaction. Rows locked by
+        another dispatcher are skipped, so several processes can share the
+        table without running a schedule twice. Schedules are partitioned
+        between ``shard_count`` dispatchers by ``account_id``.
+        """
+        self.statement = (
+            select(DBAccountSchedule)
+            .where(
+                DBAccountSchedule.next_run_at <= due_at,
+                DBAccountSchedule.is_paused.is_(False),
+                func.coalesce(DBAccountSchedule.account_id, 0) % shard_count
+                == shard_index,
+            )
+            .order_by(DBAccountSchedule.next_run_at)
+            .with_for_update(skip_locked=True)
+        )
+
+        self.limit(limit_value)
+
+        results = await self._session.scalars(self.statement)
+        return results.all()
+
+    async def count(self) -> int:
+        return await self._session.scalar(
+            select(func.count()).select_from(DBAccountSchedule)
+        )
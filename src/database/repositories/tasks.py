@@ -1,6 +1,5 @@
 from typing import Optional
 
-from sqlalchemy import select
 from sqlalchemy.orm import Mapped
 
 from .base import BaseRepository
@@ -11,14 +10,11 @@ class TasksRepository(BaseRepository):
     async def get_one(
         self, *relations: Mapped, task_type: str, account_id: Optional[int] = None
     ) -> Optional[DBAccountTask]:
-        self.statement = select(DBAccountTask).where(
-            DBAccountTask.type == task_type,
-            (DBAccountTask.account_id == account_id) | (account_id is None),
-        )
+        self.select(DBAccountTask, type=task_type, account_id=account_id)
 
         self.load(*relations)
 
-        return await self._session.scalar(self.statement)
+        return await self._session.scalar(self.statement, self.params)
 
     async def get_all(
         self,
@@ -28,14 +24,11 @@ class TasksRepository(BaseRepository):
         sort_column: Optional[Mapped] = None,
         limit_value: Optional[int] = None,
     ) -> list[Optional[DBAccountTask]]:
-        self.statement = select(DBAccountTask).where(
-            (DBAccountTask.type == task_type) | (task_type is None),
-            (DBAccountTask.account_id == account_id) | (account_id is None),
-        )
+        self.select(DBAccountTask, type=task_type, account_id=account_id)
 
         self.load(*relations)
         self.sort(sort_column)
         self.limit(limit_value)
 
-        results = await self._session.scalars(self.statement)
+        results = await self._session.scalars(self.statement, self.params)
         return results.unique().all()
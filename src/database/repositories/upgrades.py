@@ -1,6 +1,5 @@
 from typing import Optional
 
-from sqlalchemy import select
 from sqlalchemy.orm import Mapped
 
 from .base import BaseRepository
@@ -16,16 +15,17 @@ class UpgradesRepository(BaseRepository):
         section: Optional[str] = None,
         account_id: Optional[int] = None,
     ) -> Optional[DBAccountUpgrade]:
-        self.statement = select(DBAccountUpgrade).where(
-            (DBAccountUpgrade.id == upgrade_id) | (upgrade_id is None),
-            (DBAccountUpgrade.type == upgrade_type) | (upgrade_type is None),
-            (DBAccountUpgrade.section == section) | (section is None),
-            (DBAccountUpgrade.account_id == account_id) | (account_id is None),
+        self.select(
+            DBAccountUpgrade,
+            id=upgrade_id,
+            type=upgrade_type,
+            section=section,
+            account_id=account_id,
         )
 
         self.load(*relations)
 
-        return await self._session.scalar(self.statement)
+        return await self._session.scalar(self.statement, self.params)
 
     async def get_all(
         self,
@@ -37,16 +37,17 @@ class UpgradesRepository(BaseRepository):
         is_active: Optional[bool] = None,
         limit_value: Optional[int] = None,
     ) -> list[Optional[DBAccountUpgrade]]:
-        self.statement = select(DBAccountUpgrade).where(
-            (DBAccountUpgrade.type == upgrade_type) | (upgrade_type is None),
-            (DBAccountUpgrade.section == section) | (section is None),
-            (DBAccountUpgrade.account_id == account_id) | (account_id is None),
-            (DBAccountUpgrade.is_expired == is_expired) | (is_expired is None),
-            (DBAccountUpgrade.is_active == is_active) | (is_active is None),
+        self.select(
+            DBAccountUpgrade,
+            type=upgrade_type,
+            section=section,
+            account_id=account_id,
+            is_expired=is_expired,
+            is_active=is_active,
         )
         self.load(*data)
         self.sort(*data)
         self.limit(limit_value)
 
-        results = await self._session.scalars(self.statement)
+        results = await self._session.scalars(self.statement, self.params)
         return results.unique().all()
@@ -14,14 +14,11 @@ class UsersRepository(BaseRepository):
         user_id: int,
         is_active: Optional[bool] = None,
     ) -> Optional[DBUser]:
-        self.statement = select(DBUser).where(
-            DBUser.id == user_id,
-            (DBUser.is_active == is_active) | (is_active is None),
-        )
+        self.select(DBUser, id=user_id, is_active=is_active)
 
         self.load(*relations)
 
-        return await self._session.scalar(self.statement)
+        return await self._session.scalar(self.statement, self.params)
 
     async def get_all(
         self,
@@ -30,13 +27,29 @@ class UsersRepository(BaseRepository):
         sort_column: Optional[Mapped] = None,
         limit_value: Optional[int] = None,
     ) -> list[Optional[DBUser]]:
-        self.statement = select(DBUser).where(
-            (DBUser.is_active == is_active) | (is_active is None),
-        )
+        self.select(DBUser, is_active=is_active)
 
         self.load(*relations)
         self.sort(sort_column)
         self.limit(limit_value)
 
-        results = await self._session.scalars(self.statement)
+        results = await self._session.scalars(self.statement, self.params)
         return results.unique().all()
+
+    async def get_ids(
+        self,
+        after_id: int = 0,
+        limit_value: Optional[int] = None,
+    ) -> list[int]:
+        """
+        Ids of the users after ``after_id`` in ascending order, a page of a
+        keyset pagination over the whole table.
+        """
+        self.statement = (
+            select(DBUser.id).where(DBUser.id > after_id).order_by(DBUser.id)
+        )
+
+        self.limit(limit_value)
+
+        results = await self._session.scalars(self.statement)
+        return results.all()
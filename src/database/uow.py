@@ -25,6 +25,9 @@ class UoW:
         if commit:
             await self._session.commit()
 
+    async def flush(self) -> None:
+        await self._session.flush()
+
     async def rollback(self) -> None:
         await self._session.rollback()
 
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Final, Optional
+
+from sqlalchemy import column, update, Update, values, Values
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.utils.loggers import database
+from .models import DBAccount
+
+# Columns of the account state that every Hamster response overwrites.
+ACCOUNT_STATE_COLUMNS: Final[tuple[str, ...]] = (
+    "referrals_count",
+    "level",
+    "total_coins",
+    "balance_coins",
+    "available_taps",
+    "max_taps",
+    "earn_per_tap",
+    "earn_passive_per_sec",
+    "earn_passive_per_hour",
+    "last_passive_earn",
+    "taps_recover_per_sec",
+    "updated_at",
+)
+FLUSH_CHUNK_SIZE: Final[int] = 1000
+
+
+class AccountStateBuffer:
+    """
+    Write-behind buffer of the account state.
+
+    :meth:`put` keeps the latest state of an account in memory, the
+    periodic flush writes all pending accounts with one
+    ``UPDATE ... FROM (VALUES ...)``. A row is only overwritten by a state
+    that is not older than the stored one (``updated_at``), so a direct
+    write that happened in between is not lost.
+
+    Only the state columns go through the buffer: the buffered attributes
+    are marked as committed on the instance and the session does not write
+    them again. Everything else (configs, proxies, disabling of the
+    automatic functions) is still written immediately.
+    """
+
+    def __init__(
+        self,
+        session_pool: async_sessionmaker[AsyncSession],
+        flush_interval: float = 5.0,
+        max_pending: int = 1000,
+    ) -> None:
+        self.session_pool = session_pool
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: dict[int, dict[str, Any]] = {}
+        self._flush_lock: asyncio.Lock = asyncio.Lock()
+        self._loop: Optional[asyncio.Task] = None
+        self._flushes: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def put(self, account: DBAccount) -> None:
+        state: dict[str, Any] = {
+            name: getattr(account, name) for name in ACCOUNT_STATE_COLUMNS
+        }
+        self._pending[account.id] = state
+
+        for name, value in state.items():
+            set_committed_value(account, name, value)
+
+        if len(self._pending) >= self.max_pending:
+            flush: asyncio.Task = asyncio.create_task(self.flush())
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+
+    async def flush(self) -> int:
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            pending, self._pending = self._pending, {}
+            account_ids: list[int] = list(pending)
+            try:
+                async with self.session_pool() as session:
+                    # Chunks keep the statement below the bind parameter
+                    # limit of asyncpg.
+                    for start in range(0, len(account_ids), FLUSH_CHUNK_SIZE):
+                        await session.execute(
+                            build_state_update(
+                                {
+                                    account_id: pending[account_id]
+                                    for account_id in account_ids[
+                                        start : start + FLUSH_CHUNK_SIZE
+                                    ]
+                                }
+                            ),
+                            execution_options={"synchronize_session": False},
+                        )
+                    await session.commit()
+            except Exception:
+                # Newer states that came in meanwhile win over the failed ones.
+                self._pending = {**pending, **self._pending}
+                raise
+
+            database.info("Account states flushed: %d", len(pending))
+            return len(pending)
+
+    async def start(self) -> None:
+        self._loop = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._loop is not None:
+            self._loop.cancel()
+            self._loop = None
+
+        await asyncio.gather(*self._flushes, return_exceptions=True)
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as error:
+                database.exception("Cannot flush account states: %s", error)
+
+
+def build_state_update(pending: dict[int, dict[str, Any]]) -> Update:
+    table = DBAccount.__table__
+    names: tuple[str, ...] = ("id", *ACCOUNT_STATE_COLUMNS)
+    rows: Values = values(
+        *[column(name, table.c[name].type) for name in names], name="state"
+    ).data(
+        [
+            (account_id, *[state[name] for name in ACCOUNT_STATE_COLUMNS])
+            for account_id, state in pending.items()
+        ]
+    )
+
+    return (
+        update(DBAccount)
+        .where(
+            DBAccount.id == rows.c.id,
+            DBAccount.updated_at <= rows.c.updated_at,
+        )
+        .values({name: rows.c[name] for name in ACCOUNT_STATE_COLUMNS})
+    )
@@ -1,6 +1,13 @@
 from .actions import SchedulerActions
 from .protocols import ProxyProtocol
 from .tasks import TaskIds
-from .types import AuthType
+from .types import AuthType, SchedulerMode, SendPriority
 
-__all__ = ["SchedulerActions", "TaskIds", "AuthType", "ProxyProtocol"]
+__all__ = [
+    "SchedulerActions",
+    "TaskIds",
+    "AuthType",
+    "ProxyProtocol",
+    "SchedulerMode",
+    "SendPriority",
+]
@@ -9,3 +9,4 @@ class TaskIds(StrEnum):
     AUTOSYNC = "handle_autosync"
     CIPHER = "handle_cipher"
     SET_CIPHER = "set_cipher"
+    PROXY_MONITOR = "handle_proxy_monitor"
@@ -1,7 +1,17 @@
-from enum import StrEnum
+from enum import IntEnum, StrEnum
 
 
 class AuthType(StrEnum):
     BEARER = "BEARER"
     WEBAPP_DATA = "WEBAPP_DATA"
     SESSION = "SESSION"
+
+
+class SchedulerMode(StrEnum):
+    APSCHEDULER = "apscheduler"
+    TICK = "tick"
+
+
+class SendPriority(IntEnum):
+    INTERACTIVE = 0
+    BACKGROUND = 1
@@ -1,4 +1,5 @@
 from .bot import create_bot
 from .dispatcher import create_dispatcher
+from .hamster import create_hamster
 
-__all__ = ["create_bot", "create_dispatcher"]
+__all__ = ["create_bot", "create_dispatcher", "create_hamster"]
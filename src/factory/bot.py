@@ -8,6 +8,7 @@ from aiogram.client.session.aiohttp import AiohttpSession
 from aiogram.enums import ParseMode
 
 from src.app_config import AppConfig
+from src.telegram.delivery import RateLimiter, RateLimitMiddleware
 from src.utils import msgspec_json as mjson
 
 
@@ -23,4 +24,13 @@ def create_bot(
         session=session,
         default=DefaultBotProperties(parse_mode=parse_mode),
     )
+    # One budget for every message of the process, see ``SendQueue``.
+    bot.session.middleware(
+        RateLimitMiddleware(
+            RateLimiter(
+                rate=config.telegram.rate_limit,
+                chat_rate=config.telegram.chat_rate_limit,
+            )
+        )
+    )
     return bot
@@ -12,7 +12,8 @@ from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncEngine, AsyncSession
 
 from src.app_config import AppConfig
-from src.database import Base, create_pool
+from src.database import Base
+from src.factory.hamster import create_hamster
 from src.hamster import HamsterKombat
 from src.telegram.middlewares import (
     DBSessionMiddleware,
@@ -22,8 +23,8 @@ from src.utils import msgspec_json as mjson
 
 
 def _setup_outer_middlewares(dp: Dispatcher, config: AppConfig) -> None:
-    engine, session = create_pool(
-        dsn=config.postgres.build_dsn(), enable_logging=config.common.sqlalchemy_logging
+    engine, session = config.postgres.create_pool(
+        enable_logging=config.common.sqlalchemy_logging
     )
     session: async_sessionmaker[AsyncSession]
     engine: AsyncEngine
@@ -46,7 +47,7 @@ def _setup_inner_middlewares(dp: Dispatcher) -> None:
 async def create_dispatcher(config: AppConfig) -> Dispatcher:
     redis: Redis = config.redis.build_client()
 
-    hamster: HamsterKombat = HamsterKombat(base_url=config.hamster.base_url)
+    hamster: HamsterKombat = create_hamster(config=config, redis=redis)
 
     dp: Dispatcher = Dispatcher(
         name="main_dispatcher",
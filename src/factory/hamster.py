@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from redis.asyncio import Redis
+
+from src.app_config import AppConfig
+from src.hamster import HamsterCache, HamsterKombat, HamsterSessionPool
+
+
+def create_hamster(config: AppConfig, redis: Redis) -> HamsterKombat:
+    return HamsterKombat(
+        base_url=config.hamster.base_url,
+        session_pool=HamsterSessionPool(
+            max_size=config.hamster.session_pool_size,
+            idle_ttl=config.hamster.session_idle_ttl,
+        ),
+        cache=HamsterCache(redis=redis if config.hamster.shared_cache else None),
+        proxy_check_ttl=config.hamster.proxy_check_ttl,
+        max_inflight=config.hamster.max_inflight,
+    )
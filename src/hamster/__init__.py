@@ -1,4 +1,5 @@
-from .api import HamsterClient, HamsterKombat
+from .api import HamsterClient, HamsterKombat, HamsterSession, HamsterSessionPool
+from .cache import HamsterCache
 from .apscheduler import (
     add_schedule,
     generate_schedule_id,
@@ -25,6 +26,9 @@ from .models import (
 __all__ = [
     "HamsterKombat",
     "HamsterClient",
+    "HamsterSession",
+    "HamsterSessionPool",
+    "HamsterCache",
     "HamsterException",
     "RequestError",
     "UserData",
@@ -1,4 +1,6 @@
 from .client import HamsterClient
 from .kombat import HamsterKombat
+from .session import HamsterSession
+from .session_pool import HamsterSessionPool
 
-__all__ = ["HamsterClient", "HamsterKombat"]
+__all__ = ["HamsterClient", "HamsterKombat", "HamsterSession", "HamsterSessionPool"]
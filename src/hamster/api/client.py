@@ -1,11 +1,15 @@
+import asyncio
+import time
 from http import HTTPMethod
-from typing import Any, Optional
+from typing import Any, Awaitable, Optional
 
 import aiohttp
 from aiohttp import ClientConnectionError
-from aiohttp_socks import ProxyConnector
 from python_socks import ProxyConnectionError, ProxyError
+from yarl import URL
 
+from src.hamster.api.session import HamsterSession
+from src.hamster.api.session_pool import HamsterSessionPool
 from src.hamster.enums import AuthEndpoints
 from src.hamster.exceptions import RequestError
 from src.utils.loggers import log_hamster
@@ -16,9 +20,21 @@ class HamsterClient(object):
         self,
         base_url: str,
         headers: Optional[dict] = None,
+        session_pool: Optional[HamsterSessionPool] = None,
+        proxy_check_ttl: int = 120,
+        max_inflight: int = 4,
     ):
         self.base_url = base_url
         self.headers: Optional[dict] = headers
+        self.session_pool: HamsterSessionPool = session_pool or HamsterSessionPool()
+        self.proxy_check_ttl: int = proxy_check_ttl
+        self.max_inflight: int = max_inflight
+        self.proxy_judges: list[str] = [
+            "http://azenv.net/",
+            "http://httpheader.net/azenv.php",
+            "http://mojeip.net.pl/asdfa/azenv.php",
+        ]
+        self._proxy_verdicts: dict[str, tuple[float, bool]] = {}
 
         if not headers:
             self.headers = {
@@ -37,55 +53,152 @@ class HamsterClient(object):
                 "Sec-Fetch-Site": "same-site",
             }
 
-    @staticmethod
     async def check_proxy(
-        proxy_connector: ProxyConnector,
+        self,
+        proxy_url: str,
         real_ip: str,
         response_timeout: Optional[int] = 10,
+        use_cache: bool = True,
     ) -> bool:
-        judges = [
-            "http://azenv.net/",
-            "http://httpheader.net/azenv.php",
-            "http://mojeip.net.pl/asdfa/azenv.php",
-        ]
+        """
+        Whether the proxy works and hides ``real_ip``. The verdict is cached
+        per proxy URL for ``proxy_check_ttl`` seconds.
+        """
+        if use_cache:
+            cached: Optional[tuple[float, bool]] = self._proxy_verdicts.get(proxy_url)
+            if cached is not None:
+                if cached[0] > time.monotonic():
+                    return cached[1]
+                del self._proxy_verdicts[proxy_url]
 
-        for judge in judges:
-            try:
-                async with aiohttp.ClientSession(
-                    connector=proxy_connector, connector_owner=False
-                ) as client:
-                    async with client.get(judge, timeout=response_timeout) as response:
-                        text = await response.text()
-                        return response.ok and real_ip not in text
-            except (
-                ClientConnectionError,
-                ConnectionResetError,
-                ProxyConnectionError,
-                TimeoutError,
-                ProxyError,
-            ):
-                log_hamster.info(
-                    "Proxy is unavailable: %s | %s",
-                    judge,
-                    proxy_connector.proxy_host,
+        latency: Optional[float] = await self.measure_proxy(
+            proxy_url=proxy_url, real_ip=real_ip, response_timeout=response_timeout
+        )
+        return latency is not None
+
+    async def measure_proxy(
+        self,
+        proxy_url: str,
+        real_ip: str,
+        response_timeout: Optional[int] = 10,
+    ) -> Optional[float]:
+        """
+        Probe all judges through the proxy at once, the first decisive answer
+        wins and the other probes are cancelled.
+
+        Returns the latency of the winning probe in seconds, or ``None`` when
+        the proxy is unavailable or leaks ``real_ip``. The verdict is cached
+        for :meth:`check_proxy`.
+        """
+        started_at: float = time.monotonic()
+        probes: set[asyncio.Task[Optional[bool]]] = {
+            asyncio.create_task(
+                self._probe_judge(
+                    judge=judge,
+                    proxy_url=proxy_url,
+                    real_ip=real_ip,
+                    response_timeout=response_timeout,
+                )
+            )
+            for judge in self.proxy_judges
+        }
+
+        latency: Optional[float] = None
+        try:
+            while probes:
+                done, probes = await asyncio.wait(
+                    probes, return_when=asyncio.FIRST_COMPLETED
                 )
-                continue
-        return False
+                answers: list[bool] = [
+                    probe.result() for probe in done if probe.result() is not None
+                ]
+                if answers:
+                    if answers[0]:
+                        latency: Optional[float] = time.monotonic() - started_at
+                    break
+        finally:
+            for probe in probes:
+                probe.cancel()
+
+        self._store_proxy_verdict(proxy_url=proxy_url, is_working=latency is not None)
+        return latency
+
+    def _store_proxy_verdict(self, proxy_url: str, is_working: bool) -> None:
+        now: float = time.monotonic()
+        # Re-inserted at the end, so the verdicts stay ordered by expiry and
+        # the expired ones are dropped from the front.
+        self._proxy_verdicts.pop(proxy_url, None)
+        self._proxy_verdicts[proxy_url] = (now + self.proxy_check_ttl, is_working)
+
+        while self._proxy_verdicts:
+            oldest_url: str = next(iter(self._proxy_verdicts))
+            if self._proxy_verdicts[oldest_url][0] > now:
+                break
+            del self._proxy_verdicts[oldest_url]
+
+    async def _probe_judge(
+        self,
+        judge: str,
+        proxy_url: str,
+        real_ip: str,
+        response_timeout: Optional[int] = 10,
+    ) -> Optional[bool]:
+        try:
+            async with self.session_pool.acquire(proxy_url=proxy_url) as client:
+                async with client.get(
+                    judge, timeout=aiohttp.ClientTimeout(total=response_timeout)
+                ) as response:
+                    if not response.ok:
+                        return None
+
+                    text = await response.text()
+                    return real_ip not in text
+        except (
+            ClientConnectionError,
+            ConnectionResetError,
+            ProxyConnectionError,
+            TimeoutError,
+            ProxyError,
+        ):
+            log_hamster.info(
+                "Proxy is unavailable: %s | %s",
+                judge,
+                URL(proxy_url).host,
+            )
+            return None
+
+    async def gather(self, *requests: Awaitable[Any]) -> list[Any]:
+        """
+        Await independent requests of one account concurrently, at most
+        ``max_inflight`` of them at a time. They share the keep-alive
+        session of the account's proxy.
+        """
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(self.max_inflight)
+
+        async def _limited(request: Awaitable[Any]) -> Any:
+            async with semaphore:
+                return await request
+
+        return list(await asyncio.gather(*[_limited(request) for request in requests]))
+
+    async def close(self) -> None:
+        await self.session_pool.close()
 
     async def _make_request(
         self,
         method: HTTPMethod,
         endpoint: AuthEndpoints,
-        proxy_connector: ProxyConnector,
+        session: HamsterSession,
+        headers: Optional[dict[str, str]] = None,
         **kwargs: Any,
-    ) -> Optional[dict]:
-        async with aiohttp.ClientSession(
-            base_url=self.base_url,
-            headers=self.headers,
-            connector=proxy_connector,
-            connector_owner=False,
-        ) as client:
-            async with client.request(method, endpoint, **kwargs) as response:
+    ) -> bytes:
+        async with self.session_pool.acquire(proxy_url=session.proxy_url) as client:
+            async with client.request(
+                method,
+                self.base_url + endpoint,
+                headers=session.build_headers(self.headers, **(headers or {})),
+                **kwargs,
+            ) as response:
                 if not response.ok:
                     raise RequestError(
                         f"Cannot make request to Hamster API: {endpoint} | {response.status} | {await response.text()}"
@@ -94,23 +207,23 @@ class HamsterClient(object):
                 log_hamster.info(
                     "Request to Hamster API: %s | %s",
                     endpoint,
-                    proxy_connector.proxy_host,
+                    URL(session.proxy_url).host if session.proxy_url else None,
                 )
 
-                return await response.json()
+                return await response.read()
 
-    @staticmethod
     async def _make_request_to_other(
+        self,
         method: HTTPMethod,
         base_url: str,
         endpoint: str,
-        proxy_connector: Optional[ProxyConnector] = None,
+        proxy_url: Optional[str] = None,
         **kwargs: Any,
     ) -> Optional[dict]:
-        async with aiohttp.ClientSession(
-            base_url=base_url, connector=proxy_connector, connector_owner=False
-        ) as session:
-            async with session.request(method, endpoint, **kwargs) as response:
+        async with self.session_pool.acquire(proxy_url=proxy_url) as session:
+            async with session.request(
+                method, base_url + endpoint, **kwargs
+            ) as response:
                 if not response.ok:
                     raise RequestError(
                         f"Cannot make request to {base_url}: {endpoint} | {response.status} | {await response.text()}"
@@ -119,7 +232,7 @@ class HamsterClient(object):
                 log_hamster.info(
                     "Request to Unknown API: %s | %s",
                     endpoint,
-                    proxy_connector.proxy_host,
+                    URL(proxy_url).host if proxy_url else None,
                 )
 
                 return await response.json()
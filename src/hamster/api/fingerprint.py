@@ -1,7 +1,10 @@
+import functools
 import hashlib
 import json
 import random
 
+from fake_useragent import UserAgent
+
 
 def get_random_videocard() -> str:
     videocards = [
@@ -214,3 +217,16 @@ def generate_fingerprint() -> dict:
         random_resolution[1],
     ]
     return fingerprint
+
+
+@functools.cache
+def get_user_agent_generator() -> UserAgent:
+    return UserAgent(
+        browsers=["chrome"],
+        os=["android", "ios"],
+        platforms=["mobile", "tablet"],
+    )
+
+
+def generate_user_agent() -> str:
+    return str(get_user_agent_generator().random)
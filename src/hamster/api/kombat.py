@@ -1,66 +1,103 @@
 import time
+from functools import partial
 from http import HTTPMethod
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
-from aiohttp_socks import ProxyConnector
-from fake_useragent import UserAgent
+from aiohttp import ClientError
 
 from src.hamster.api.client import HamsterClient
-from src.hamster.api.fingerprint import generate_fingerprint
-from src.hamster.enums import AuthEndpoints, ClickerEndpoints
+from src.hamster.api.fingerprint import (
+    generate_fingerprint,
+    generate_user_agent,
+    get_user_agent_generator,
+)
+from src.hamster.api.session import HamsterSession
+from src.hamster.api.session_pool import HamsterSessionPool
+from src.hamster.cache import (
+    daily_cipher_for_account,
+    GameConfigEntry,
+    HamsterCache,
+)
+from src.hamster.enums import AuthEndpoints, ClickerEndpoints, ConfigSection
+from src.hamster.exceptions import RequestError
 from src.hamster.models import (
     AuthData,
-    HamsterBoost,
     HamsterBoosts,
     HamsterConfig,
     HamsterDailyCipher,
+    HamsterDailyCombo,
     HamsterData,
+    HamsterIPData,
     HamsterTask,
     HamsterTasks,
     HamsterUpgrades,
     UserData,
 )
-from src.hamster.models.hamster_data import HamsterDailyCombo, HamsterIPData
+from src.hamster.models.responses import (
+    CheckTaskResponse,
+    DailyCipherResponse,
+    decode_boosts,
+    decode_check_task,
+    decode_clicker_user,
+    decode_config,
+    decode_config_sections,
+    decode_daily_cipher,
+    decode_ip,
+    decode_raw,
+    decode_tasks,
+    decode_upgrades,
+)
+from src.utils.loggers import log_hamster
 
 
 class HamsterKombat(HamsterClient):
-    proxy_connector: Optional[ProxyConnector]
-
-    __slots__ = ("proxy_connector",)
-
     def __init__(
         self,
         base_url: str,
         headers: Optional[dict] = None,
+        session_pool: Optional[HamsterSessionPool] = None,
+        cache: Optional[HamsterCache] = None,
+        proxy_check_ttl: int = 120,
+        max_inflight: int = 4,
     ) -> None:
-        super().__init__(base_url=base_url, headers=headers)
+        super().__init__(
+            base_url=base_url,
+            headers=headers,
+            session_pool=session_pool,
+            proxy_check_ttl=proxy_check_ttl,
+            max_inflight=max_inflight,
+        )
+        self.cache: HamsterCache = cache or HamsterCache()
+        get_user_agent_generator()
 
-        self.proxy_connector = None
+    @staticmethod
+    def create_session(
+        proxy_url: Optional[str] = None,
+        bearer_token: Optional[str] = None,
+        user_agent: Optional[str] = None,
+    ) -> HamsterSession:
+        if user_agent is None:
+            user_agent: str = generate_user_agent()
 
-    def set_proxy(self, proxy_connector: ProxyConnector) -> None:
-        self.proxy_connector = proxy_connector
+        return HamsterSession(
+            proxy_url=proxy_url, bearer_token=bearer_token, user_agent=user_agent
+        )
 
     async def auth_telegram(
         self,
-        bearer_token: str,
+        session: HamsterSession,
         endpoint: Optional[AuthEndpoints] = AuthEndpoints.TELEGRAM,
     ) -> Optional[UserData]:
-        self.headers["Authorization"] = f"Bearer {bearer_token}"
-        user_agent = UserAgent(
-            browsers=["chrome"],
-            os=["android", "ios"],
-            platforms=["mobile", "tablet"],
-        )
-        self.headers["User-Agent"] = str(user_agent.random)
-        response: Optional[dict] = await self._make_request(
+        response: bytes = await self._make_request(
             method=HTTPMethod.POST,
             endpoint=endpoint,
-            proxy_connector=self.proxy_connector,
+            session=session,
         )
-        return UserData(**response.get("telegramUser"))
+        return UserData(**decode_raw.decode(response).get("telegramUser"))
 
     async def auth_webapp(
         self,
+        session: HamsterSession,
         webapp_data: str,
         endpoint: Optional[AuthEndpoints] = AuthEndpoints.WEBAPP,
     ) -> Optional[AuthData]:
@@ -68,298 +105,261 @@ class HamsterKombat(HamsterClient):
             "fingerprint": generate_fingerprint(),
             "initDataRaw": webapp_data,
         }
-        self.headers["Authorization"] = f"authToken is empty, store token null"
-        user_agent = UserAgent(
-            browsers=["chrome"],
-            os=["android", "ios"],
-            platforms=["mobile", "tablet"],
-        )
-        self.headers["User-Agent"] = str(user_agent.random)
-        response: Optional[dict] = await self._make_request(
+        response: bytes = await self._make_request(
             method=HTTPMethod.POST,
             endpoint=endpoint,
+            session=session,
             json=json,
-            proxy_connector=self.proxy_connector,
         )
-        return AuthData(**response)
+        return AuthData(**decode_raw.decode(response))
 
     async def ip(
         self,
-        bearer_token: str,
+        session: HamsterSession,
         endpoint: Optional[AuthEndpoints] = AuthEndpoints.IP,
     ) -> Optional[HamsterIPData]:
-        self.headers["Authorization"] = f"Bearer {bearer_token}"
-        user_agent = UserAgent(
-            browsers=["chrome"],
-            os=["android", "ios"],
-            platforms=["mobile", "tablet"],
-        )
-        self.headers["User-Agent"] = str(user_agent.random)
-        response: Optional[dict] = await self._make_request(
+        response: bytes = await self._make_request(
             method=HTTPMethod.GET,
             endpoint=endpoint,
-            proxy_connector=self.proxy_connector,
+            session=session,
         )
-        return HamsterIPData(**response)
+        return decode_ip.decode(response)
 
     async def sync(
         self,
-        bearer_token: str,
+        session: HamsterSession,
         endpoint: ClickerEndpoints = ClickerEndpoints.SYNC,
     ) -> Optional[HamsterData]:
-        self.headers["Authorization"] = f"Bearer {bearer_token}"
-        user_agent = UserAgent(
-            browsers=["chrome"],
-            os=["android", "ios"],
-            platforms=["mobile", "tablet"],
-        )
-        self.headers["User-Agent"] = str(user_agent.random)
-        response: Optional[dict] = await self._make_request(
+        response: bytes = await self._make_request(
             method=HTTPMethod.POST,
             endpoint=endpoint,
-            proxy_connector=self.proxy_connector,
+            session=session,
         )
-        return HamsterData(**response.get("clickerUser"))
+        return decode_clicker_user.decode(response).clicker_user
 
     async def buy_upgrade(
         self,
-        bearer_token: str,
+        session: HamsterSession,
         upgrade_id: str,
         endpoint: ClickerEndpoints = ClickerEndpoints.BUY_UPGRADE,
     ) -> Optional[HamsterData]:
-        self.headers["Accept"] = "application/json"
-        self.headers["Authorization"] = f"Bearer {bearer_token}"
-        user_agent = UserAgent(
-            browsers=["chrome"],
-            os=["android", "ios"],
-            platforms=["mobile", "tablet"],
-        )
-        self.headers["User-Agent"] = str(user_agent.random)
         json: dict[str, Any] = {
             "upgradeId": upgrade_id,
             "timestamp": int(time.time()),
         }
-        response: Optional[dict] = await self._make_request(
+        response: bytes = await self._make_request(
             method=HTTPMethod.POST,
             endpoint=endpoint,
+            session=session,
+            headers={"Accept": "application/json"},
             json=json,
-            proxy_connector=self.proxy_connector,
         )
 
-        return HamsterData(**response.get("clickerUser"))
+        return decode_clicker_user.decode(response).clicker_user
 
     async def tap(
         self,
-        bearer_token: str,
+        session: HamsterSession,
         available_taps: int,
         count: int,
         endpoint: ClickerEndpoints = ClickerEndpoints.TAP,
     ) -> Optional[HamsterData]:
-        self.headers["Accept"] = "application/json"
-        self.headers["Authorization"] = f"Bearer {bearer_token}"
-        user_agent = UserAgent(
-            browsers=["chrome"],
-            os=["android", "ios"],
-            platforms=["mobile", "tablet"],
-        )
-        self.headers["User-Agent"] = str(user_agent.random)
         json: dict[str, Any] = {
             "availableTaps": available_taps,
             "count": count,
             "timestamp": int(time.time()),
         }
-        response: Optional[dict] = await self._make_request(
+        response: bytes = await self._make_request(
             method=HTTPMethod.POST,
             endpoint=endpoint,
+            session=session,
+            headers={"Accept": "application/json"},
             json=json,
-            proxy_connector=self.proxy_connector,
         )
-        return HamsterData(**response.get("clickerUser"))
+        return decode_clicker_user.decode(response).clicker_user
 
     async def get_config(
         self,
-        bearer_token: str,
+        session: HamsterSession,
+        sections: Optional[Iterable[ConfigSection]] = None,
         endpoint: ClickerEndpoints = ClickerEndpoints.CONFIG,
     ) -> HamsterConfig:
-        self.headers["Authorization"] = f"Bearer {bearer_token}"
-        user_agent = UserAgent(
-            browsers=["chrome"],
-            os=["android", "ios"],
-            platforms=["mobile", "tablet"],
-        )
-        self.headers["User-Agent"] = str(user_agent.random)
-        response: Optional[dict] = await self._make_request(
+        response: bytes = await self._make_request(
             method=HTTPMethod.POST,
             endpoint=endpoint,
-            proxy_connector=self.proxy_connector,
+            session=session,
         )
-        return HamsterConfig(**response)
+        if sections is not None:
+            return decode_config_sections(response, sections=sections)
+
+        return decode_config.decode(response)
+
+    async def get_daily_cipher(
+        self,
+        session: HamsterSession,
+        endpoint: ClickerEndpoints = ClickerEndpoints.CONFIG,
+    ) -> Optional[HamsterDailyCipher]:
+        """
+        Daily cipher of the account. The cipher, its bonus and the reset time
+        are shared by all accounts and served from ``self.cache``.
+
+        ``is_claimed`` is per account and is always fetched for the account
+        itself, it is ``None`` only when that request failed.
+        """
+        responses: list[bytes] = []
+
+        async def fetch() -> bytes:
+            response: bytes = await self._make_request(
+                method=HTTPMethod.POST, endpoint=endpoint, session=session
+            )
+            responses.append(response)
+            return response
+
+        entry: Optional[GameConfigEntry] = await self.cache.get_config(fetch=fetch)
+        if entry is None or entry.config.daily_cipher is None:
+            return None
+
+        if responses:
+            # The shared config was just fetched with the account's session.
+            return daily_cipher_for_account(
+                entry, is_claimed=entry.config.daily_cipher.is_claimed
+            )
+
+        is_claimed: Optional[bool] = None
+        try:
+            config: HamsterConfig = await self.get_config(
+                session=session,
+                sections=(ConfigSection.DAILY_CIPHER,),
+                endpoint=endpoint,
+            )
+        except (RequestError, ClientError, TimeoutError) as error:
+            log_hamster.warning("Cannot get daily cipher state: %s", error)
+        else:
+            if config.daily_cipher is not None:
+                is_claimed: Optional[bool] = config.daily_cipher.is_claimed
+
+        return daily_cipher_for_account(entry, is_claimed=is_claimed)
 
     async def get_boosts(
         self,
-        bearer_token: str,
+        session: HamsterSession,
         endpoint: ClickerEndpoints = ClickerEndpoints.BOOSTS,
     ) -> Optional[HamsterBoosts]:
-        self.headers["Authorization"] = f"Bearer {bearer_token}"
-        user_agent = UserAgent(
-            browsers=["chrome"],
-            os=["android", "ios"],
-            platforms=["mobile", "tablet"],
-        )
-        self.headers["User-Agent"] = str(user_agent.random)
-        response: Optional[dict] = await self._make_request(
+        response: bytes = await self._make_request(
             method=HTTPMethod.POST,
             endpoint=endpoint,
-            proxy_connector=self.proxy_connector,
-        )
-        return HamsterBoosts(
-            boosts=[HamsterBoost(**boost) for boost in response.get("boostsForBuy")]
+            session=session,
         )
+        return decode_boosts.decode(response)
 
     async def get_upgrades(
         self,
-        bearer_token: str,
+        session: HamsterSession,
         endpoint: ClickerEndpoints = ClickerEndpoints.UPGRADES,
     ) -> Optional[HamsterUpgrades]:
-        self.headers["Authorization"] = f"Bearer {bearer_token}"
-        user_agent = UserAgent(
-            browsers=["chrome"],
-            os=["android", "ios"],
-            platforms=["mobile", "tablet"],
-        )
-        self.headers["User-Agent"] = str(user_agent.random)
-        response: Optional[dict] = await self._make_request(
+        response: bytes = await self._make_request(
             method=HTTPMethod.POST,
             endpoint=endpoint,
-            proxy_connector=self.proxy_connector,
+            session=session,
         )
-        return HamsterUpgrades(**response)
+        return decode_upgrades.decode(response)
 
     async def get_tasks(
         self,
-        bearer_token: str,
+        session: HamsterSession,
         endpoint: ClickerEndpoints = ClickerEndpoints.TASKS,
     ) -> Optional[HamsterTasks]:
-        self.headers["Authorization"] = f"Bearer {bearer_token}"
-        user_agent = UserAgent(
-            browsers=["chrome"],
-            os=["android", "ios"],
-            platforms=["mobile", "tablet"],
-        )
-        self.headers["User-Agent"] = str(user_agent.random)
-        response: Optional[dict] = await self._make_request(
+        response: bytes = await self._make_request(
             method=HTTPMethod.POST,
             endpoint=endpoint,
-            proxy_connector=self.proxy_connector,
-        )
-        return HamsterTasks(
-            tasks=[HamsterTask(**task) for task in response.get("tasks")]
+            session=session,
         )
+        return decode_tasks.decode(response)
 
     async def buy_boost(
         self,
-        bearer_token: str,
+        session: HamsterSession,
         boost_id: str,
         endpoint: ClickerEndpoints = ClickerEndpoints.BUY_BOOST,
     ) -> Optional[HamsterData]:
-        self.headers["Accept"] = "application/json"
-        self.headers["Authorization"] = f"Bearer {bearer_token}"
-        user_agent = UserAgent(
-            browsers=["chrome"],
-            os=["android", "ios"],
-            platforms=["mobile", "tablet"],
-        )
-        self.headers["User-Agent"] = str(user_agent.random)
         json: dict[str, Any] = {
             "boostId": boost_id,
             "timestamp": int(time.time()),
         }
-        response: Optional[dict] = await self._make_request(
+        response: bytes = await self._make_request(
             method=HTTPMethod.POST,
             endpoint=endpoint,
+            session=session,
+            headers={"Accept": "application/json"},
             json=json,
-            proxy_connector=self.proxy_connector,
         )
-        return HamsterData(**response.get("clickerUser"))
+        return decode_clicker_user.decode(response).clicker_user
 
     async def claim_daily_cipher(
         self,
-        bearer_token: str,
+        session: HamsterSession,
         cipher: str,
         endpoint: ClickerEndpoints = ClickerEndpoints.CLAIM_DAILY_CIPHER,
     ) -> tuple[Optional[HamsterData], Optional[HamsterDailyCipher]]:
-        self.headers["Authorization"] = f"Bearer {bearer_token}"
-        user_agent = UserAgent(
-            browsers=["chrome"],
-            os=["android", "ios"],
-            platforms=["mobile", "tablet"],
-        )
-        self.headers["User-Agent"] = str(user_agent.random)
         json: dict[str, Any] = {
             "cipher": cipher,
         }
-        response: Optional[dict] = await self._make_request(
+        response: bytes = await self._make_request(
             method=HTTPMethod.POST,
             endpoint=endpoint,
+            session=session,
             json=json,
-            proxy_connector=self.proxy_connector,
-        )
-        return HamsterData(**response.get("clickerUser")), HamsterDailyCipher(
-            **response.get("dailyCipher")
         )
+        daily_cipher: DailyCipherResponse = decode_daily_cipher.decode(response)
+        return daily_cipher.clicker_user, daily_cipher.daily_cipher
 
     async def claim_daily_combo(
         self,
-        bearer_token: str,
+        session: HamsterSession,
         endpoint: ClickerEndpoints = ClickerEndpoints.CLAIM_DAILY_COMBO,
     ) -> Optional[HamsterData]:
-        self.headers["Authorization"] = f"Bearer {bearer_token}"
-        user_agent = UserAgent(
-            browsers=["chrome"],
-            os=["android", "ios"],
-            platforms=["mobile", "tablet"],
-        )
-        self.headers["User-Agent"] = str(user_agent.random)
-        response: Optional[dict] = await self._make_request(
+        response: bytes = await self._make_request(
             method=HTTPMethod.POST,
             endpoint=endpoint,
-            proxy_connector=self.proxy_connector,
+            session=session,
         )
-        return HamsterData(**response.get("clickerUser"))
+        return decode_clicker_user.decode(response).clicker_user
 
     async def check_task(
         self,
-        bearer_token: str,
+        session: HamsterSession,
         task_id: str,
         endpoint: ClickerEndpoints = ClickerEndpoints.CHECK_TASK,
     ) -> tuple[Optional[HamsterTask], Optional[HamsterData]]:
-        self.headers["Authorization"] = f"Bearer {bearer_token}"
-        user_agent = UserAgent(
-            browsers=["chrome"],
-            os=["android", "ios"],
-            platforms=["mobile", "tablet"],
-        )
-        self.headers["User-Agent"] = str(user_agent.random)
         json: dict[str, Any] = {
             "taskId": task_id,
         }
-        response: Optional[dict] = await self._make_request(
+        response: bytes = await self._make_request(
             method=HTTPMethod.POST,
             endpoint=endpoint,
+            session=session,
             json=json,
-            proxy_connector=self.proxy_connector,
         )
-        return HamsterTask(**response.get("task")), HamsterData(
-            **response.get("clickerUser")
+        checked_task: CheckTaskResponse = decode_check_task.decode(response)
+        return checked_task.task, checked_task.clicker_user
+
+    async def get_actual_combos(
+        self, session: HamsterSession, remain_seconds: Optional[int] = None
+    ) -> Optional[HamsterDailyCombo]:
+        return await self.cache.get_daily_combo(
+            fetch=partial(self._fetch_actual_combos, proxy_url=session.proxy_url),
+            remain_seconds=remain_seconds,
         )
 
-    async def get_actual_combos(self) -> Optional[HamsterDailyCombo]:
+    async def _fetch_actual_combos(
+        self, proxy_url: Optional[str] = None
+    ) -> HamsterDailyCombo:
         response: Optional[dict] = await self._make_request_to_other(
             method=HTTPMethod.GET,
             base_url="https://api21.datavibe.top",
             endpoint="/api/GetCombo",
-            proxy_connector=self.proxy_connector,
+            proxy_url=proxy_url,
         )
         return HamsterDailyCombo(
-            upgradeIds=response.get("combo"), date=response.get("date")
+            upgrade_ids=response.get("combo"), actual_date=response.get("date")
         )
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class HamsterSession(BaseModel):
+    """
+    Immutable per-account request context.
+
+    Holds everything that used to be mutated on the shared ``HamsterKombat``
+    instance (bearer token, proxy and user agent), so any number of sessions
+    can make requests concurrently through one client.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    proxy_url: Optional[str] = None
+    bearer_token: Optional[str] = None
+    user_agent: Optional[str] = None
+
+    @property
+    def authorization(self) -> str:
+        if self.bearer_token is None:
+            return "authToken is empty, store token null"
+        return f"Bearer {self.bearer_token}"
+
+    def with_token(self, bearer_token: str) -> HamsterSession:
+        return self.model_copy(update={"bearer_token": bearer_token})
+
+    def build_headers(self, base_headers: dict, **extra: str) -> dict[str, str]:
+        headers: dict[str, str] = {
+            **base_headers,
+            "Authorization": self.authorization,
+            **extra,
+        }
+        if self.user_agent is not None:
+            headers["User-Agent"] = self.user_agent
+
+        return headers
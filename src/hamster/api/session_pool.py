@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import aiohttp
+from aiohttp_socks import ProxyConnector
+
+from src.utils.loggers import log_hamster
+
+
+class _PooledSession:
+    session: aiohttp.ClientSession
+    last_used: float
+    in_use: int
+
+    __slots__ = ("session", "last_used", "in_use")
+
+    def __init__(self, session: aiohttp.ClientSession) -> None:
+        self.session = session
+        self.last_used = time.monotonic()
+        self.in_use = 0
+
+
+class HamsterSessionPool:
+    """
+    Registry of long-lived aiohttp sessions keyed by proxy URL.
+
+    Every proxy gets its own session with a keep-alive connection pool, so
+    sequential requests through the same proxy reuse the already established
+    tunnel. Sessions that were idle longer than ``idle_ttl`` seconds are closed,
+    and when the registry grows over ``max_size`` the least recently used idle
+    sessions are closed first.
+    """
+
+    max_size: int
+    idle_ttl: float
+    limit_per_host: int
+    keepalive_timeout: float
+
+    __slots__ = (
+        "max_size",
+        "idle_ttl",
+        "limit_per_host",
+        "keepalive_timeout",
+        "_sessions",
+    )
+
+    def __init__(
+        self,
+        max_size: int = 512,
+        idle_ttl: float = 300,
+        limit_per_host: int = 4,
+        keepalive_timeout: float = 120,
+    ) -> None:
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self._sessions: OrderedDict[Optional[str], _PooledSession] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _create_session(self, proxy_url: Optional[str]) -> aiohttp.ClientSession:
+        if proxy_url is None:
+            connector: aiohttp.BaseConnector = aiohttp.TCPConnector(
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+        else:
+            connector: aiohttp.BaseConnector = ProxyConnector.from_url(
+                proxy_url,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+
+        # The session is shared by all accounts behind the proxy, the API
+        # authenticates by the bearer token and cookies would link them.
+        return aiohttp.ClientSession(
+            connector=connector,
+            connector_owner=True,
+            cookie_jar=aiohttp.DummyCookieJar(),
+        )
+
+    def _pop_expired(self) -> list[aiohttp.ClientSession]:
+        now: float = time.monotonic()
+        overflow: int = len(self._sessions) - self.max_size
+        stale: list[Optional[str]] = []
+
+        # The registry is ordered from the least recently used session, so the
+        # scan stops at the first fresh one. Only sessions in use are skipped.
+        for proxy_url, pooled in self._sessions.items():
+            if pooled.in_use:
+                continue
+            if len(stale) >= overflow and now - pooled.last_used <= self.idle_ttl:
+                break
+            stale.append(proxy_url)
+
+        return [self._sessions.pop(proxy_url).session for proxy_url in stale]
+
+    async def _close_sessions(self, sessions: list[aiohttp.ClientSession]) -> None:
+        if not sessions:
+            return
+
+        await asyncio.gather(
+            *[session.close() for session in sessions], return_exceptions=True
+        )
+        log_hamster.info("Closed %d idle Hamster API sessions", len(sessions))
+
+    @asynccontextmanager
+    async def acquire(
+        self, proxy_url: Optional[str] = None
+    ) -> AsyncIterator[aiohttp.ClientSession]:
+        pooled: Optional[_PooledSession] = self._sessions.get(proxy_url)
+        if pooled is None or pooled.session.closed:
+            pooled: _PooledSession = _PooledSession(
+                session=self._create_session(proxy_url=proxy_url)
+            )
+            self._sessions[proxy_url] = pooled
+
+        self._sessions.move_to_end(proxy_url)
+        pooled.in_use += 1
+        try:
+            await self._close_sessions(self._pop_expired())
+            yield pooled.session
+        finally:
+            pooled.in_use -= 1
+            pooled.last_used = time.monotonic()
+            if self._sessions.get(proxy_url) is pooled:
+                self._sessions.move_to_end(proxy_url)
+
+    async def close(self) -> None:
+        sessions: list[aiohttp.ClientSession] = [
+            pooled.session for pooled in self._sessions.values()
+        ]
+        self._sessions.clear()
+        await self._close_sessions(sessions)
@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from types import TracebackType
+from typing import Any, Callable, Iterable, Mapping, Optional, Self, Type
+
+from apscheduler import (
+    ConflictingIdError,
+    ConflictPolicy,
+    Schedule,
+    ScheduleLookupError,
+)
+from apscheduler.triggers.interval import IntervalTrigger
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+
+from src.database import SQLSessionContext
+from src.database.models import DBAccountSchedule
+from src.utils.loggers import service
+
+
+class TickSchedule(BaseModel):
+    """
+    The part of ``apscheduler.Schedule`` the handlers read.
+    """
+
+    id: str
+    task_id: str
+    next_fire_time: Optional[datetime] = None
+    paused: bool = False
+    kwargs: dict[str, Any] = {}
+
+
+class TickTask(BaseModel):
+    func: Callable[..., Any]
+    misfire_grace_time: Optional[float] = None
+    max_running_jobs: Optional[int] = None
+
+
+class TickScheduler:
+    """
+    Drop-in replacement for the subset of ``AsyncScheduler`` used by the bot.
+
+    Interval schedules are rows of ``account_schedules``. One periodic tick
+    locks the due rows in batches, moves them to their next run and hands
+    them to a bounded pool of workers, so the cost of a tick depends on the
+    number of due accounts, not on the number of schedules.
+
+    With ``shard_count`` > 1 every dispatcher only claims the accounts with
+    ``account_id % shard_count == shard_index``, schedules without an
+    account belong to the first shard.
+    """
+
+    def __init__(
+        self,
+        session_pool: async_sessionmaker[AsyncSession],
+        tick_interval: int = 5,
+        batch_size: int = 500,
+        max_workers: int = 64,
+        shard_count: int = 1,
+        shard_index: int = 0,
+    ) -> None:
+        self.session_pool = session_pool
+        self.tick_interval = tick_interval
+        self.batch_size = batch_size
+        self.shard_count = shard_count
+        self.shard_index = shard_index
+        self._tasks: dict[str, TickTask] = {}
+        self.max_workers = max_workers
+        self._running_jobs: dict[str, int] = {}
+        self._running_schedules: set[str] = set()
+        self._jobs: set[asyncio.Task] = set()
+        self._loop: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.stop()
+
+    async def configure_task(
+        self,
+        func_or_task_id: str,
+        *,
+        func: Callable[..., Any],
+        misfire_grace_time: Optional[float] = None,
+        max_running_jobs: Optional[int] = None,
+    ) -> None:
+        self._tasks[func_or_task_id] = TickTask(
+            func=func,
+            misfire_grace_time=misfire_grace_time,
+            max_running_jobs=max_running_jobs,
+        )
+
+    async def add_schedule(
+        self,
+        func_or_task_id: str,
+        trigger: IntervalTrigger,
+        *,
+        id: str,
+        args: Iterable = (),
+        kwargs: Optional[Mapping[str, Any]] = None,
+        paused: bool = False,
+        conflict_policy: ConflictPolicy = ConflictPolicy.do_nothing,
+        **_: Any,
+    ) -> str:
+        interval: int = int(
+            timedelta(
+                weeks=trigger.weeks,
+                days=trigger.days,
+                hours=trigger.hours,
+                minutes=trigger.minutes,
+                seconds=trigger.seconds,
+                microseconds=trigger.microseconds,
+            ).total_seconds()
+        )
+        next_run_at: datetime = _as_naive(trigger.start_time) or (
+            datetime.now() + timedelta(seconds=interval)
+        )
+        kwargs: dict[str, Any] = dict(kwargs or {})
+
+        async with SQLSessionContext(session_pool=self.session_pool) as (repo, uow):
+            schedule: Optional[DBAccountSchedule] = await repo.schedules.get_one(
+                schedule_id=id
+            )
+            if schedule is None:
+                schedule: DBAccountSchedule = DBAccountSchedule.create(
+                    schedule_id=id,
+                    task_id=func_or_task_id,
+                    account_id=kwargs.get("account_id"),
+                    interval=interval,
+                    next_run_at=next_run_at,
+                    is_paused=paused,
+                    kwargs=kwargs,
+                )
+            elif conflict_policy == ConflictPolicy.exception:
+                raise ConflictingIdError(id)
+            elif conflict_policy == ConflictPolicy.do_nothing:
+                return id
+            else:
+                schedule.set_data(
+                    task_id=func_or_task_id,
+                    account_id=kwargs.get("account_id"),
+                    interval=interval,
+                    next_run_at=next_run_at,
+                    is_paused=paused,
+                    kwargs=kwargs,
+                )
+
+            await uow.add(schedule, commit=True)
+
+        return id
+
+    async def get_schedule(self, id: str) -> TickSchedule:
+        async with SQLSessionContext(session_pool=self.session_pool) as (repo, _):
+            schedule: Optional[DBAccountSchedule] = await repo.schedules.get_one(
+                schedule_id=id
+            )
+
+        if schedule is None:
+            raise ScheduleLookupError(id)
+
+        # Aware like the APScheduler fire times, the column is local time.
+        return TickSchedule(
+            id=schedule.id,
+            task_id=schedule.task_id,
+            next_fire_time=schedule.next_run_at.astimezone(),
+            paused=schedule.is_paused,
+        )
+
+    async def remove_schedule(self, id: str) -> None:
+        async with SQLSessionContext(session_pool=self.session_pool) as (repo, uow):
+            schedule: Optional[DBAccountSchedule] = await repo.schedules.get_one(
+                schedule_id=id
+            )
+            if schedule is None:
+                raise ScheduleLookupError(id)
+
+            await uow.delete(schedule)
+
+    async def pause_schedule(self, id: str) -> None:
+        await self._set_paused(id=id, is_paused=True)
+
+    async def unpause_schedule(self, id: str) -> None:
+        await self._set_paused(id=id, is_paused=False)
+
+    async def _set_paused(self, id: str, is_paused: bool) -> None:
+        async with SQLSessionContext(session_pool=self.session_pool) as (repo, uow):
+            schedule: Optional[DBAccountSchedule] = await repo.schedules.get_one(
+                schedule_id=id
+            )
+            if schedule is None:
+                raise ScheduleLookupError(id)
+
+            schedule.set_data(is_paused=is_paused)
+            await uow.add(schedule, commit=True)
+
+    async def import_schedules(self, schedules: Iterable[Schedule]) -> int:
+        """
+        Copy interval schedules of an ``AsyncScheduler`` when the dispatcher
+        table is still empty, so switching the mode keeps the running
+        automatic functions.
+        """
+        async with SQLSessionContext(session_pool=self.session_pool) as (repo, _):
+            if await repo.schedules.count():
+                return 0
+
+        imported: int = 0
+        for schedule in schedules:
+            if not isinstance(schedule.trigger, IntervalTrigger):
+                continue
+
+            schedule.trigger.start_time = schedule.next_fire_time
+            await self.add_schedule(
+                schedule.task_id,
+                schedule.trigger,
+                id=schedule.id,
+                kwargs=schedule.kwargs,
+                paused=schedule.paused,
+            )
+            imported += 1
+
+        return imported
+
+    async def start_in_background(self) -> None:
+        self._loop = asyncio.create_task(self._run())
+
+    async def run_until_stopped(self) -> None:
+        await self.start_in_background()
+        await self._loop
+
+    async def stop(self) -> None:
+        if self._loop is not None:
+            self._loop.cancel()
+            self._loop = None
+
+        for job in self._jobs:
+            job.cancel()
+        await asyncio.gather(*self._jobs, return_exceptions=True)
+
+    async def _run(self) -> None:
+        service.info("Tick scheduler started, interval: %s s", self.tick_interval)
+        while True:
+            try:
+                await self.tick()
+            except Exception as error:
+                service.exception("Tick failed: %s", error)
+
+            await asyncio.sleep(self.tick_interval)
+
+    async def tick(self) -> int:
+        """
+        Dispatch every schedule that is due. Batches are claimed until a
+        batch comes back incomplete.
+        """
+        dispatched: int = 0
+        while True:
+            # Only as many rows are claimed as there are free workers, the
+            # rest stays due for the next tick instead of waiting in memory
+            # for a worker until it misfires.
+            limit: int = min(self.batch_size, self.max_workers - len(self._jobs))
+            if limit <= 0:
+                return dispatched
+
+            batch, claimed = await self._claim_due(limit=limit)
+            for schedule in batch:
+                self._dispatch(schedule)
+
+            dispatched += len(batch)
+            # Misfired rows are claimed too, only a short claim means that
+            # no due rows are left.
+            if claimed < limit:
+                return dispatched
+
+    async def _claim_due(self, limit: int) -> tuple[list[TickSchedule], int]:
+        """
+        Claim a batch of due rows. Returns the schedules to run, without the
+        misfired ones, and the number of claimed rows.
+        """
+        now: datetime = datetime.now()
+        batch: list[TickSchedule] = []
+        async with SQLSessionContext(session_pool=self.session_pool) as (repo, uow):
+            schedules: list[DBAccountSchedule] = await repo.schedules.get_due(
+                due_at=now,
+                shard_count=self.shard_count,
+                shard_index=self.shard_index,
+                limit_value=limit,
+            )
+            for schedule in schedules:
+                task: Optional[TickTask] = self._tasks.get(schedule.task_id)
+                is_misfired: bool = (
+                    task is not None
+                    and task.misfire_grace_time is not None
+                    and (now - schedule.next_run_at).total_seconds()
+                    > task.misfire_grace_time
+                )
+                if not is_misfired:
+                    batch.append(
+                        TickSchedule(
+                            id=schedule.id,
+                            task_id=schedule.task_id,
+                            next_fire_time=schedule.next_run_at,
+                            kwargs=schedule.kwargs or {},
+                        )
+                    )
+
+                # Claimed rows are moved to their next run right away, the
+                # job may still reschedule itself with another interval.
+                schedule.set_data(
+                    next_run_at=now + timedelta(seconds=schedule.interval)
+                )
+
+            await uow.commit()
+
+        return batch, len(schedules)
+
+    def _dispatch(self, schedule: TickSchedule) -> None:
+        task: Optional[TickTask] = self._tasks.get(schedule.task_id)
+        if task is None:
+            return service.warning(
+                "Task %s of schedule %s is not configured",
+                schedule.task_id,
+                schedule.id,
+            )
+
+        running_jobs: int = self._running_jobs.get(schedule.task_id, 0)
+        if schedule.id in self._running_schedules or (
+            task.max_running_jobs is not None and running_jobs >= task.max_running_jobs
+        ):
+            return
+
+        self._running_jobs[schedule.task_id] = running_jobs + 1
+        self._running_schedules.add(schedule.id)
+
+        job: asyncio.Task = asyncio.create_task(
+            self._run_job(schedule=schedule, func=task.func)
+        )
+        self._jobs.add(job)
+        job.add_done_callback(self._jobs.discard)
+
+    async def _run_job(self, schedule: TickSchedule, func: Callable[..., Any]) -> None:
+        try:
+            await func(**schedule.kwargs)
+        except Exception as error:
+            service.exception("Job of schedule %s failed: %s", schedule.id, error)
+        finally:
+            self._running_jobs[schedule.task_id] -= 1
+            self._running_schedules.discard(schedule.id)
+
+
+def _as_naive(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
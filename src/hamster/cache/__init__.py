@@ -0,0 +1,3 @@
+from .general import daily_cipher_for_account, GameConfigEntry, HamsterCache
+
+__all__ = ["HamsterCache", "GameConfigEntry", "daily_cipher_for_account"]
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Final, Optional
+
+from msgspec import Raw, Struct, structs
+from msgspec.json import Decoder, Encoder
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.hamster.enums import ConfigSection
+from src.hamster.models import HamsterConfig, HamsterDailyCipher, HamsterDailyCombo
+from src.hamster.models.responses import decode_config_sections
+from src.utils.loggers import log_hamster
+
+_encode: Final[Callable[[Any], bytes]] = Encoder().encode
+
+
+class SharedGameConfig(Struct):
+    game_day: str
+    expires_at: float
+    sections: dict[str, Raw]
+    is_retry: bool = False
+
+
+class GameConfigEntry(Struct):
+    game_day: str
+    expires_at: float
+    config: HamsterConfig
+    is_retry: bool = False
+
+    @property
+    def remain_seconds(self) -> int:
+        return max(int(self.expires_at - time.time()), 0)
+
+    def is_expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+
+class DailyComboEntry(Struct):
+    expires_at: float
+    combo: HamsterDailyCombo
+
+    def is_expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+
+_decode_raw_sections: Final[Decoder[dict[str, Raw]]] = Decoder(dict[str, Raw])
+_decode_shared_config: Final[Decoder[SharedGameConfig]] = Decoder(SharedGameConfig)
+_decode_daily_combo: Final[Decoder[HamsterDailyCombo]] = Decoder(HamsterDailyCombo)
+
+
+class HamsterCache:
+    """
+    Process-wide cache of game data that is the same for every account.
+
+    The game config and the decoded daily cipher are filled by the first
+    account that asks for them and kept until the daily reset
+    (``remainSeconds``). The actual daily combo is kept per date until the
+    combo reset, concurrent callers share one in-flight request. With
+    ``redis`` the data is shared between processes as well, so only one
+    process per game day hits the API.
+    """
+
+    redis: Optional[Redis]
+    key_prefix: str
+    combo_retry_ttl: int
+    config_retry_ttl: int
+
+    def __init__(
+        self,
+        redis: Optional[Redis] = None,
+        key_prefix: str = "hamster",
+        combo_retry_ttl: int = 300,
+        config_retry_ttl: int = 300,
+    ):
+        self.redis = redis
+        self.key_prefix = key_prefix
+        self.combo_retry_ttl = combo_retry_ttl
+        self.config_retry_ttl = config_retry_ttl
+        self._config: Optional[GameConfigEntry] = None
+        self._config_lock: asyncio.Lock = asyncio.Lock()
+        self._combos: dict[str, DailyComboEntry] = {}
+        self._combo_requests: dict[str, asyncio.Task[DailyComboEntry]] = {}
+
+    @property
+    def config_key(self) -> str:
+        return f"{self.key_prefix}:game_config"
+
+    def daily_combo_key(self, day: date) -> str:
+        return f"{self.key_prefix}:daily_combo:{day.isoformat()}"
+
+    async def get_config(
+        self, fetch: Callable[[], Awaitable[bytes]]
+    ) -> Optional[GameConfigEntry]:
+        entry: Optional[GameConfigEntry] = self._config
+        if entry is not None and not entry.is_expired():
+            return entry
+
+        async with self._config_lock:
+            entry: Optional[GameConfigEntry] = self._config
+            if entry is not None and not entry.is_expired():
+                return entry
+
+            entry: Optional[GameConfigEntry] = await self._load_shared_config()
+            if entry is None:
+                entry: Optional[GameConfigEntry] = await self._fetch_config(fetch)
+
+            self._config = entry
+            return entry
+
+    async def _fetch_config(
+        self, fetch: Callable[[], Awaitable[bytes]]
+    ) -> GameConfigEntry:
+        response: bytes = await fetch()
+        raw_sections: dict[str, Raw] = _decode_raw_sections.decode(response)
+        sections: dict[str, Raw] = {
+            section: raw_sections[section]
+            for section in ConfigSection
+            if section in raw_sections
+        }
+
+        config: HamsterConfig = decode_config_sections(_encode(sections), ConfigSection)
+        daily_cipher: Optional[HamsterDailyCipher] = config.daily_cipher
+        is_retry: bool = daily_cipher is None or not daily_cipher.remain_seconds
+        # Without the time of the daily reset the config is only kept for a
+        # short while, the accounts still share it instead of fetching it
+        # once more each.
+        ttl: int = self.config_retry_ttl if is_retry else daily_cipher.remain_seconds
+
+        expires_at: float = time.time() + ttl
+        shared: SharedGameConfig = SharedGameConfig(
+            game_day=datetime.fromtimestamp(expires_at, tz=timezone.utc)
+            .date()
+            .isoformat(),
+            expires_at=expires_at,
+            sections=sections,
+            is_retry=is_retry,
+        )
+        await self._store_shared(key=self.config_key, data=_encode(shared), ttl=ttl)
+
+        log_hamster.info(
+            "Game config cached for game day %s%s",
+            shared.game_day,
+            " (retry)" if is_retry else "",
+        )
+        return GameConfigEntry(
+            game_day=shared.game_day,
+            expires_at=expires_at,
+            config=config,
+            is_retry=is_retry,
+        )
+
+    async def _load_shared_config(self) -> Optional[GameConfigEntry]:
+        if self.redis is None:
+            return None
+
+        try:
+            data: Optional[bytes] = await self.redis.get(self.config_key)
+        except RedisError as error:
+            log_hamster.error("Cannot load game config from Redis: %s", error)
+            return None
+
+        if data is None:
+            return None
+
+        shared: SharedGameConfig = _decode_shared_config.decode(data)
+        if time.time() >= shared.expires_at:
+            return None
+
+        return GameConfigEntry(
+            game_day=shared.game_day,
+            expires_at=shared.expires_at,
+            config=decode_config_sections(_encode(shared.sections), ConfigSection),
+            is_retry=shared.is_retry,
+        )
+
+    async def get_daily_combo(
+        self,
+        fetch: Callable[[], Awaitable[HamsterDailyCombo]],
+        remain_seconds: Optional[int] = None,
+    ) -> HamsterDailyCombo:
+        day: date = datetime.now().date()
+        key: str = self.daily_combo_key(day)
+
+        entry: Optional[DailyComboEntry] = self._combos.get(key)
+        if entry is not None and not entry.is_expired():
+            return entry.combo
+
+        request: Optional[asyncio.Task[DailyComboEntry]] = self._combo_requests.get(key)
+        if request is None:
+            request: asyncio.Task[DailyComboEntry] = asyncio.create_task(
+                self._load_daily_combo(
+                    key=key, day=day, fetch=fetch, remain_seconds=remain_seconds
+                )
+            )
+            self._combo_requests[key] = request
+            request.add_done_callback(lambda _: self._combo_requests.pop(key, None))
+
+        # Shielded so that a cancelled caller does not cancel the request
+        # the other callers are waiting for.
+        entry: DailyComboEntry = await asyncio.shield(request)
+        return entry.combo
+
+    async def _load_daily_combo(
+        self,
+        key: str,
+        day: date,
+        fetch: Callable[[], Awaitable[HamsterDailyCombo]],
+        remain_seconds: Optional[int] = None,
+    ) -> DailyComboEntry:
+        entry: Optional[DailyComboEntry] = await self._load_shared_daily_combo(key)
+        if entry is None:
+            combo: HamsterDailyCombo = await fetch()
+
+            if combo.is_for_date(day):
+                ttl: int = remain_seconds or _seconds_until_next_day()
+            else:
+                # The external source has not published today's combo yet.
+                ttl: int = self.combo_retry_ttl
+
+            entry: DailyComboEntry = DailyComboEntry(
+                expires_at=time.time() + ttl, combo=combo
+            )
+            await self._store_shared(key=key, data=_encode(combo), ttl=ttl)
+
+        self._combos = {key: entry}
+        return entry
+
+    async def _load_shared_daily_combo(self, key: str) -> Optional[DailyComboEntry]:
+        if self.redis is None:
+            return None
+
+        try:
+            data: Optional[bytes] = await self.redis.get(key)
+            ttl: int = await self.redis.ttl(key)
+        except RedisError as error:
+            log_hamster.error("Cannot load daily combo from Redis: %s", error)
+            return None
+
+        if data is None or ttl <= 0:
+            return None
+
+        return DailyComboEntry(
+            expires_at=time.time() + ttl, combo=_decode_daily_combo.decode(data)
+        )
+
+    async def _store_shared(self, key: str, data: bytes, ttl: int) -> None:
+        if self.redis is None:
+            return
+
+        try:
+            await self.redis.set(key, data, ex=ttl)
+        except RedisError as error:
+            log_hamster.error("Cannot store %s in Redis: %s", key, error)
+
+
+def _seconds_until_next_day() -> int:
+    now: datetime = datetime.now()
+    midnight: datetime = datetime.combine(
+        now.date() + timedelta(days=1), datetime.min.time()
+    )
+    return max(int((midnight - now).total_seconds()), 1)
+
+
+def daily_cipher_for_account(
+    entry: GameConfigEntry, is_claimed: Optional[bool] = None
+) -> HamsterDailyCipher:
+    """
+    Copy of the shared daily cipher with the per-account fields filled in.
+
+    ``structs.replace`` does not run ``__post_init__``, so the cached cipher
+    is not decoded again. A config kept for a retry does not know the daily
+    reset, the cipher keeps its own ``remain_seconds`` then.
+    """
+    return structs.replace(
+        entry.config.daily_cipher,
+        is_claimed=is_claimed,
+        remain_seconds=(
+            entry.config.daily_cipher.remain_seconds
+            if entry.is_retry
+            else entry.remain_seconds
+        ),
+    )
@@ -1,5 +1,11 @@
 from .endpoints import AuthEndpoints, ClickerEndpoints
 from .tasks import TaskPeriodicity
-from .types import BoostType
+from .types import BoostType, ConfigSection
 
-__all__ = ["AuthEndpoints", "ClickerEndpoints", "TaskPeriodicity", "BoostType"]
+__all__ = [
+    "AuthEndpoints",
+    "ClickerEndpoints",
+    "TaskPeriodicity",
+    "BoostType",
+    "ConfigSection",
+]
@@ -5,3 +5,8 @@ class BoostType(StrEnum):
     EARN_PER_TAP = "BoostEarnPerTap"
     MAX_TAPS = "BoostMaxTaps"
     FULL_AVAILABLE_TAPS = "BoostFullAvailableTaps"
+
+
+class ConfigSection(StrEnum):
+    CLICKER_CONFIG = "clickerConfig"
+    DAILY_CIPHER = "dailyCipher"
@@ -2,165 +2,191 @@ from __future__ import annotations
 
 import base64
 import re
-from datetime import datetime
-from typing import Optional, Self
+from datetime import date, datetime
+from functools import cached_property
+from typing import Optional, Union
 
-from pydantic import BaseModel, Field, model_validator
+from msgspec import field, Raw, Struct
+from msgspec.json import Decoder
 
 
-class HamsterData(BaseModel):
+class HamsterData(Struct, rename="camel"):
     id: str
-    total_coins: Optional[float] = Field(0.0, alias="totalCoins")
-    balance_coins: Optional[float] = Field(0.0, alias="balanceCoins")
-    level: Optional[int] = Field(0, alias="level")
-    available_taps: Optional[int] = Field(0, alias="availableTaps")
-    last_sync_update: Optional[int] = Field(0, alias="lastSyncUpdate")
-    referrals_count: Optional[int] = Field(0, alias="referralsCount")
-    max_taps: Optional[int] = Field(0, alias="maxTaps")
-    earn_per_tap: Optional[int] = Field(0, alias="earnPerTap")
-    earn_passive_per_sec: Optional[float] = Field(0.0, alias="earnPassivePerSec")
-    earn_passive_per_hour: Optional[float] = Field(0.0, alias="earnPassivePerHour")
-    last_passive_earn: Optional[float] = Field(0.0, alias="lastPassiveEarn")
-    taps_recover_per_sec: Optional[float] = Field(0.0, alias="tapsRecoverPerSec")
+    total_coins: Optional[float] = 0.0
+    balance_coins: Optional[float] = 0.0
+    level: Optional[int] = 0
+    available_taps: Optional[int] = 0
+    last_sync_update: Optional[Union[int, datetime]] = 0
+    referrals_count: Optional[int] = 0
+    max_taps: Optional[int] = 0
+    earn_per_tap: Optional[int] = 0
+    earn_passive_per_sec: Optional[float] = 0.0
+    earn_passive_per_hour: Optional[float] = 0.0
+    last_passive_earn: Optional[float] = 0.0
+    taps_recover_per_sec: Optional[float] = 0.0
 
     boosts: Optional[dict[str, HamsterBoost]] = None
     upgrades: Optional[dict[str, HamsterUpgrade]] = None
     tasks: Optional[dict[str, HamsterTask]] = None
 
-    @model_validator(mode="after")
-    def timestamp2datetime(self) -> Self:
-        if self.last_sync_update is not None:
+    def __post_init__(self) -> None:
+        if isinstance(self.last_sync_update, int):
             self.last_sync_update = datetime.fromtimestamp(self.last_sync_update)
 
-        return self
 
+class HamsterConfig(Struct, rename="camel"):
+    clicker_config: Optional[ClickerConfig] = None
+    daily_cipher: Optional[HamsterDailyCipher] = None
 
-class HamsterConfig(BaseModel):
-    clicker_config: Optional[ClickerConfig] = Field(None, alias="clickerConfig")
-    daily_cipher: Optional[HamsterDailyCipher] = Field(None, alias="dailyCipher")
 
+class ClickerConfig(Struct, rename="camel", dict=True):
+    """
+    Large sections are kept as raw JSON and decoded on first access only.
+    """
 
-class ClickerConfig(BaseModel):
-    airdrop_tasks: Optional[list[dict]] = Field(None, alias="airdropTasks")
     boosts: Optional[list[dict]] = None
-    exchanges: Optional[list[dict]] = None
-    guid_link: Optional[dict] = Field(None, alias="guidLink")
-    level_up: Optional[dict] = Field(None, alias="levelUp")
-    max_passive_dt_seconds: Optional[int] = Field(None, alias="maxPassiveDtSeconds")
-    tasks: Optional[list[dict]] = None
-    upgrades: Optional[list[dict]] = None
-    user_levels_balance_coins: Optional[list[dict]] = Field(
-        None, alias="userLevels_balanceCoins"
+    guid_link: Optional[dict] = None
+    level_up: Optional[dict] = None
+    max_passive_dt_seconds: Optional[int] = None
+
+    airdrop_tasks_raw: Raw = field(default=Raw(), name="airdropTasks")
+    exchanges_raw: Raw = field(default=Raw(), name="exchanges")
+    tasks_raw: Raw = field(default=Raw(), name="tasks")
+    upgrades_raw: Raw = field(default=Raw(), name="upgrades")
+    user_levels_balance_coins_raw: Raw = field(
+        default=Raw(), name="userLevels_balanceCoins"
     )
 
+    @cached_property
+    def airdrop_tasks(self) -> Optional[list[dict]]:
+        return _decode_lazy_section(self.airdrop_tasks_raw)
+
+    @cached_property
+    def exchanges(self) -> Optional[list[dict]]:
+        return _decode_lazy_section(self.exchanges_raw)
+
+    @cached_property
+    def tasks(self) -> Optional[list[dict]]:
+        return _decode_lazy_section(self.tasks_raw)
+
+    @cached_property
+    def upgrades(self) -> Optional[list[dict]]:
+        return _decode_lazy_section(self.upgrades_raw)
+
+    @cached_property
+    def user_levels_balance_coins(self) -> Optional[list[dict]]:
+        return _decode_lazy_section(self.user_levels_balance_coins_raw)
+
+
+_lazy_section_decoder: Decoder[Optional[list[dict]]] = Decoder(Optional[list[dict]])
+
+
+def _decode_lazy_section(raw: Raw) -> Optional[list[dict]]:
+    if not raw:
+        return None
+    return _lazy_section_decoder.decode(raw)
+
 
-class HamsterDailyCipher(BaseModel):
-    bonus_coins: Optional[int] = Field(0, alias="bonusCoins")
+class HamsterDailyCipher(Struct, rename="camel"):
+    bonus_coins: Optional[int] = 0
     cipher: Optional[str] = None
-    is_claimed: Optional[bool] = Field(None, alias="isClaimed")
-    remain_seconds: Optional[int] = Field(None, alias="remainSeconds")
+    is_claimed: Optional[bool] = None
+    remain_seconds: Optional[int] = None
 
-    @model_validator(mode="after")
-    def decode_cipher(self) -> Self:
+    def __post_init__(self) -> None:
         if self.cipher is not None:
             t = re.sub(r"^(.{3})\d+(.*)", r"\1\2", self.cipher)
             self.cipher = base64.b64decode(t).decode("utf-8")
 
-        return self
 
+class HamsterBoosts(Struct):
+    boosts: Optional[list[HamsterBoost]] = field(default=None, name="boostsForBuy")
 
-class HamsterBoosts(BaseModel):
-    boosts: Optional[list[HamsterBoost]] = None
 
-
-class HamsterBoost(BaseModel):
-    type: str = Field(..., alias="id")
-    level: Optional[int] = Field(0, alias="level")
-    price: Optional[float] = Field(0.0, alias="price")
-    cooldown_seconds: Optional[int] = Field(0, alias="cooldownSeconds")
-    earn_per_tap: Optional[int] = Field(0, alias="earnPerTap")
-    earn_per_tap_delta: Optional[int] = Field(0, alias="earnPerTapDelta")
-    max_taps: Optional[int] = Field(0, alias="maxTaps")
-    max_taps_delta: Optional[int] = Field(0, alias="maxTapsDelta")
-    last_upgrade_at: Optional[float] = Field(None, alias="lastUpgradeAt")
-
-    @model_validator(mode="after")
-    def timestamp2datetime(self) -> Self:
-        if self.last_upgrade_at is not None:
+class HamsterBoost(Struct, rename="camel"):
+    type: str = field(name="id")
+    level: Optional[int] = 0
+    price: Optional[float] = 0.0
+    cooldown_seconds: Optional[int] = 0
+    earn_per_tap: Optional[int] = 0
+    earn_per_tap_delta: Optional[int] = 0
+    max_taps: Optional[int] = 0
+    max_taps_delta: Optional[int] = 0
+    last_upgrade_at: Optional[Union[float, datetime]] = None
+
+    def __post_init__(self) -> None:
+        if isinstance(self.last_upgrade_at, (int, float)):
             self.last_upgrade_at = datetime.fromtimestamp(self.last_upgrade_at)
 
-        return self
-
 
-class HamsterUpgrades(BaseModel):
-    upgrades: Optional[list[HamsterUpgrade]] = Field(None, alias="upgradesForBuy")
-    daily_combo: Optional[HamsterDailyCombo] = Field(None, alias="dailyCombo")
+class HamsterUpgrades(Struct):
+    upgrades: Optional[list[HamsterUpgrade]] = field(
+        default=None, name="upgradesForBuy"
+    )
+    daily_combo: Optional[HamsterDailyCombo] = field(default=None, name="dailyCombo")
 
 
-class HamsterUpgrade(BaseModel):
-    type: str = Field(..., alias="id")
+class HamsterUpgrade(Struct, rename="camel"):
+    type: str = field(name="id")
     name: Optional[str] = None
     condition: Optional[HamsterCondition] = None
     section: Optional[str] = None
     level: Optional[int] = 0
     price: Optional[float] = 0.0
-    profit_per_time: Optional[float] = Field(0.0, alias="profitPerTime")
-    profit_per_hour: Optional[float] = Field(0.0, alias="profitPerHour")
-    cooldown_seconds: Optional[int] = Field(0, alias="cooldownSeconds")
-    is_expired: Optional[bool] = Field(None, alias="isExpired")
-    is_active: Optional[bool] = Field(None, alias="isAvailable")
-    snapshot_referrals_count: Optional[int] = Field(
-        None, alias="snapshotReferralsCount"
-    )
-    last_upgrade_at: Optional[float | datetime] = Field(None, alias="lastUpgradeAt")
-
-    @model_validator(mode="after")
-    def timestamp2datetime(self) -> Self:
-        if self.last_upgrade_at is not None and isinstance(self.last_upgrade_at, float):
+    profit_per_time: Optional[float] = 0.0
+    profit_per_hour: Optional[float] = 0.0
+    cooldown_seconds: Optional[int] = 0
+    is_expired: Optional[bool] = None
+    is_active: Optional[bool] = field(default=None, name="isAvailable")
+    snapshot_referrals_count: Optional[int] = None
+    last_upgrade_at: Optional[Union[float, datetime]] = None
+
+    def __post_init__(self) -> None:
+        if isinstance(self.last_upgrade_at, (int, float)):
             self.last_upgrade_at = datetime.fromtimestamp(self.last_upgrade_at)
 
-        return self
 
+class HamsterDailyCombo(Struct, rename="camel"):
+    upgrade_ids: Optional[list] = field(default_factory=list)
+    bonus_coins: Optional[int] = 0
+    is_claimed: Optional[bool] = None
+    remain_seconds: Optional[int] = None
+    actual_date: Optional[str] = field(default=None, name="date")
 
-class HamsterDailyCombo(BaseModel):
-    upgrade_ids: Optional[list] = Field([], alias="upgradeIds")
-    bonus_coins: Optional[int] = Field(0, alias="bonusCoins")
-    is_claimed: Optional[bool] = Field(None, alias="isClaimed")
-    remain_seconds: Optional[int] = Field(None, alias="remainSeconds")
-    actual_date: Optional[str] = Field(None, alias="date")
+    def is_for_date(self, day: date) -> bool:
+        if not self.actual_date:
+            return False
 
+        parts: list[str] = self.actual_date.split("-")
+        return int(parts[0]) == day.day and int(parts[1]) == day.month
 
-class HamsterCondition(BaseModel):
+
+class HamsterCondition(Struct, rename="camel"):
     level: Optional[int] = 0
-    upgrade_type: Optional[str] = Field(None, alias="upgradeId")
+    upgrade_type: Optional[str] = field(default=None, name="upgradeId")
     link: Optional[str] = None
     links: Optional[list] = None
-    type: Optional[str] = Field(None, alias="_type")
+    type: Optional[str] = field(default=None, name="_type")
 
 
-class HamsterTasks(BaseModel):
+class HamsterTasks(Struct):
     tasks: Optional[list[HamsterTask]] = None
 
 
-class HamsterTask(BaseModel):
-    type: str = Field(..., alias="id")
+class HamsterTask(Struct, rename="camel"):
+    type: str = field(name="id")
     days: Optional[int] = None
-    reward_coins: Optional[int] = Field(0, alias="rewardCoins")
+    reward_coins: Optional[int] = 0
     periodicity: Optional[str] = None
-    is_completed: Optional[bool] = Field(None, alias="isCompleted")
-    completed_at: Optional[str] = Field(None, alias="completed_at")
-
-    @model_validator(mode="after")
-    def str2datetime(self) -> Self:
-        if self.completed_at is not None and isinstance(self.completed_at, str):
-            self.completed_at = datetime.strptime(
-                self.completed_at, "%Y-%m-%dT%H:%M:%S.%fZ"
-            )
+    is_completed: Optional[bool] = None
+    completed_at: Optional[datetime] = field(default=None, name="completed_at")
 
-        return self
+    def __post_init__(self) -> None:
+        if self.completed_at is not None and self.completed_at.tzinfo is not None:
+            self.completed_at = self.completed_at.replace(tzinfo=None)
 
 
-class HamsterIPData(BaseModel):
+class HamsterIPData(Struct):
     ip: Optional[str] = None
     country_code: Optional[str] = None
     city_name: Optional[str] = None
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import Any, Final, Iterable, Optional
+
+from msgspec import field, Raw, Struct
+from msgspec.json import Decoder
+
+from src.hamster.enums import ConfigSection
+from .hamster_data import (
+    ClickerConfig,
+    HamsterBoosts,
+    HamsterConfig,
+    HamsterDailyCipher,
+    HamsterData,
+    HamsterIPData,
+    HamsterTask,
+    HamsterTasks,
+    HamsterUpgrades,
+)
+
+
+class ClickerUserResponse(Struct):
+    clicker_user: HamsterData = field(name="clickerUser")
+
+
+class DailyCipherResponse(Struct):
+    clicker_user: HamsterData = field(name="clickerUser")
+    daily_cipher: HamsterDailyCipher = field(name="dailyCipher")
+
+
+class CheckTaskResponse(Struct):
+    task: HamsterTask
+    clicker_user: HamsterData = field(name="clickerUser")
+
+
+# Decoders are created once: msgspec builds the type-specific decoding plan
+# on construction, so reusing them keeps the per-response cost to parsing only.
+# ``strict=False`` keeps pydantic's lax coercions (e.g. ``1.0`` for an int).
+decode_raw: Final[Decoder[dict[str, Any]]] = Decoder(dict[str, Any])
+decode_clicker_user: Final[Decoder[ClickerUserResponse]] = Decoder(
+    ClickerUserResponse, strict=False
+)
+decode_daily_cipher: Final[Decoder[DailyCipherResponse]] = Decoder(
+    DailyCipherResponse, strict=False
+)
+decode_check_task: Final[Decoder[CheckTaskResponse]] = Decoder(
+    CheckTaskResponse, strict=False
+)
+decode_config: Final[Decoder[HamsterConfig]] = Decoder(HamsterConfig, strict=False)
+decode_boosts: Final[Decoder[HamsterBoosts]] = Decoder(HamsterBoosts, strict=False)
+decode_upgrades: Final[Decoder[HamsterUpgrades]] = Decoder(
+    HamsterUpgrades, strict=False
+)
+decode_tasks: Final[Decoder[HamsterTasks]] = Decoder(HamsterTasks, strict=False)
+decode_ip: Final[Decoder[HamsterIPData]] = Decoder(HamsterIPData, strict=False)
+
+_decode_config_sections: Final[Decoder[dict[str, Raw]]] = Decoder(dict[str, Raw])
+_config_sections: Final[dict[ConfigSection, tuple[str, Decoder]]] = {
+    ConfigSection.CLICKER_CONFIG: (
+        "clicker_config",
+        Decoder(ClickerConfig, strict=False),
+    ),
+    ConfigSection.DAILY_CIPHER: (
+        "daily_cipher",
+        Decoder(HamsterDailyCipher, strict=False),
+    ),
+}
+
+
+def decode_config_sections(
+    data: bytes, sections: Iterable[ConfigSection]
+) -> HamsterConfig:
+    """
+    Decode only the requested top-level sections of ``/clicker/config``.
+
+    The rest of the document is only validated and skipped as ``Raw``,
+    no Python objects are built for it.
+    """
+    raw_sections: dict[str, Raw] = _decode_config_sections.decode(data)
+
+    decoded: dict[str, Any] = {}
+    for section in sections:
+        raw: Optional[Raw] = raw_sections.get(section)
+        if raw is None:
+            continue
+
+        attr, decoder = _config_sections[section]
+        decoded[attr] = decoder.decode(raw)
+
+    return HamsterConfig(**decoded)
@@ -4,7 +4,7 @@ from alembic import context
 from alembic.config import Config
 from sqlalchemy import MetaData, URL
 from sqlalchemy.engine import Connection
-from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine
 
 from src.app_config import PostgresConfig
 from src.database import Base
@@ -71,7 +71,8 @@ async def run_async_migrations() -> None:
     In this scenario we need to create an Engine
     and associate a connection with the context.
     """
-    connectable: AsyncEngine = create_async_engine(url=_get_postgres_dsn())
+    connectable, _ = PostgresConfig().create_pool()
+    connectable: AsyncEngine
 
     async with connectable.connect() as connection:
         await connection.run_sync(do_run_migrations)
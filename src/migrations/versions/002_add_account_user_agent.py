@@ -0,0 +1,28 @@
+"""add_account_user_agent
+
+Revision ID: 002
+Revises: 001
+Create Date: 2024-08-24 12:10:42.518307
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Left empty, the application assigns a user agent to each existing
+    # account on its first request.
+    op.add_column("accounts", sa.Column("user_agent", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("accounts", "user_agent")
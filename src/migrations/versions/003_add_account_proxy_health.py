@@ -0,0 +1,30 @@
+"""add_account_proxy_health
+
+Revision ID: 003
+Revises: 002
+Create Date: 2024-08-25 16:42:07.913254
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "account_proxies", sa.Column("checked_at", sa.DateTime(), nullable=True)
+    )
+    op.add_column("account_proxies", sa.Column("latency", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("account_proxies", "latency")
+    op.drop_column("account_proxies", "checked_at")
@@ -0,0 +1,31 @@
+"""add_autofarm_fill_percent
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-08-26 18:20:51.604127
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "account_configs",
+        sa.Column(
+            "autofarm_fill_percent", sa.Integer(), server_default="90", nullable=True
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("account_configs", "autofarm_fill_percent")
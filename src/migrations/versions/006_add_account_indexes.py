@@ -0,0 +1,142 @@
+"""add_account_indexes
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-08-27 10:42:17.381905
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UNIQUE_TYPE_TABLES: tuple[str, ...] = (
+    "account_boosts",
+    "account_upgrades",
+    "account_tasks",
+)
+
+
+def deduplicate(table: str) -> None:
+    if table == "account_upgrades":
+        # Conditions of the duplicated upgrades are moved to the kept row
+        # first, the foreign key would cascade the delete to them otherwise.
+        op.execute(
+            """
+            UPDATE account_upgrades AS upgrade
+            SET condition_id = duplicate.keep_id
+            FROM (
+                SELECT id, min(id) OVER (PARTITION BY account_id, type) AS keep_id
+                FROM account_upgrades
+            ) AS duplicate
+            WHERE upgrade.condition_id = duplicate.id
+                AND duplicate.id <> duplicate.keep_id
+            """
+        )
+
+    op.execute(
+        f"""
+        DELETE FROM {table} AS duplicate
+        USING {table} AS kept
+        WHERE duplicate.account_id = kept.account_id
+            AND duplicate.type = kept.type
+            AND duplicate.id > kept.id
+        """
+    )
+
+
+def build_index(index_name: str, table_name: str, columns: list[str], **kwargs) -> None:
+    # A failed concurrent build leaves an INVALID index behind, which would
+    # make the retry fail with "already exists".
+    op.drop_index(
+        index_name,
+        table_name=table_name,
+        if_exists=True,
+        postgresql_concurrently=True,
+    )
+    op.create_index(
+        index_name, table_name, columns, postgresql_concurrently=True, **kwargs
+    )
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY does not lock the tables for writes, but it
+    # cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        for table in UNIQUE_TYPE_TABLES:
+            # Deduplicated right before the build, so only the rows written
+            # during the build itself can make it fail.
+            deduplicate(table)
+            build_index(
+                f"uq_{table}_account_id_type",
+                table,
+                ["account_id", "type"],
+                unique=True,
+            )
+
+        build_index(
+            op.f("ix_account_ciphers_account_id"),
+            "account_ciphers",
+            ["account_id"],
+            unique=False,
+        )
+        build_index(
+            op.f("ix_account_configs_account_id"),
+            "account_configs",
+            ["account_id"],
+            unique=False,
+        )
+        build_index(
+            op.f("ix_account_proxies_config_id"),
+            "account_proxies",
+            ["config_id"],
+            unique=False,
+        )
+        build_index(
+            "ix_account_upgrades_account_id_available",
+            "account_upgrades",
+            ["account_id"],
+            unique=False,
+            postgresql_where=sa.text("is_active AND NOT is_expired"),
+        )
+
+    # Attaching a ready unique index as a constraint is instant.
+    for table in UNIQUE_TYPE_TABLES:
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT uq_{table}_account_id_type "
+            f"UNIQUE USING INDEX uq_{table}_account_id_type"
+        )
+
+
+def downgrade() -> None:
+    for table in UNIQUE_TYPE_TABLES:
+        op.drop_constraint(f"uq_{table}_account_id_type", table, type_="unique")
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_account_upgrades_account_id_available",
+            table_name="account_upgrades",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            op.f("ix_account_proxies_config_id"),
+            table_name="account_proxies",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            op.f("ix_account_configs_account_id"),
+            table_name="account_configs",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            op.f("ix_account_ciphers_account_id"),
+            table_name="account_ciphers",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,34 @@
+"""add_digest_notifications
+
+Revision ID: 007
+Revises: 006
+Create Date: 2024-09-02 12:10:37.218455
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "account_configs",
+        sa.Column(
+            "is_digest_notifications",
+            sa.Boolean(),
+            server_default=sa.false(),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("account_configs", "is_digest_notifications")
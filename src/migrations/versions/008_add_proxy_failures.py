@@ -0,0 +1,29 @@
+"""add_proxy_failures
+
+Revision ID: 008
+Revises: 007
+Create Date: 2024-09-03 10:24:51.603112
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "account_proxies",
+        sa.Column("failures", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("account_proxies", "failures")
@@ -1,18 +1,27 @@
 from __future__ import annotations
 
+import asyncio
+import os
+import platform
 from functools import partial
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 
 from aiogram import Bot, Dispatcher, loggers
+from apscheduler import AsyncScheduler, SchedulerRole
+from apscheduler.triggers.interval import IntervalTrigger
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncEngine, AsyncSession
 
-from src.hamster import HamsterKombat
-from .enums import TaskIds
+from src.database import AccountStateBuffer, log_pool_stats
+from src.factory import create_hamster
+from src.hamster import add_schedule, HamsterKombat
+from src.hamster.apscheduler.tick import TickScheduler
+from src.telegram.delivery import NotificationDigest, SendQueue
+from .enums import SchedulerMode, TaskIds
 from .telegram.dialogs import user
 from .telegram.dialogs.user.accounts.handlers import (
-    handle_autofarm,
-    handle_autosync,
-    handle_autoupgrade,
+    handle_account_pipeline,
+    handle_proxy_monitor,
 )
 
 if TYPE_CHECKING:
@@ -25,83 +34,270 @@ async def polling_startup(bot: Bot, config: AppConfig) -> None:
         loggers.dispatcher.info("Updates skipped successfully")
 
 
-async def run_polling(dp: Dispatcher, bot: Bot) -> None:
-    dp.startup.register(polling_startup)
-    dp.include_routers(user.router)
+async def polling_shutdown(hamster: HamsterKombat) -> None:
+    await hamster.close()
+    loggers.dispatcher.info("Hamster API sessions closed")
 
-    session: async_sessionmaker[AsyncSession] = dp["db_session"]
-    engine: AsyncEngine = dp["engine"]
-    hamster: HamsterKombat = dp["hamster"]
-    config: AppConfig = dp["config"]
 
-    async with config.postgres.build_scheduler(engine=engine) as sched:
+def start_pool_stats(engine: AsyncEngine, config: AppConfig) -> Optional[asyncio.Task]:
+    if not config.postgres.metrics_interval:
+        return None
+
+    return asyncio.create_task(
+        log_pool_stats(engine=engine, interval=config.postgres.metrics_interval)
+    )
+
+
+def create_state_buffer(
+    config: AppConfig, session: async_sessionmaker[AsyncSession]
+) -> Optional[AccountStateBuffer]:
+    if not config.postgres.write_behind_interval:
+        return None
+
+    return AccountStateBuffer(
+        session_pool=session, flush_interval=config.postgres.write_behind_interval
+    )
+
+
+def create_send_queue(
+    bot: Bot, config: AppConfig, redis: Redis, consume: bool = True
+) -> SendQueue:
+    # Without Redis every process sends its own notifications.
+    return SendQueue(
+        bot=bot,
+        workers=config.telegram.send_queue_workers,
+        redis=redis if config.telegram.send_queue_redis else None,
+        consume=consume or not config.telegram.send_queue_redis,
+    )
+
+
+async def build_scheduler(
+    config: AppConfig,
+    engine: AsyncEngine,
+    session: async_sessionmaker[AsyncSession],
+    identity: str = "schd",
+    role: SchedulerRole = SchedulerRole.both,
+) -> AsyncScheduler | TickScheduler:
+    if config.scheduler.mode != SchedulerMode.TICK:
+        return config.postgres.build_scheduler(
+            engine=engine, identity=identity, role=role
+        )
+
+    sched: TickScheduler = TickScheduler(
+        session_pool=session,
+        tick_interval=config.scheduler.tick_interval,
+        batch_size=config.scheduler.tick_batch_size,
+        max_workers=config.scheduler.tick_workers,
+        shard_count=config.scheduler.shard_count,
+        shard_index=config.scheduler.shard_index,
+    )
+    async with config.postgres.build_scheduler(engine=engine) as legacy_sched:
+        imported: int = await sched.import_schedules(await legacy_sched.get_schedules())
+
+    if imported:
+        loggers.dispatcher.info("Imported %s schedules from APScheduler", imported)
+    return sched
+
+
+async def configure_tasks(
+    sched: AsyncScheduler | TickScheduler,
+    config: AppConfig,
+    sender: SendQueue,
+    hamster: HamsterKombat,
+    session: async_sessionmaker[AsyncSession],
+    buffer: Optional[AccountStateBuffer] = None,
+    digest: Optional[NotificationDigest] = None,
+) -> None:
+    # The automatic functions of an account run as one pipeline, the task
+    # only tells which stage was fired.
+    for task_id in (TaskIds.AUTOFARM, TaskIds.AUTOUPGRADE, TaskIds.AUTOSYNC):
         await sched.configure_task(
-            TaskIds.AUTOFARM,
+            task_id,
             func=partial(
-                handle_autofarm,
+                handle_account_pipeline,
+                task_id=task_id,
                 config=config,
-                bot=bot,
+                sender=sender,
                 hamster=hamster,
                 session=session,
-                engine=engine,
+                sched=sched,
+                buffer=buffer,
+                digest=digest,
             ),
             misfire_grace_time=10,
         )
 
-        await sched.configure_task(
-            TaskIds.AUTOUPGRADE,
-            func=partial(
-                handle_autoupgrade,
+    await sched.configure_task(
+        TaskIds.PROXY_MONITOR,
+        func=partial(
+            handle_proxy_monitor,
+            config=config,
+            sender=sender,
+            hamster=hamster,
+            session=session,
+            sched=sched,
+        ),
+        misfire_grace_time=10,
+        max_running_jobs=1,
+    )
+
+    await add_schedule(
+        sched=sched,
+        trigger=IntervalTrigger(seconds=config.hamster.proxy_monitor_interval),
+        schedule_id=TaskIds.PROXY_MONITOR,
+        task_id=TaskIds.PROXY_MONITOR,
+        set_start_time=False,
+    )
+
+    # await sched.configure_task(
+    #     TaskIds.NIGHT_SLEEP,
+    #     func=partial(
+    #         handle_night_sleep,
+    #         config=config,
+    #         sender=sender,
+    #         hamster=hamster,
+    #         session=session,
+    #         sched=sched,
+    #     ),
+    #     misfire_grace_time=10,
+    # )
+    #
+    # now = datetime.now()
+    # midnight = datetime.combine(now + timedelta(days=1), time())
+    # seconds_until_midnight = (midnight - now).seconds
+    # random_seconds = seconds_until_midnight + random.randint(1800, 3600)
+    #
+    # await add_schedule(
+    #     sched=sched,
+    #     trigger=IntervalTrigger(
+    #         seconds=random_seconds,
+    #     ),
+    #     schedule_id="night_sleep",
+    #     task_id=TaskIds.NIGHT_SLEEP,
+    #     random_seconds_after_midnight=random_seconds
+    # )
+
+
+async def run_polling(dp: Dispatcher, bot: Bot) -> None:
+    dp.startup.register(polling_startup)
+    dp.shutdown.register(polling_shutdown)
+    dp.include_routers(user.router)
+
+    session: async_sessionmaker[AsyncSession] = dp["db_session"]
+    engine: AsyncEngine = dp["engine"]
+    hamster: HamsterKombat = dp["hamster"]
+    config: AppConfig = dp["config"]
+
+    # Without jobs in the bot the automation runs in ``worker.py`` processes,
+    # the bot only manages the schedules.
+    run_jobs: bool = config.scheduler.run_jobs_in_bot
+    sched: AsyncScheduler | TickScheduler = await build_scheduler(
+        config=config,
+        engine=engine,
+        session=session,
+        role=SchedulerRole.both if run_jobs else SchedulerRole.scheduler,
+    )
+    pool_stats: Optional[asyncio.Task] = start_pool_stats(engine=engine, config=config)
+    buffer: Optional[AccountStateBuffer] = create_state_buffer(
+        config=config, session=session
+    )
+    if buffer is not None:
+        await buffer.start()
+    sender: SendQueue = create_send_queue(bot=bot, config=config, redis=dp["redis"])
+    await sender.start()
+    digest: NotificationDigest = NotificationDigest(
+        redis=dp["redis"], sender=sender, interval=config.telegram.digest_interval
+    )
+    await digest.start()
+
+    try:
+        async with sched:
+            await configure_tasks(
+                sched=sched,
                 config=config,
-                bot=bot,
+                sender=sender,
                 hamster=hamster,
                 session=session,
-                engine=engine,
-            ),
-            misfire_grace_time=10,
-        )
+                buffer=buffer,
+                digest=digest,
+            )
 
-        await sched.configure_task(
-            TaskIds.AUTOSYNC,
-            func=partial(
-                handle_autosync,
+            dp["sched"] = sched
+            if run_jobs or config.scheduler.mode != SchedulerMode.TICK:
+                await sched.start_in_background()
+            return await dp.start_polling(bot)
+    finally:
+        await digest.stop()
+        await sender.stop()
+        if buffer is not None:
+            await buffer.stop()
+        if pool_stats is not None:
+            pool_stats.cancel()
+
+
+async def run_worker(bot: Bot, config: AppConfig) -> None:
+    engine, session = config.postgres.create_pool(
+        enable_logging=config.common.sqlalchemy_logging
+    )
+    engine: AsyncEngine
+    session: async_sessionmaker[AsyncSession]
+    pool_stats: Optional[asyncio.Task] = start_pool_stats(engine=engine, config=config)
+    redis: Redis = config.redis.build_client()
+    hamster: HamsterKombat = create_hamster(config=config, redis=redis)
+
+    sched: AsyncScheduler | TickScheduler = await build_scheduler(
+        config=config,
+        engine=engine,
+        session=session,
+        # APScheduler tells the processes apart by the identity, the shard
+        # index alone is the same for all workers left at the default.
+        identity=f"worker-{config.scheduler.shard_index}-{platform.node()}-{os.getpid()}",
+        role=SchedulerRole.worker,
+    )
+    buffer: Optional[AccountStateBuffer] = create_state_buffer(
+        config=config, session=session
+    )
+    if buffer is not None:
+        await buffer.start()
+    sender: SendQueue = create_send_queue(
+        bot=bot, config=config, redis=redis, consume=False
+    )
+    await sender.start()
+    # The summaries are sent by the bot process only.
+    digest: NotificationDigest = NotificationDigest(
+        redis=redis,
+        sender=sender,
+        interval=config.telegram.digest_interval,
+        consume=False,
+    )
+    await digest.start()
+
+    try:
+        async with sched:
+            await configure_tasks(
+                sched=sched,
                 config=config,
-                bot=bot,
+                sender=sender,
                 hamster=hamster,
                 session=session,
-                engine=engine,
-            ),
-            misfire_grace_time=10,
-        )
+                buffer=buffer,
+                digest=digest,
+            )
 
-        # await sched.configure_task(
-        #     TaskIds.NIGHT_SLEEP,
-        #     func=partial(
-        #         handle_night_sleep,
-        #         config=config,
-        #         bot=bot,
-        #         hamster=hamster,
-        #         session=session,
-        #         engine=engine,
-        #     ),
-        #     misfire_grace_time=10,
-        # )
-        #
-        # now = datetime.now()
-        # midnight = datetime.combine(now + timedelta(days=1), time())
-        # seconds_until_midnight = (midnight - now).seconds
-        # random_seconds = seconds_until_midnight + random.randint(1800, 3600)
-        #
-        # await add_schedule(
-        #     sched=sched,
-        #     trigger=IntervalTrigger(
-        #         seconds=random_seconds,
-        #     ),
-        #     schedule_id="night_sleep",
-        #     task_id=TaskIds.NIGHT_SLEEP,
-        #     random_seconds_after_midnight=random_seconds
-        # )
-
-        dp["sched"] = sched
-        await sched.start_in_background()
-        return await dp.start_polling(bot)
+            loggers.dispatcher.info(
+                "Worker %s of %s started",
+                config.scheduler.shard_index,
+                config.scheduler.shard_count,
+            )
+            await sched.run_until_stopped()
+    finally:
+        await digest.stop()
+        await sender.stop()
+        if buffer is not None:
+            await buffer.stop()
+        if pool_stats is not None:
+            pool_stats.cancel()
+        await hamster.close()
+        await redis.aclose()
+        await bot.session.close()
+        await engine.dispose()
@@ -0,0 +1,18 @@
+from .broadcast import Broadcaster, BroadcastProgress
+from .digest import NotificationDigest, UserDigest
+from .middleware import RateLimitMiddleware, use_priority
+from .queue import OutboundMessage, SendQueue
+from .rate_limiter import RateLimiter, TokenBucket
+
+__all__ = [
+    "Broadcaster",
+    "BroadcastProgress",
+    "NotificationDigest",
+    "OutboundMessage",
+    "RateLimiter",
+    "RateLimitMiddleware",
+    "SendQueue",
+    "TokenBucket",
+    "UserDigest",
+    "use_priority",
+]
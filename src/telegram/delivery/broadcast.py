@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Optional
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramAPIError,
+    TelegramBadRequest,
+    TelegramForbiddenError,
+)
+from pydantic import BaseModel
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+
+from src.database import SQLSessionContext
+from src.utils.loggers import service
+from src.enums import SendPriority
+from .middleware import use_priority
+
+BROADCAST_KEY: str = "broadcast:current"
+
+
+class BroadcastProgress(BaseModel):
+    text: str
+    admin_id: int
+    last_user_id: int = 0
+    delivered: int = 0
+    failed: int = 0
+    is_finished: bool = False
+
+
+class Broadcaster:
+    """
+    Sends a text to every user. Users are read in pages by id, the messages
+    of a page go out concurrently in the background lane of the bot's
+    ``RateLimitMiddleware``. The progress is stored in Redis after each
+    page, so an interrupted broadcast resumes from the last finished page.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        redis: Redis,
+        session_pool: async_sessionmaker[AsyncSession],
+        page_size: int = 100,
+        concurrency: int = 10,
+    ) -> None:
+        self.bot = bot
+        self.redis = redis
+        self.session_pool = session_pool
+        self.page_size = page_size
+        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+
+    async def load(self) -> Optional[BroadcastProgress]:
+        data: Optional[bytes] = await self.redis.get(BROADCAST_KEY)
+        if data is None:
+            return None
+        return BroadcastProgress.model_validate_json(data)
+
+    async def save(self, progress: BroadcastProgress) -> None:
+        await self.redis.set(BROADCAST_KEY, progress.model_dump_json())
+
+    async def clear(self) -> None:
+        await self.redis.delete(BROADCAST_KEY)
+
+    async def run(self, progress: BroadcastProgress) -> BroadcastProgress:
+        await self.save(progress)
+        while True:
+            async with SQLSessionContext(session_pool=self.session_pool) as (repo, _):
+                user_ids: list[int] = await repo.users.get_ids(
+                    after_id=progress.last_user_id, limit_value=self.page_size
+                )
+            if not user_ids:
+                break
+
+            results: list[bool] = await asyncio.gather(
+                *[
+                    self.send(chat_id=user_id, text=progress.text)
+                    for user_id in user_ids
+                ]
+            )
+            progress.delivered += sum(results)
+            progress.failed += len(results) - sum(results)
+            progress.last_user_id = user_ids[-1]
+            await self.save(progress)
+
+        progress.is_finished = True
+        await self.save(progress)
+        service.info(
+            "Broadcast finished, delivered: %d, failed: %d",
+            progress.delivered,
+            progress.failed,
+        )
+        return progress
+
+    async def send(self, chat_id: int, text: str) -> bool:
+        async with self._semaphore:
+            try:
+                with use_priority(SendPriority.BACKGROUND):
+                    await self.bot.send_message(chat_id=chat_id, text=text)
+                return True
+            except (TelegramForbiddenError, TelegramBadRequest):
+                return False
+            except TelegramAPIError as error:
+                service.warning("Cannot send message to %s: %s", chat_id, error)
+                return False
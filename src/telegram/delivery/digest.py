@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, TYPE_CHECKING
+
+from pydantic import BaseModel
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+
+from src.utils.custom_jinja import CustomJinja
+from src.utils.loggers import service
+from .queue import SendQueue
+
+if TYPE_CHECKING:
+    from src.database.models import DBAccount
+    from src.hamster.models import HamsterUpgrade
+
+MAX_DIGEST_ERRORS: int = 10
+
+DIGEST_TEMPLATE: str = """
+📊 <b>Сводка за</b> <code>{{ minutes }}</code> <b>мин.</b>
+└ <b>Аккаунтов:</b> <code>{{ digest.account_ids | length }}</code>
+{% if digest.farms %}
+
+⛏ <b>Авто-фарм</b>
+├ <b>Запусков:</b> <code>{{ digest.farms }}</code>
+└ <b>Натапано монет:</b> <code>{{ "{:,}".format(digest.tapped_coins) }}</code>
+{% endif %}
+{% if digest.upgrades_count %}
+
+🎊 <b>Авто-апгрейд</b>
+├ <b>Куплено апгрейдов:</b> <code>{{ digest.upgrades_count }}</code>
+└ <b>Потрачено монет:</b> <code>{{ "{:,}".format(digest.upgrades_price | int) }}</code>
+
+⏫ <b>Лучшие апгрейды</b>
+{% for upgrade in digest.top_upgrades %}
+• <code>{{ upgrade.type }}</code> ({{ upgrade.full_name }}) | <b>Стоимость:</b> <code>{{ "{:,}".format(upgrade.price | int) }}</code> | До окупа: <code>{{ upgrade.profit_per_time | round(2) }}</code> ч.
+{% endfor %}
+{% endif %}
+{% if digest.syncs %}
+
+🔄 <b>Синхронизаций:</b> <code>{{ digest.syncs }}</code>
+{% endif %}
+{% if digest.errors_count %}
+
+❌ <b>Ошибок:</b> <code>{{ digest.errors_count }}</code>
+{% for error in digest.errors %}
+• Ошибка <b>{{ error.stage }}</b>, аккаунт: {{ error.full_name }} (<code>{{ error.account_id }}</code>)
+{% endfor %}
+{% endif %}
+"""
+
+
+class DigestUpgrade(BaseModel):
+    full_name: str
+    type: str
+    price: float
+    profit_per_time: float
+
+
+class DigestError(BaseModel):
+    account_id: int
+    full_name: str
+    stage: str
+
+
+class UserDigest(BaseModel):
+    account_ids: set[int] = set()
+    farms: int = 0
+    tapped_coins: int = 0
+    syncs: int = 0
+    upgrades_count: int = 0
+    upgrades_price: float = 0.0
+    top_upgrades: list[DigestUpgrade] = []
+    errors_count: int = 0
+    errors: list[DigestError] = []
+
+
+class NotificationDigest:
+    """
+    Collects the notifications of the accounts in digest mode and sends one
+    summary per user every ``interval`` seconds through the ``sender``.
+
+    The events are aggregated in Redis, so the accounts of a user may run
+    in any process. Only the consuming process (``consume=True``, the one
+    that sends the queued messages) flushes the summaries.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        sender: SendQueue,
+        interval: int = 3600,
+        top_upgrades: int = 5,
+        consume: bool = True,
+        key_prefix: str = "digest",
+    ) -> None:
+        self.redis = redis
+        self.sender = sender
+        self.interval = interval
+        self.top_upgrades = top_upgrades
+        self.consume = consume
+        self.key_prefix = key_prefix
+        self._loop: Optional[asyncio.Task] = None
+
+    @property
+    def users_key(self) -> str:
+        return f"{self.key_prefix}:users"
+
+    def user_key(self, user_id: int, part: str) -> str:
+        return f"{self.key_prefix}:{user_id}:{part}"
+
+    def is_enabled(self, account: DBAccount) -> bool:
+        return bool(account.config.is_digest_notifications)
+
+    async def add_farm(self, account: DBAccount, tapped_coins: int) -> None:
+        async with self._record(account) as pipeline:
+            counters: str = self.user_key(account.user_id, "counters")
+            pipeline.hincrby(counters, "farms", 1)
+            pipeline.hincrby(counters, "tapped_coins", tapped_coins)
+
+    async def add_sync(self, account: DBAccount) -> None:
+        async with self._record(account) as pipeline:
+            pipeline.hincrby(self.user_key(account.user_id, "counters"), "syncs", 1)
+
+    async def add_upgrades(
+        self, account: DBAccount, upgrades: list[HamsterUpgrade]
+    ) -> None:
+        async with self._record(account) as pipeline:
+            counters: str = self.user_key(account.user_id, "counters")
+            pipeline.hincrby(counters, "upgrades_count", len(upgrades))
+            pipeline.hincrbyfloat(
+                counters,
+                "upgrades_price",
+                float(sum(upgrade.price for upgrade in upgrades)),
+            )
+
+            # Sorted by the payback time, only the best ones are kept.
+            top_key: str = self.user_key(account.user_id, "top_upgrades")
+            pipeline.zadd(
+                top_key,
+                {
+                    DigestUpgrade(
+                        full_name=account.full_name,
+                        type=upgrade.type,
+                        price=upgrade.price,
+                        profit_per_time=upgrade.profit_per_time,
+                    ).model_dump_json(): upgrade.profit_per_time
+                    for upgrade in upgrades
+                },
+            )
+            pipeline.zremrangebyrank(top_key, self.top_upgrades, -1)
+            pipeline.expire(top_key, self.interval * 2)
+
+    async def add_error(self, account: DBAccount, stage: str) -> None:
+        async with self._record(account) as pipeline:
+            pipeline.hincrby(
+                self.user_key(account.user_id, "counters"), "errors_count", 1
+            )
+
+            errors_key: str = self.user_key(account.user_id, "errors")
+            pipeline.rpush(
+                errors_key,
+                DigestError(
+                    account_id=account.id, full_name=account.full_name, stage=stage
+                ).model_dump_json(),
+            )
+            pipeline.ltrim(errors_key, 0, MAX_DIGEST_ERRORS - 1)
+            pipeline.expire(errors_key, self.interval * 2)
+
+    async def flush(self) -> int:
+        sent: int = 0
+        while True:
+            user_ids: list[bytes] = await self.redis.spop(self.users_key, 100)
+            if not user_ids:
+                break
+
+            for user_id in user_ids:
+                digest: Optional[UserDigest] = await self._pop(int(user_id))
+                if digest is None:
+                    continue
+
+                await self.sender.put(
+                    chat_id=int(user_id),
+                    text=await CustomJinja(
+                        DIGEST_TEMPLATE, digest=digest, minutes=self.interval // 60
+                    ).render(),
+                )
+                sent += 1
+
+        if sent:
+            service.info("Notification digests sent: %d", sent)
+        return sent
+
+    async def start(self) -> None:
+        if self.consume:
+            self._loop = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._loop is not None:
+            self._loop.cancel()
+            self._loop = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as error:
+                service.exception("Cannot send notification digests: %s", error)
+
+    @asynccontextmanager
+    async def _record(self, account: DBAccount) -> AsyncIterator[Pipeline]:
+        async with self.redis.pipeline(transaction=True) as pipeline:
+            accounts_key: str = self.user_key(account.user_id, "accounts")
+            counters_key: str = self.user_key(account.user_id, "counters")
+            pipeline.sadd(self.users_key, account.user_id)
+            pipeline.sadd(accounts_key, account.id)
+            yield pipeline
+            # Events of a stopped consumer do not stay forever.
+            pipeline.expire(accounts_key, self.interval * 2)
+            pipeline.expire(counters_key, self.interval * 2)
+            await pipeline.execute()
+
+    async def _pop(self, user_id: int) -> Optional[UserDigest]:
+        keys: list[str] = [
+            self.user_key(user_id, part)
+            for part in ("counters", "accounts", "top_upgrades", "errors")
+        ]
+        # Read and delete in one transaction, events recorded meanwhile go
+        # to the next digest.
+        async with self.redis.pipeline(transaction=True) as pipeline:
+            pipeline.hgetall(keys[0])
+            pipeline.smembers(keys[1])
+            pipeline.zrange(keys[2], 0, -1)
+            pipeline.lrange(keys[3], 0, -1)
+            pipeline.delete(*keys)
+            counters, account_ids, top_upgrades, errors, _ = await pipeline.execute()
+
+        if not counters:
+            return None
+
+        return UserDigest(
+            account_ids={int(account_id) for account_id in account_ids},
+            **{key.decode(): value.decode() for key, value in counters.items()},
+            top_upgrades=[
+                DigestUpgrade.model_validate_json(upgrade) for upgrade in top_upgrades
+            ],
+            errors=[DigestError.model_validate_json(error) for error in errors],
+        )
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, TYPE_CHECKING
+
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import (
+    CopyMessage,
+    EditMessageCaption,
+    EditMessageMedia,
+    EditMessageReplyMarkup,
+    EditMessageText,
+    ForwardMessage,
+    Response,
+    SendDocument,
+    SendMediaGroup,
+    SendMessage,
+    SendPhoto,
+    TelegramMethod,
+)
+from aiogram.methods.base import TelegramType
+
+from src.enums import SendPriority
+from src.utils.loggers import service
+from .rate_limiter import RateLimiter
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+MAX_SEND_ATTEMPTS: int = 5
+
+# Methods that count towards the flood limits of a chat.
+LIMITED_METHODS: tuple[type[TelegramMethod], ...] = (
+    SendMessage,
+    SendPhoto,
+    SendDocument,
+    SendMediaGroup,
+    CopyMessage,
+    ForwardMessage,
+    EditMessageText,
+    EditMessageCaption,
+    EditMessageMedia,
+    EditMessageReplyMarkup,
+)
+
+_send_priority: ContextVar[SendPriority] = ContextVar(
+    "send_priority", default=SendPriority.INTERACTIVE
+)
+
+
+@contextmanager
+def use_priority(priority: SendPriority) -> Iterator[None]:
+    """
+    Send the requests made in this block with ``priority``, requests
+    without it are replies to the user and go first.
+    """
+    token = _send_priority.set(priority)
+    try:
+        yield
+    finally:
+        _send_priority.reset(token)
+
+
+class RateLimitMiddleware(BaseRequestMiddleware):
+    """
+    Paces the messages of the bot with the ``limiter`` and repeats a request
+    after the ``retry_after`` of the Bot API, so every sender of the process
+    shares one budget.
+    """
+
+    def __init__(self, limiter: RateLimiter) -> None:
+        self.limiter = limiter
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_id = getattr(method, "chat_id", None)
+        if not isinstance(method, LIMITED_METHODS) or not isinstance(chat_id, int):
+            return await make_request(bot, method)
+
+        for attempt in range(1, MAX_SEND_ATTEMPTS + 1):
+            await self.limiter.acquire(chat_id=chat_id, priority=_send_priority.get())
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as error:
+                if attempt == MAX_SEND_ATTEMPTS:
+                    raise
+
+                service.warning(
+                    "Flood control, retry after %s s: %s",
+                    error.retry_after,
+                    type(method).__name__,
+                )
+                self.limiter.retry_after(error.retry_after)
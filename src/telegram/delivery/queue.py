@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+from collections import deque
+from typing import Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
+from pydantic import BaseModel
+from redis.asyncio import Redis
+
+from src.enums import SendPriority
+from src.utils.loggers import service
+from .middleware import use_priority
+
+SEND_QUEUE_KEY: str = "send_queue:{priority}"
+
+
+class OutboundMessage(BaseModel):
+    chat_id: int
+    text: str
+    priority: SendPriority = SendPriority.BACKGROUND
+
+
+class SendQueue:
+    """
+    Outbound queue of the notifications. :meth:`put` returns right away,
+    ``workers`` tasks send the messages through the bot, whose
+    ``RateLimitMiddleware`` paces them. The messages of one chat are sent
+    one by one in the order they were put, the chats are served by the
+    priority of their next message.
+
+    With ``redis`` the queue is shared between processes: producers
+    (``consume=False``) push the messages to Redis and the consuming
+    process sends them.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        workers: int = 4,
+        redis: Optional[Redis] = None,
+        consume: bool = True,
+    ) -> None:
+        self.bot = bot
+        self.workers = workers
+        self.redis = redis
+        self.consume = consume
+        self._chats: dict[int, deque[OutboundMessage]] = {}
+        self._ready: asyncio.PriorityQueue[tuple[int, int, int]] = (
+            asyncio.PriorityQueue()
+        )
+        self._counter: itertools.count = itertools.count()
+        self._tasks: list[asyncio.Task] = []
+
+    def __len__(self) -> int:
+        return sum(len(messages) for messages in self._chats.values())
+
+    async def put(
+        self,
+        chat_id: int,
+        text: str,
+        priority: SendPriority = SendPriority.BACKGROUND,
+    ) -> None:
+        message: OutboundMessage = OutboundMessage(
+            chat_id=chat_id, text=text, priority=priority
+        )
+        if self.redis is not None and not self.consume:
+            await self.redis.lpush(
+                SEND_QUEUE_KEY.format(priority=int(priority)),
+                message.model_dump_json(),
+            )
+            return
+
+        self._enqueue(message)
+
+    async def start(self) -> None:
+        if not self.consume:
+            return
+
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        if self.redis is not None:
+            self._tasks.append(asyncio.create_task(self._pull()))
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Give the queued messages ``timeout`` seconds to go out, then stop.
+        """
+        for _ in range(int(timeout * 10)):
+            if not self._chats:
+                break
+            await asyncio.sleep(0.1)
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        if self._chats:
+            service.warning("Send queue stopped, messages dropped: %d", len(self))
+
+    def _enqueue(self, message: OutboundMessage) -> None:
+        messages: Optional[deque[OutboundMessage]] = self._chats.get(message.chat_id)
+        if messages is not None:
+            # The chat is already waiting or being served.
+            messages.append(message)
+            return
+
+        self._chats[message.chat_id] = deque([message])
+        self._schedule(message.chat_id)
+
+    def _schedule(self, chat_id: int) -> None:
+        self._ready.put_nowait(
+            (self._chats[chat_id][0].priority, next(self._counter), chat_id)
+        )
+
+    async def _work(self) -> None:
+        while True:
+            _, _, chat_id = await self._ready.get()
+            messages: deque[OutboundMessage] = self._chats[chat_id]
+            try:
+                await self._send(messages[0])
+            finally:
+                messages.popleft()
+                if messages:
+                    self._schedule(chat_id)
+                else:
+                    del self._chats[chat_id]
+
+    async def _send(self, message: OutboundMessage) -> None:
+        try:
+            with use_priority(message.priority):
+                await self.bot.send_message(chat_id=message.chat_id, text=message.text)
+        except (TelegramForbiddenError, TelegramBadRequest):
+            pass
+        except Exception as error:
+            service.exception("Cannot send message to %s: %s", message.chat_id, error)
+
+    async def _pull(self) -> None:
+        # BRPOP checks the keys in order, so the interactive lane goes first.
+        keys: list[str] = [
+            SEND_QUEUE_KEY.format(priority=int(priority))
+            for priority in sorted(SendPriority)
+        ]
+        while True:
+            try:
+                item: Optional[tuple[bytes, bytes]] = await self.redis.brpop(
+                    keys, timeout=1
+                )
+            except Exception as error:
+                service.exception("Cannot pull messages from Redis: %s", error)
+                await asyncio.sleep(1)
+                continue
+
+            if item is not None:
+                self._enqueue(OutboundMessage.model_validate_json(item[1]))
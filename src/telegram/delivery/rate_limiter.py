@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Optional
+
+from src.enums import SendPriority
+
+# Chats without a send for this long are dropped from the per-chat state.
+CHAT_STATE_TTL: float = 60.0
+
+
+class TokenBucket:
+    """
+    Token bucket with ``rate`` tokens per second and up to ``capacity``
+    tokens for bursts. Waiters are served by ``priority`` first and in
+    arrival order within a priority. :meth:`pause` empties the bucket for a
+    while, e.g. for the ``retry_after`` of the Bot API.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens: float = self.capacity
+        self._updated_at: float = time.monotonic()
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._counter: itertools.count = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    async def acquire(self, priority: int = SendPriority.INTERACTIVE) -> None:
+        waiter: asyncio.Future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), waiter))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+        await waiter
+
+    def pause(self, seconds: float) -> None:
+        self._tokens = 0.0
+        self._updated_at = max(self._updated_at, time.monotonic() + seconds)
+
+    async def _dispatch(self) -> None:
+        while self._waiters:
+            now: float = time.monotonic()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + max(now - self._updated_at, 0.0) * self.rate,
+            )
+            self._updated_at = max(now, self._updated_at)
+            if self._tokens < 1:
+                wait: float = (1 - self._tokens) / self.rate
+                await asyncio.sleep(max(wait, self._updated_at - now))
+                continue
+
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                self._tokens -= 1
+                waiter.set_result(None)
+
+
+class RateLimiter:
+    """
+    Flood limits of the Bot API: ``rate`` messages per second over all chats
+    and ``chat_rate`` messages per second in one chat.
+    """
+
+    def __init__(self, rate: float = 25.0, chat_rate: float = 1.0) -> None:
+        self.bucket: TokenBucket = TokenBucket(rate=rate)
+        self.chat_interval: float = 1 / chat_rate
+        self._chat_next_at: dict[int, float] = {}
+
+    async def acquire(
+        self, chat_id: int, priority: int = SendPriority.INTERACTIVE
+    ) -> None:
+        now: float = time.monotonic()
+        next_at: float = self._chat_next_at.get(chat_id, now)
+        # The slot is reserved before waiting, so concurrent sends to one
+        # chat queue up behind each other.
+        self._chat_next_at[chat_id] = max(now, next_at) + self.chat_interval
+        if next_at > now:
+            await asyncio.sleep(next_at - now)
+
+        await self.bucket.acquire(priority=priority)
+        self._prune(now=now)
+
+    def retry_after(self, seconds: float) -> None:
+        self.bucket.pause(seconds)
+
+    def _prune(self, now: float) -> None:
+        if len(self._chat_next_at) < 10000:
+            return
+
+        self._chat_next_at = {
+            chat_id: next_at
+            for chat_id, next_at in self._chat_next_at.items()
+            if next_at > now - CHAT_STATE_TTL
+        }
@@ -1,10 +1,8 @@
 from typing import Optional
 
 from aiogram_dialog import DialogManager
-from aiohttp_socks import ProxyConnector
 
-from src.app_config import AppConfig
-from src.database import Repository, UoW
+from src.database import Repository
 from src.database.models import (
     DBAccount,
     DBAccountBoost,
@@ -15,7 +13,6 @@ from src.database.models import (
     DBAccountUpgrade,
     DBUser,
 )
-from src.hamster import HamsterKombat
 
 
 async def get_accounts_by_user_id(dialog_manager: DialogManager, **_):
@@ -35,9 +32,6 @@ async def get_accounts_by_user_id(dialog_manager: DialogManager, **_):
 
 async def get_account_data(dialog_manager: DialogManager, **_):
     repo: Repository = dialog_manager.middleware_data["repo"]
-    uow: UoW = dialog_manager.middleware_data["uow"]
-    config: AppConfig = dialog_manager.middleware_data["config"]
-    hamster: HamsterKombat = dialog_manager.middleware_data["hamster"]
     account_id: int = dialog_manager.start_data["account_id"]
     account: Optional[DBAccount] = await repo.accounts.get_one(
         DBAccount.boosts, DBAccount.tasks, account_id=account_id
@@ -58,17 +52,6 @@ async def get_account_data(dialog_manager: DialogManager, **_):
     account_proxy: Optional[DBAccountProxy] = await repo.proxies.get_one(
         config_id=account_config.id
     )
-    if account_proxy and account_proxy.is_active:
-        proxy_connector: ProxyConnector = ProxyConnector.from_url(account_proxy.url)
-        is_proxy_active: bool = await hamster.check_proxy(
-            proxy_connector=proxy_connector,
-            real_ip=config.common.server_ip,
-            response_timeout=account_proxy.timeout,
-        )
-        if account_proxy.is_active != is_proxy_active:
-            account_proxy.set_data(is_active=is_proxy_active)
-            await uow.add(account_proxy, commit=True)
-
     dialog_manager.start_data["task_id"] = account_daily_task.type
 
     return {
@@ -1,26 +1,28 @@
 import asyncio
 import os
 import random
-from datetime import datetime, timedelta
-from typing import Any, Optional
+from contextlib import suppress
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Final, Optional
 from urllib.parse import unquote
 
 from aiogram import Bot
 from aiogram.client.default import DefaultBotProperties
+from aiogram.exceptions import TelegramBadRequest
 from aiogram.types import CallbackQuery, Message
 from aiogram_dialog import DialogManager, ShowMode
 from aiogram_dialog.widgets.input import MessageInput
 from aiogram_dialog.widgets.kbd import Button, ManagedRadio
-from aiohttp_socks import ProxyConnector
 from apscheduler import AsyncScheduler, Schedule
 from apscheduler.triggers.interval import IntervalTrigger
 from babel.dates import format_datetime, get_timezone
 from pyrogram.raw import functions
-from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncEngine, AsyncSession
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 
 from src.app_config import AppConfig
 from src.custom_pyrogram import CustomClient
 from src.database import (
+    AccountStateBuffer,
     Repository,
     SQLSessionContext,
     UoW,
@@ -47,6 +49,7 @@ from src.hamster import (
     HamsterData,
     HamsterIPData,
     HamsterKombat,
+    HamsterSession,
     HamsterTasks,
     HamsterUpgrade,
     HamsterUpgrades,
@@ -54,6 +57,9 @@ from src.hamster import (
     RequestError,
     UserData,
 )
+from src.hamster.api.fingerprint import generate_user_agent
+from src.hamster.enums import ConfigSection
+from src.telegram.delivery import NotificationDigest, SendQueue
 from src.telegram.dialogs import states
 from src.telegram.dialogs.common import texts as common_texts
 from src.utils.custom_jinja import CustomJinja
@@ -77,6 +83,7 @@ async def create_account(
     proxy_data: ProxyData,
     user_id: int,
     hamster: HamsterKombat,
+    session: HamsterSession,
 ) -> Optional[
     tuple[
         DBAccount,
@@ -89,12 +96,24 @@ async def create_account(
         HamsterIPData,
     ]
 ]:
-    hamster_config: HamsterConfig = await hamster.get_config(
-        bearer_token=auth_data.auth_token
-    )
-    hamster_data: Optional[HamsterData] = await hamster.sync(
-        bearer_token=auth_data.auth_token
+    # The reads are independent, the database phase starts once all of them
+    # have arrived.
+    hamster_config, hamster_data, upgrades_data, boosts_data, tasks_data, ip_data = (
+        await hamster.gather(
+            hamster.get_config(session=session, sections=[ConfigSection.DAILY_CIPHER]),
+            hamster.sync(session=session),
+            hamster.get_upgrades(session=session),
+            hamster.get_boosts(session=session),
+            hamster.get_tasks(session=session),
+            hamster.ip(session=session),
+        )
     )
+    hamster_config: HamsterConfig
+    hamster_data: Optional[HamsterData]
+    upgrades_data: Optional[HamsterUpgrades]
+    boosts_data: Optional[HamsterBoosts]
+    tasks_data: Optional[HamsterTasks]
+    ip_data: Optional[HamsterIPData]
 
     daily_cipher: Optional[HamsterDailyCipher] = hamster_config.daily_cipher
 
@@ -106,6 +125,7 @@ async def create_account(
             full_name=user_data.get_full_name(),
             token=auth_data.auth_token,
             username=user_data.username,
+            user_agent=session.user_agent,
             referrals_count=hamster_data.referrals_count,
             level=hamster_data.level,
             total_coins=hamster_data.total_coins,
@@ -120,7 +140,11 @@ async def create_account(
             updated_at=hamster_data.last_sync_update,
         )
     else:
-        account.set_data(user_id=user_id, is_active=True)
+        account.set_data(
+            user_id=user_id,
+            is_active=True,
+            user_agent=account.user_agent or session.user_agent,
+        )
     await uow.add(account, commit=True)
 
     account_config: Optional[DBAccountConfig] = await repo.configs.get_one(
@@ -143,6 +167,7 @@ async def create_account(
                 available_taps=hamster_data.available_taps,
                 max_taps=hamster_data.max_taps,
                 taps_recover_per_sec=hamster_data.taps_recover_per_sec,
+                fill_percent=account_config.autofarm_fill_percent,
             ),
             autoupgrade_interval=calculate_autoupgrade_interval(),
             autosync_interval=calculate_autosync_interval(),
@@ -194,16 +219,13 @@ async def create_account(
     await uow.add(account_cipher, commit=True)
 
     upgrades: list[DBAccountUpgrade] = await sync_upgrades(
-        repo=repo, uow=uow, account=account, hamster=hamster
+        repo=repo, uow=uow, account=account, upgrades=upgrades_data
     )
     boosts: list[DBAccountBoost] = await sync_boosts(
-        repo=repo, uow=uow, account=account, hamster=hamster
+        repo=repo, uow=uow, account=account, boosts=boosts_data
     )
     tasks: list[DBAccountTask] = await sync_tasks(
-        repo=repo, uow=uow, account=account, hamster=hamster
-    )
-    ip_data: Optional[HamsterIPData] = await hamster.ip(
-        bearer_token=auth_data.auth_token
+        repo=repo, uow=uow, account=account, tasks=tasks_data
     )
 
     return (
@@ -255,6 +277,17 @@ async def parse_webapp_data_from_pyrogram_session(
         return webapp_data
 
 
+async def ensure_user_agent(uow: UoW, account: DBAccount) -> str:
+    """
+    Accounts added before the user agent was stored get their own one on the
+    first request, it is kept for all the following requests.
+    """
+    if account.user_agent is None:
+        account.set_data(user_agent=generate_user_agent())
+        await uow.add(account, commit=True)
+    return account.user_agent
+
+
 async def disable_account_proxy(
     sched: AsyncScheduler, uow: UoW, account: DBAccount, proxy: DBAccountProxy
 ) -> None:
@@ -296,7 +329,9 @@ async def buy_profit_upgrades(
     account: DBAccount,
     upgrades: list[DBAccountUpgrade],
     hamster: HamsterKombat,
+    session: HamsterSession,
     sections: list[str],
+    buffer: Optional[AccountStateBuffer] = None,
 ) -> tuple[Optional[list[HamsterUpgrade]], DBAccount]:
     profit_upgrades: list[Optional[HamsterUpgrade]] = calculate_profit_upgrades(
         account=account,
@@ -310,7 +345,7 @@ async def buy_profit_upgrades(
         if upgrade.price <= account.balance_coins:
             try:
                 hamster_data: HamsterData = await hamster.buy_upgrade(
-                    bearer_token=account.token, upgrade_id=upgrade.type
+                    session=session, upgrade_id=upgrade.type
                 )
             except RequestError as error:
                 service.error(error)
@@ -325,10 +360,16 @@ async def buy_profit_upgrades(
                 uow=uow,
                 account=account,
                 hamster_data=hamster_data,
+                commit=False,
+                buffer=buffer,
             )
             success_upgrades.append(upgrade)
         await asyncio.sleep(random.uniform(0.6, 1.2))
 
+    # Written once after the purchases, no connection is held while sleeping.
+    if success_upgrades:
+        await uow.commit()
+
     return success_upgrades, account
 
 
@@ -337,20 +378,24 @@ async def sync_boosts(
     uow: UoW,
     account: DBAccount,
     hamster: Optional[HamsterKombat] = None,
+    session: Optional[HamsterSession] = None,
     boosts: Optional[HamsterBoosts] = None,
+    commit: Optional[bool] = True,
 ) -> list[DBAccountBoost]:
     if not boosts:
-        boosts: Optional[HamsterBoosts] = await hamster.get_boosts(
-            bearer_token=account.token
-        )
+        boosts: Optional[HamsterBoosts] = await hamster.get_boosts(session=session)
+
+    # All rows of the account are loaded at once and matched by type.
+    account_boosts: dict[str, DBAccountBoost] = {
+        account_boost.type: account_boost
+        for account_boost in await repo.boosts.get_all(account_id=account.id)
+    }
 
     synced_boosts: list[DBAccountBoost] = []
     for boost in boosts.boosts:
-        account_boost: DBAccountBoost = await repo.boosts.get_one(
-            boost_type=boost.type, account_id=account.id
-        )
+        account_boost: Optional[DBAccountBoost] = account_boosts.get(boost.type)
 
-        if not account_boost:
+        if account_boost is None:
             account_boost: DBAccountBoost = DBAccountBoost.create(
                 boost_type=boost.type,
                 name=get_boost_name(boost_type=boost.type),
@@ -373,10 +418,9 @@ async def sync_boosts(
                 max_taps=boost.max_taps,
             )
 
-        await uow.add(account_boost)
         synced_boosts.append(account_boost)
 
-    await uow.commit()
+    await uow.add(*synced_boosts, commit=commit)
     service.info(
         "Sync HamsterBoosts from response, DBAccountBoost updated: %d | %s",
         account.id,
@@ -390,20 +434,26 @@ async def sync_upgrades(
     uow: UoW,
     account: DBAccount,
     hamster: Optional[HamsterKombat] = None,
+    session: Optional[HamsterSession] = None,
     upgrades: Optional[HamsterUpgrades] = None,
+    commit: Optional[bool] = True,
 ) -> list[DBAccountUpgrade]:
     if not upgrades:
         upgrades: Optional[HamsterUpgrades] = await hamster.get_upgrades(
-            bearer_token=account.token
+            session=session
         )
 
+    # All rows of the account are loaded at once and matched by type.
+    account_upgrades: dict[str, DBAccountUpgrade] = {
+        account_upgrade.type: account_upgrade
+        for account_upgrade in await repo.upgrades.get_all(account_id=account.id)
+    }
+
     synced_upgrades: list[DBAccountUpgrade] = []
     for upgrade in upgrades.upgrades:
-        account_upgrade: DBAccountUpgrade = await repo.upgrades.get_one(
-            upgrade_type=upgrade.type, account_id=account.id
-        )
+        account_upgrade: Optional[DBAccountUpgrade] = account_upgrades.get(upgrade.type)
 
-        if not account_upgrade:
+        if account_upgrade is None:
             account_upgrade: DBAccountUpgrade = DBAccountUpgrade.create(
                 upgrade_type=upgrade.type,
                 name=upgrade.name,
@@ -416,6 +466,7 @@ async def sync_upgrades(
                 is_expired=upgrade.is_expired,
                 is_active=upgrade.is_active,
             )
+            account_upgrades[upgrade.type] = account_upgrade
         else:
             account_upgrade.set_data(
                 section=upgrade.section,
@@ -427,21 +478,26 @@ async def sync_upgrades(
                 is_active=upgrade.is_active,
             )
 
-            if upgrade.condition:
-                account_condition: Optional[DBAccountUpgrade] = (
-                    await repo.upgrades.get_one(
-                        upgrade_type=upgrade.condition.upgrade_type,
-                        account_id=account.id,
-                    )
-                )
-                account_upgrade.set_data(
-                    condition_id=account_condition.id, is_active=upgrade.is_active
-                )
-
         synced_upgrades.append(account_upgrade)
-        await uow.add(account_upgrade)
 
-    await uow.commit()
+    await uow.add(*synced_upgrades)
+
+    # New rows get their ids on flush, then the conditions are resolved
+    # from the same mapping without extra queries.
+    await uow.flush()
+    for upgrade, account_upgrade in zip(upgrades.upgrades, synced_upgrades):
+        if not upgrade.condition:
+            continue
+
+        account_condition: Optional[DBAccountUpgrade] = account_upgrades.get(
+            upgrade.condition.upgrade_type
+        )
+        if account_condition is not None:
+            account_upgrade.set_data(condition_id=account_condition.id)
+
+    if commit:
+        await uow.commit()
+
     service.info(
         "Sync HamsterUpgrades from response, DBAccountUpgrade updated: %d | %s",
         account.id,
@@ -455,18 +511,22 @@ async def sync_tasks(
     uow: UoW,
     account: DBAccount,
     hamster: Optional[HamsterKombat] = None,
+    session: Optional[HamsterSession] = None,
     tasks: Optional[HamsterTasks] = None,
+    commit: Optional[bool] = True,
 ) -> list[DBAccountTask]:
     if not tasks:
-        tasks: Optional[HamsterTasks] = await hamster.get_tasks(
-            bearer_token=account.token
-        )
+        tasks: Optional[HamsterTasks] = await hamster.get_tasks(session=session)
+
+    # All rows of the account are loaded at once and matched by type.
+    account_tasks: dict[str, DBAccountTask] = {
+        account_task.type: account_task
+        for account_task in await repo.tasks.get_all(account_id=account.id)
+    }
 
     synced_tasks: list[DBAccountTask] = []
     for task in tasks.tasks:
-        account_task: Optional[DBAccountTask] = await repo.tasks.get_one(
-            task_type=task.type, account_id=account.id
-        )
+        account_task: Optional[DBAccountTask] = account_tasks.get(task.type)
 
         if account_task is None:
             account_task: DBAccountTask = DBAccountTask.create(
@@ -474,6 +534,7 @@ async def sync_tasks(
                 account_id=account.id,
                 days=task.days,
                 reward_coins=task.reward_coins,
+                periodicity=task.periodicity,
                 is_completed=task.is_completed,
                 completed_at=task.completed_at,
             )
@@ -481,14 +542,14 @@ async def sync_tasks(
             account_task.set_data(
                 days=task.days,
                 reward_coins=task.reward_coins,
+                periodicity=task.periodicity,
                 is_completed=task.is_completed,
                 completed_at=task.completed_at,
             )
 
         synced_tasks.append(account_task)
-        await uow.add(account_task)
 
-    await uow.commit()
+    await uow.add(*synced_tasks, commit=commit)
     service.info(
         "Sync HamsterTasks from response, DBAccountTask updated: %d | %s",
         account.id,
@@ -501,13 +562,14 @@ async def sync_account(
     uow: UoW,
     account: DBAccount,
     hamster: Optional[HamsterKombat] = None,
+    session: Optional[HamsterSession] = None,
     hamster_data: Optional[HamsterData] = None,
     use_api_sync: Optional[bool] = False,
+    commit: Optional[bool] = True,
+    buffer: Optional[AccountStateBuffer] = None,
 ):
     if use_api_sync:
-        hamster_data: Optional[HamsterData] = await hamster.sync(
-            bearer_token=account.token
-        )
+        hamster_data: Optional[HamsterData] = await hamster.sync(session=session)
 
     account.set_data(
         referrals_count=hamster_data.referrals_count,
@@ -523,7 +585,12 @@ async def sync_account(
         taps_recover_per_sec=hamster_data.taps_recover_per_sec,
         updated_at=hamster_data.last_sync_update,
     )
-    await uow.add(account, account.config, commit=True)
+    if buffer is not None:
+        # The state is written by the next flush of the buffer.
+        buffer.put(account)
+        await uow.add(account.config, commit=commit)
+    else:
+        await uow.add(account, account.config, commit=commit)
 
     service.info(
         "Sync account from response, HamsterData updated: %d | %s",
@@ -538,14 +605,26 @@ async def full_sync(
     uow: UoW,
     account: DBAccount,
     hamster: HamsterKombat,
+    session: HamsterSession,
     hamster_data: Optional[HamsterData] = None,
     use_api_sync: Optional[bool] = False,
 ) -> DBAccount:
 
-    if use_api_sync:
-        hamster_data: Optional[HamsterData] = await hamster.sync(
-            bearer_token=account.token
-        )
+    # All requests go first and run concurrently, the database is only used
+    # for the short write transaction once all responses have arrived.
+    daily_cipher, boosts, upgrades, tasks, *synced = await hamster.gather(
+        hamster.get_daily_cipher(session=session),
+        hamster.get_boosts(session=session),
+        hamster.get_upgrades(session=session),
+        hamster.get_tasks(session=session),
+        *([hamster.sync(session=session)] if use_api_sync else []),
+    )
+    daily_cipher: Optional[HamsterDailyCipher]
+    boosts: Optional[HamsterBoosts]
+    upgrades: Optional[HamsterUpgrades]
+    tasks: Optional[HamsterTasks]
+    if synced:
+        hamster_data: Optional[HamsterData] = synced[0]
 
     if hamster_data is not None:
         account.set_data(
@@ -564,7 +643,12 @@ async def full_sync(
         )
 
     account.config.set_autofarm_interval(
-        autofarm_interval=calculate_autofarm_interval(),
+        autofarm_interval=calculate_autofarm_interval(
+            available_taps=account.available_taps,
+            max_taps=account.max_taps,
+            taps_recover_per_sec=account.taps_recover_per_sec,
+            fill_percent=account.config.autofarm_fill_percent,
+        ),
     )
     account.config.set_autoupgrade_interval(
         autoupgrade_interval=calculate_autoupgrade_interval(),
@@ -576,9 +660,14 @@ async def full_sync(
     cipher: Optional[DBAccountCipher] = await repo.ciphers.get_one(
         account_id=account.id
     )
-
-    hamster_config: HamsterConfig = await hamster.get_config(bearer_token=account.token)
-    daily_cipher: Optional[HamsterDailyCipher] = hamster_config.daily_cipher
+    if daily_cipher.is_claimed is None:
+        # The claim state of the account could not be fetched, a stored
+        # claim stays valid until the cipher changes on the next game day.
+        daily_cipher.is_claimed = bool(
+            cipher is not None
+            and cipher.cipher == daily_cipher.cipher
+            and cipher.is_claimed
+        )
 
     if cipher is None:
         cipher: DBAccountCipher = DBAccountCipher.create(
@@ -596,112 +685,13 @@ async def full_sync(
             remain_seconds=daily_cipher.remain_seconds,
         )
 
-    await uow.add(account, cipher, commit=True)
+    await uow.add(account, account.config, cipher)
 
-    boosts: Optional[HamsterBoosts] = await hamster.get_boosts(
-        bearer_token=account.token
-    )
-    upgrades: Optional[HamsterUpgrades] = await hamster.get_upgrades(
-        bearer_token=account.token
+    await sync_boosts(repo=repo, uow=uow, account=account, boosts=boosts, commit=False)
+    await sync_upgrades(
+        repo=repo, uow=uow, account=account, upgrades=upgrades, commit=False
     )
-    tasks: Optional[HamsterTasks] = await hamster.get_tasks(bearer_token=account.token)
-
-    for boost in boosts.boosts:
-        account_boost: Optional[DBAccountBoost] = await repo.boosts.get_one(
-            boost_type=boost.type, account_id=account.id
-        )
-
-        if account_boost is None:
-            account_boost: DBAccountBoost = DBAccountBoost.create(
-                boost_type=boost.type,
-                name=get_boost_name(boost_type=boost.type),
-                desc=get_boost_description(boost_type=boost.type),
-                account_id=account.id,
-                level=boost.level,
-                price=boost.price,
-                cooldown_seconds=boost.cooldown_seconds,
-                earn_per_tap=boost.earn_per_tap,
-                earn_per_tap_delta=boost.earn_per_tap_delta,
-                max_taps=boost.max_taps,
-                max_taps_delta=boost.max_taps_delta,
-            )
-        else:
-            account_boost.set_data(
-                level=boost.level,
-                price=boost.price,
-                cooldown_seconds=boost.cooldown_seconds,
-                earn_per_tap=boost.earn_per_tap,
-                max_taps=boost.max_taps,
-            )
-
-        await uow.add(account_boost)
-
-    for upgrade in upgrades.upgrades:
-        account_upgrade: Optional[DBAccountUpgrade] = await repo.upgrades.get_one(
-            upgrade_type=upgrade.type, account_id=account.id
-        )
-
-        if account_upgrade is None:
-            account_upgrade: DBAccountUpgrade = DBAccountUpgrade.create(
-                upgrade_type=upgrade.type,
-                name=upgrade.name,
-                section=upgrade.section,
-                account_id=account.id,
-                level=upgrade.level,
-                price=upgrade.price,
-                profit_per_hour=upgrade.profit_per_hour,
-                cooldown_seconds=upgrade.cooldown_seconds,
-                is_expired=upgrade.is_expired,
-                is_active=upgrade.is_active,
-            )
-        else:
-            if upgrade.condition:
-                account_condition: Optional[DBAccountUpgrade] = (
-                    await repo.upgrades.get_one(
-                        upgrade_type=upgrade.condition.upgrade_type,
-                        account_id=account.id,
-                    )
-                )
-                if account_condition:
-                    account_upgrade.set_data(condition_id=account_condition.id)
-
-            account_upgrade.set_data(
-                section=upgrade.section,
-                level=upgrade.level,
-                price=upgrade.price,
-                profit_per_hour=upgrade.profit_per_hour,
-                cooldown_seconds=upgrade.cooldown_seconds,
-                is_expired=upgrade.is_expired,
-                is_active=upgrade.is_active,
-            )
-
-        await uow.add(account_upgrade)
-
-    for task in tasks.tasks:
-        account_task: Optional[DBAccountTask] = await repo.tasks.get_one(
-            task_type=task.type, account_id=account.id
-        )
-
-        if account_task is None:
-            account_task: DBAccountTask = DBAccountTask.create(
-                task_type=task.type,
-                account_id=account.id,
-                days=task.days,
-                reward_coins=task.reward_coins,
-                periodicity=task.periodicity,
-                is_completed=task.is_completed,
-                completed_at=task.completed_at,
-            )
-        else:
-            account_task.set_data(
-                days=task.days,
-                reward_coins=task.reward_coins,
-                periodicity=task.periodicity,
-                is_completed=task.is_completed,
-                completedAt=task.completed_at,
-            )
-
-        await uow.add(account_task)
+    await sync_tasks(repo=repo, uow=uow, account=account, tasks=tasks, commit=False)
 
     await uow.commit()
     service.info(
@@ -736,9 +726,9 @@ async def on_switch_to_auth_type(_: Message, __: MessageInput, manager: DialogMa
     if proxy_data is None:
         return await manager.event.answer(common_texts.INCORRECT_PROXY_DATA_TEXT)
 
-    proxy_connector: ProxyConnector = ProxyConnector.from_url(proxy_data.url)
     if not await hamster.check_proxy(
-        proxy_connector=proxy_connector,
+        proxy_url=proxy_data.url,
+        use_cache=False,
         real_ip=config.common.server_ip,
     ):
         return await manager.event.answer(common_texts.BAD_PROXY_DATA_TEXT)
@@ -767,8 +757,7 @@ async def on_auth_with_webapp_or_bearer_data(
 
     proxy_url: str = manager.dialog_data["proxy_url"]
     proxy_data: Optional[ProxyData] = parse_proxy_from_string(proxy_url)
-    proxy_connector: ProxyConnector = ProxyConnector.from_url(proxy_url)
-    hamster.set_proxy(proxy_connector=proxy_connector)
+    session: HamsterSession = hamster.create_session(proxy_url=proxy_url)
 
     user_id: int = manager.event.from_user.id
     data: str = manager.event.text
@@ -780,12 +769,15 @@ async def on_auth_with_webapp_or_bearer_data(
                     common_texts.INCORRECT_WEBAPP_DATA_TEXT
                 )
 
-            auth_data: Optional[AuthData] = await hamster.auth_webapp(webapp_data=data)
+            auth_data: Optional[AuthData] = await hamster.auth_webapp(
+                session=session, webapp_data=data
+            )
         else:
             auth_data: AuthData = AuthData(authToken=data)
 
+        session: HamsterSession = session.with_token(auth_data.auth_token)
         user_data: Optional[UserData] = await hamster.auth_telegram(
-            bearer_token=auth_data.auth_token,
+            session=session,
         )
     except RequestError as error:
         service.error(error)
@@ -817,6 +809,7 @@ async def on_auth_with_webapp_or_bearer_data(
                     proxy_data=proxy_data,
                     user_id=user_id,
                     hamster=hamster,
+                    session=session,
                 )
             except RequestError as error:
                 service.error(error)
@@ -863,6 +856,7 @@ async def on_auth_with_webapp_or_bearer_data(
                 proxy_data=proxy_data,
                 user_id=user_id,
                 hamster=hamster,
+                session=session,
             )
         except RequestError as error:
             service.error(error)
@@ -907,8 +901,7 @@ async def on_auth_with_session(_: Message, __: MessageInput, manager: DialogMana
 
     proxy_url: str = manager.dialog_data["proxy_url"]
     proxy_data: Optional[ProxyData] = parse_proxy_from_string(proxy_url)
-    proxy_connector: ProxyConnector = ProxyConnector.from_url(proxy_url)
-    hamster.set_proxy(proxy_connector=proxy_connector)
+    session: HamsterSession = hamster.create_session(proxy_url=proxy_url)
 
     await manager.event.bot.download(file_id, destination=workdir + file_name)
 
@@ -927,10 +920,11 @@ async def on_auth_with_session(_: Message, __: MessageInput, manager: DialogMana
 
     try:
         auth_data: Optional[AuthData] = await hamster.auth_webapp(
-            webapp_data=webapp_data
+            session=session, webapp_data=webapp_data
         )
+        session: HamsterSession = session.with_token(auth_data.auth_token)
         user_data: Optional[UserData] = await hamster.auth_telegram(
-            bearer_token=auth_data.auth_token,
+            session=session,
         )
     except RequestError as error:
         service.error(error)
@@ -962,6 +956,7 @@ async def on_auth_with_session(_: Message, __: MessageInput, manager: DialogMana
                     proxy_data=proxy_data,
                     user_id=user_id,
                     hamster=hamster,
+                    session=session,
                 )
             except RequestError as error:
                 service.error(error)
@@ -1008,6 +1003,7 @@ async def on_auth_with_session(_: Message, __: MessageInput, manager: DialogMana
                 proxy_data=proxy_data,
                 user_id=user_id,
                 hamster=hamster,
+                session=session,
             )
             account: DBAccount = data[0]
             config: DBAccountConfig = data[1]
@@ -1064,9 +1060,8 @@ async def on_button_tap(_: CallbackQuery, __: Button, manager: DialogManager):
     account_proxy: Optional[DBAccountProxy] = await repo.proxies.get_one(
         config_id=account.config.id
     )
-    proxy_connector: ProxyConnector = ProxyConnector.from_url(account_proxy.url)
     if not await hamster.check_proxy(
-        proxy_connector=proxy_connector,
+        proxy_url=account_proxy.url,
         real_ip=config.common.server_ip,
         response_timeout=account_proxy.timeout,
     ):
@@ -1082,12 +1077,16 @@ async def on_button_tap(_: CallbackQuery, __: Button, manager: DialogManager):
             show_alert=True,
         )
 
-    hamster.set_proxy(proxy_connector=proxy_connector)
+    session: HamsterSession = hamster.create_session(
+        proxy_url=account_proxy.url,
+        bearer_token=account.token,
+        user_agent=await ensure_user_agent(uow=uow, account=account),
+    )
 
     energy: int = account.available_taps // account.earn_per_tap
     try:
         hamster_data: Optional[HamsterData] = await hamster.tap(
-            bearer_token=account.token,
+            session=session,
             available_taps=account.available_taps,
             count=(energy // 1.5) + random.randint(11, 34),
         )
@@ -1118,9 +1117,8 @@ async def on_claim_daily_cipher(_: CallbackQuery, __: Button, manager: DialogMan
         config_id=account.config.id
     )
 
-    proxy_connector: ProxyConnector = ProxyConnector.from_url(account_proxy.url)
     if not await hamster.check_proxy(
-        proxy_connector=proxy_connector,
+        proxy_url=account_proxy.url,
         real_ip=config.common.server_ip,
         response_timeout=account_proxy.timeout,
     ):
@@ -1136,23 +1134,38 @@ async def on_claim_daily_cipher(_: CallbackQuery, __: Button, manager: DialogMan
             show_alert=True,
         )
 
-    hamster.set_proxy(proxy_connector=proxy_connector)
+    session: HamsterSession = hamster.create_session(
+        proxy_url=account_proxy.url,
+        bearer_token=account.token,
+        user_agent=await ensure_user_agent(uow=uow, account=account),
+    )
 
     cipher: Optional[DBAccountCipher] = await repo.ciphers.get_one(
         account_id=account.id
     )
     if cipher is None:
         hamster_config: HamsterConfig = await hamster.get_config(
-            bearer_token=account.token
+            session=session, sections=[ConfigSection.DAILY_CIPHER]
         )
         daily_cipher: HamsterDailyCipher = hamster_config.daily_cipher
         cipher: DBAccountCipher = DBAccountCipher.create(
             account_id=account.id,
             bonus_coins=daily_cipher.bonus_coins,
-            cipher=daily_cipher,
+            cipher=daily_cipher.cipher,
             is_claimed=daily_cipher.is_claimed,
             remain_seconds=daily_cipher.remain_seconds,
         )
+    else:
+        daily_cipher: Optional[HamsterDailyCipher] = await hamster.get_daily_cipher(
+            session=session
+        )
+        if daily_cipher is not None and daily_cipher.cipher != cipher.cipher:
+            cipher.set_data(
+                bonus_coins=daily_cipher.bonus_coins,
+                cipher=daily_cipher.cipher,
+                is_claimed=False,
+                remain_seconds=daily_cipher.remain_seconds,
+            )
 
     if cipher.is_claimed:
         return await manager.event.answer(
@@ -1161,7 +1174,7 @@ async def on_claim_daily_cipher(_: CallbackQuery, __: Button, manager: DialogMan
 
     try:
         hamster_data, daily_cipher = await hamster.claim_daily_cipher(
-            bearer_token=account.token, cipher=cipher.cipher
+            session=session, cipher=cipher.cipher
         )
         cipher.set_data(is_claimed=daily_cipher.is_claimed)
         await uow.add(cipher, commit=True)
@@ -1190,9 +1203,8 @@ async def on_claim_daily_combo(_: CallbackQuery, __: Button, manager: DialogMana
     account_proxy: Optional[DBAccountProxy] = await repo.proxies.get_one(
         config_id=account.config.id
     )
-    proxy_connector: ProxyConnector = ProxyConnector.from_url(account_proxy.url)
     if not await hamster.check_proxy(
-        proxy_connector=proxy_connector,
+        proxy_url=account_proxy.url,
         real_ip=config.common.server_ip,
         response_timeout=account_proxy.timeout,
     ):
@@ -1208,23 +1220,22 @@ async def on_claim_daily_combo(_: CallbackQuery, __: Button, manager: DialogMana
             show_alert=True,
         )
 
-    hamster.set_proxy(proxy_connector=proxy_connector)
-    upgrades: Optional[HamsterUpgrades] = await hamster.get_upgrades(
-        bearer_token=account.token
+    session: HamsterSession = hamster.create_session(
+        proxy_url=account_proxy.url,
+        bearer_token=account.token,
+        user_agent=await ensure_user_agent(uow=uow, account=account),
     )
+    upgrades: Optional[HamsterUpgrades] = await hamster.get_upgrades(session=session)
 
     if upgrades.daily_combo.is_claimed:
         return await manager.event.answer(common_texts.ALREADY_CLAIMED_DAILY_COMBO_TEXT)
 
-    actual_combos: Optional[HamsterDailyCombo] = await hamster.get_actual_combos()
-    if (
-        not set(actual_combos.upgrade_ids).issubset(
-            set(upgrades.daily_combo.upgrade_ids)
-        )
-        and actual_combos.actual_date
-        and int(actual_combos.actual_date.split("-")[0]) == datetime.now().date().day
-        and int(actual_combos.actual_date.split("-")[1]) == datetime.now().date().month
-    ):
+    actual_combos: Optional[HamsterDailyCombo] = await hamster.get_actual_combos(
+        session=session, remain_seconds=upgrades.daily_combo.remain_seconds
+    )
+    if not set(actual_combos.upgrade_ids).issubset(
+        set(upgrades.daily_combo.upgrade_ids)
+    ) and actual_combos.is_for_date(datetime.now().date()):
         missing_upgrade_ids = set(actual_combos.upgrade_ids) - set(
             upgrades.daily_combo.upgrade_ids
         )
@@ -1244,7 +1255,7 @@ async def on_claim_daily_combo(_: CallbackQuery, __: Button, manager: DialogMana
 
                 await asyncio.sleep(random.uniform(0.6, 1.2))
                 hamster_data: Optional[HamsterData] = await hamster.buy_upgrade(
-                    bearer_token=account.token, upgrade_id=missin_upgrade
+                    session=session, upgrade_id=missin_upgrade
                 )
                 last_hamster_data = hamster_data
                 await asyncio.sleep(random.uniform(0.6, 1.2))
@@ -1262,7 +1273,7 @@ async def on_claim_daily_combo(_: CallbackQuery, __: Button, manager: DialogMana
 
     try:
         hamster_data: Optional[HamsterData] = await hamster.claim_daily_combo(
-            bearer_token=account.token
+            session=session
         )
 
         await sync_account(uow=uow, account=account, hamster_data=hamster_data)
@@ -1293,9 +1304,8 @@ async def on_claim_daily_task(_: CallbackQuery, __: Button, manager: DialogManag
         config_id=account.config.id
     )
 
-    proxy_connector: ProxyConnector = ProxyConnector.from_url(account_proxy.url)
     if not await hamster.check_proxy(
-        proxy_connector=proxy_connector,
+        proxy_url=account_proxy.url,
         real_ip=config.common.server_ip,
         response_timeout=account_proxy.timeout,
     ):
@@ -1311,16 +1321,20 @@ async def on_claim_daily_task(_: CallbackQuery, __: Button, manager: DialogManag
             show_alert=True,
         )
 
-    hamster.set_proxy(proxy_connector=proxy_connector)
+    session: HamsterSession = hamster.create_session(
+        proxy_url=account_proxy.url,
+        bearer_token=account.token,
+        user_agent=await ensure_user_agent(uow=uow, account=account),
+    )
 
     try:
-        task, hamster_data = await hamster.check_task(
-            bearer_token=account.token, task_id=task_id
-        )
+        task, hamster_data = await hamster.check_task(session=session, task_id=task_id)
         service.info(
             "Task %s checked: %d | %s", task.type, account.id, account.full_name
         )
-        await sync_tasks(repo=repo, uow=uow, account=account, hamster=hamster)
+        await sync_tasks(
+            repo=repo, uow=uow, account=account, hamster=hamster, session=session
+        )
         await sync_account(uow=uow, account=account, hamster_data=hamster_data)
     except RequestError as error:
         service.error(error)
@@ -1345,9 +1359,8 @@ async def on_button_sync_data(_: CallbackQuery, __: Button, manager: DialogManag
         config_id=account.config.id
     )
 
-    proxy_connector: ProxyConnector = ProxyConnector.from_url(account_proxy.url)
     if not await hamster.check_proxy(
-        proxy_connector=proxy_connector,
+        proxy_url=account_proxy.url,
         real_ip=config.common.server_ip,
         response_timeout=account_proxy.timeout,
     ):
@@ -1363,11 +1376,20 @@ async def on_button_sync_data(_: CallbackQuery, __: Button, manager: DialogManag
             show_alert=True,
         )
 
-    hamster.set_proxy(proxy_connector=proxy_connector)
+    session: HamsterSession = hamster.create_session(
+        proxy_url=account_proxy.url,
+        bearer_token=account.token,
+        user_agent=await ensure_user_agent(uow=uow, account=account),
+    )
 
     try:
         await full_sync(
-            repo=repo, uow=uow, account=account, hamster=hamster, use_api_sync=True
+            repo=repo,
+            uow=uow,
+            account=account,
+            hamster=hamster,
+            session=session,
+            use_api_sync=True,
         )
     except RequestError as error:
         service.error(error)
@@ -1404,246 +1426,434 @@ async def on_button_sync_data(_: CallbackQuery, __: Button, manager: DialogManag
     return await manager.event.answer(common_texts.SUCCESS_TEXT)
 
 
+_sync_all_users: set[int] = set()
+_sync_all_tasks: set[asyncio.Task] = set()
+
+
 async def on_button_sync_data_all(_: CallbackQuery, __: Button, manager: DialogManager):
     repo: Repository = manager.middleware_data["repo"]
     sched: AsyncScheduler = manager.middleware_data["sched"]
-    uow: UoW = manager.middleware_data["uow"]
+    config: AppConfig = manager.middleware_data["config"]
     hamster: HamsterKombat = manager.middleware_data["hamster"]
+    session: async_sessionmaker[AsyncSession] = manager.middleware_data["db_session"]
+    bot: Bot = manager.middleware_data["bot"]
 
     user_id: int = manager.event.from_user.id
+    if user_id in _sync_all_users:
+        return await manager.event.answer("Синхронизация уже запущена, ожидайте...")
+
+    accounts: list[Optional[DBAccount]] = await repo.accounts.get_all(user_id=user_id)
+    if not accounts:
+        return await manager.event.answer(common_texts.ACCOUNT_NOT_FOUND_TEXT)
 
-    accounts: list[Optional[DBAccount]] = await repo.accounts.get_all(
-        DBAccount.config, user_id=user_id
+    message: Message = await bot.send_message(
+        chat_id=user_id,
+        text=f"🔄 <b>Синхронизация аккаунтов:</b> <code>0/{len(accounts)}</code>",
     )
-    for account in accounts:
-        try:
-            account: DBAccount = await full_sync(
-                repo=repo, uow=uow, account=account, hamster=hamster
-            )
-        except RequestError as error:
-            service.error(error)
-            return await manager.event.answer(common_texts.CANNOT_SYNC_ACCOUNT_TEXT)
 
-        await process_schedule(
+    _sync_all_users.add(user_id)
+    task: asyncio.Task = asyncio.create_task(
+        on_button_sync_data_all_thread(
+            bot=bot,
+            hamster=hamster,
+            config=config,
+            session=session,
             sched=sched,
-            schedule_id=generate_schedule_id(
-                task_id=TaskIds.AUTOFARM,
-                account_id=account.id,
-                user_id=account.user_id,
-            ),
-            task_id=TaskIds.AUTOFARM,
-            action=SchedulerActions.RESCHEDULE,
-            trigger=IntervalTrigger(seconds=account.config.autofarm_interval),
-            account_id=account.id,
+            message=message,
+            account_ids=[account.id for account in accounts],
         )
-
-    return await manager.event.answer(common_texts.SUCCESS_TEXT)
+    )
+    _sync_all_tasks.add(task)
+    task.add_done_callback(_sync_all_tasks.discard)
+    task.add_done_callback(lambda _: _sync_all_users.discard(user_id))
+    return await manager.event.answer("Ожидайте...")
 
 
-async def handle_autosync(
-    account_id: int,
+async def on_button_sync_data_all_thread(
     bot: Bot,
     hamster: HamsterKombat,
     config: AppConfig,
     session: async_sessionmaker[AsyncSession],
-    engine: AsyncEngine,
-    **_,
+    sched: AsyncScheduler,
+    message: Message,
+    account_ids: list[int],
 ) -> None:
-    async with SQLSessionContext(session_pool=session) as (repo, uow):
-        account: Optional[DBAccount] = await repo.accounts.get_one(
-            DBAccount.config, account_id=account_id
-        )
+    """
+    Sync the accounts concurrently: at most ``sync_all_concurrency`` in
+    total and ``sync_all_proxy_concurrency`` per proxy. A failed account
+    does not stop the others, the progress is shown in ``message``.
+    """
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(
+        config.hamster.sync_all_concurrency
+    )
+    proxy_semaphores: dict[str, asyncio.Semaphore] = {}
+    failed: list[str] = []
+    done: int = 0
 
-        account_proxy: Optional[DBAccountProxy] = await repo.proxies.get_one(
-            config_id=account.config.id
-        )
-        async with config.postgres.build_scheduler(engine=engine) as sched:
-            if account_proxy is None:
-                await disable_account_proxy(
-                    sched=sched, uow=uow, account=account, proxy=account_proxy
-                )
-                return await bot.send_message(
-                    chat_id=account.user_id,
-                    text=f"""
-❌ Не удалось <b>подключиться к прокси</b> для хомяка {account.full_name}.
+    async def sync_one(account_id: int) -> None:
+        nonlocal done
 
-Мы выключили <b>автоматические функции для него</b>, проверьте прокси и повторите попытку.
-                        """,
-                )
+        full_name: str = str(account_id)
+        try:
+            async with semaphore:
+                async with SQLSessionContext(session_pool=session) as (repo, uow):
+                    account: Optional[DBAccount] = await repo.accounts.get_one(
+                        DBAccount.config, account_id=account_id
+                    )
+                    if account is None:
+                        return failed.append(f"{full_name} — аккаунт не найден")
 
-            proxy_connector: ProxyConnector = ProxyConnector.from_url(account_proxy.url)
-            if not await hamster.check_proxy(
-                proxy_connector=proxy_connector,
-                real_ip=config.common.server_ip,
-                response_timeout=account_proxy.timeout,
-            ):
-                await disable_account_proxy(
-                    sched=sched, uow=uow, account=account, proxy=account_proxy
-                )
-                return await bot.send_message(
-                    chat_id=account.user_id,
-                    text=f"""
-❌ Не удалось <b>подключиться к прокси</b> для хомяка {account.full_name}.
+                    full_name: str = account.full_name
+                    await ensure_user_agent(uow=uow, account=account)
+                    account_proxy: Optional[DBAccountProxy] = (
+                        await repo.proxies.get_one(config_id=account.config.id)
+                    )
 
-Мы выключили <b>автоматические функции для него</b>, проверьте прокси и повторите попытку.
-                        """,
-                )
+            if account_proxy is None or not account_proxy.is_active:
+                return failed.append(f"{full_name} — прокси неактивен")
 
-            hamster.set_proxy(proxy_connector=proxy_connector)
+            hamster_session: HamsterSession = hamster.create_session(
+                proxy_url=account_proxy.url,
+                bearer_token=account.token,
+                user_agent=account.user_agent,
+            )
+            proxy_semaphore: asyncio.Semaphore = proxy_semaphores.setdefault(
+                account_proxy.url,
+                asyncio.Semaphore(config.hamster.sync_all_proxy_concurrency),
+            )
+            # The proxy slot is taken first, so accounts waiting for a busy
+            # proxy do not hold the global slots.
+            async with proxy_semaphore, semaphore:
+                async with SQLSessionContext(session_pool=session) as (repo, uow):
+                    account: DBAccount = await full_sync(
+                        repo=repo,
+                        uow=uow,
+                        account=account,
+                        hamster=hamster,
+                        session=hamster_session,
+                        use_api_sync=True,
+                    )
 
-            try:
-                account: DBAccount = await full_sync(
-                    repo=repo,
-                    uow=uow,
-                    account=account,
-                    hamster=hamster,
-                    use_api_sync=True,
-                )
-            except RequestError as error:
-                await bot.send_message(
-                    chat_id=account.user_id,
-                    text=f"❌ Ошибка <b>авто-синхронизации</b>, аккаунт: {account.full_name} (<code>{account.id}</code>).",
-                )
-                return service.error(error)
+            await process_schedule(
+                sched=sched,
+                schedule_id=generate_schedule_id(
+                    task_id=TaskIds.AUTOFARM,
+                    account_id=account.id,
+                    user_id=account.user_id,
+                ),
+                task_id=TaskIds.AUTOFARM,
+                action=SchedulerActions.RESCHEDULE,
+                trigger=IntervalTrigger(seconds=account.config.autofarm_interval),
+                account_id=account.id,
+            )
+        except Exception as error:
+            service.exception("Cannot sync account %s: %s", account_id, error)
+            failed.append(full_name)
+        finally:
+            done += 1
+
+    async def report_progress() -> None:
+        reported: int = 0
+        while True:
+            await asyncio.sleep(config.hamster.sync_all_progress_interval)
+            if done == reported:
+                continue
 
-            if account.config.is_autosync_notifications:
-                schedule: Optional[Schedule] = await process_schedule(
-                    sched=sched,
-                    schedule_id=generate_schedule_id(
-                        task_id=TaskIds.AUTOSYNC,
-                        account_id=account_id,
-                        user_id=account.user_id,
-                    ),
-                    task_id=TaskIds.AUTOSYNC,
-                    action=SchedulerActions.GET,
+            reported: int = done
+            with suppress(TelegramBadRequest):
+                await message.edit_text(
+                    f"🔄 <b>Синхронизация аккаунтов:</b> <code>{done}/{len(account_ids)}</code>"
                 )
 
-                await bot.send_message(
-                    chat_id=account.user_id,
-                    text=await CustomJinja(
-                        """
-👍 Аккаунт {{ account.full_name }} (<code>{{ account.id }}</code>) <b>успешно синхронизирован</b> с базой данных.
+    progress: asyncio.Task = asyncio.create_task(report_progress())
+    try:
+        await asyncio.gather(*[sync_one(account_id) for account_id in account_ids])
+    finally:
+        progress.cancel()
 
-🔄 <b>Авто-синхронизация:</b>
-{% if next_run_autosync %}
-└ <b>Следующий запуск:</b> <code>{{ next_run_autosync }}</code>
-{% else %}
-└ ⚠️ Не удалось получить <b>дату и время следующего запуска</b>.
+    with suppress(TelegramBadRequest):
+        await message.edit_text(
+            await CustomJinja(
+                """
+👍 <b>Синхронизация аккаунтов завершена:</b> <code>{{ synced }}/{{ total }}</code>
+{% if failed %}
+
+❌ <b>Не удалось синхронизировать:</b>
+{% for full_name in failed %}
+• {{ full_name }}
+{% endfor %}
 {% endif %}
-                        """,
-                        next_run_autosync=(
-                            format_datetime(
-                                schedule.next_fire_time,
-                                "short",
-                                tzinfo=get_timezone("Europe/Moscow"),
-                                locale="ru_RU",
-                            )
-                            if schedule
-                            else None
-                        ),
-                        account=account,
-                    ).render(),
-                )
+                """,
+                synced=len(account_ids) - len(failed),
+                total=len(account_ids),
+                failed=failed,
+            ).render()
+        )
 
 
-async def handle_autoupgrade(
-    account_id: int,
-    bot: Bot,
+async def autosync_stage(
+    sender: SendQueue,
     hamster: HamsterKombat,
-    config: AppConfig,
-    session: async_sessionmaker[AsyncSession],
-    engine: AsyncEngine,
-    **_,
-) -> None:
-    async with SQLSessionContext(session_pool=session) as (repo, uow):
-        account: Optional[DBAccount] = await repo.accounts.get_one(
-            DBAccount.upgrades, DBAccount.config, account_id=account_id
+    repo: Repository,
+    uow: UoW,
+    sched: AsyncScheduler,
+    account: DBAccount,
+    session: HamsterSession,
+    buffer: Optional[AccountStateBuffer] = None,
+    digest: Optional[NotificationDigest] = None,
+) -> Optional[DBAccount]:
+    try:
+        account: DBAccount = await full_sync(
+            repo=repo,
+            uow=uow,
+            account=account,
+            hamster=hamster,
+            session=session,
+            use_api_sync=True,
         )
+    except RequestError as error:
+        if digest is not None and digest.is_enabled(account):
+            await digest.add_error(account, stage="авто-синхронизации")
+        else:
+            await sender.put(
+                chat_id=account.user_id,
+                text=f"❌ Ошибка <b>авто-синхронизации</b>, аккаунт: {account.full_name} (<code>{account.id}</code>).",
+            )
+        service.error(error)
+        return None
 
-        account_proxy: Optional[DBAccountProxy] = await repo.proxies.get_one(
-            config_id=account.config.id
-        )
+    # Pushes the sync back when it was pulled forward by another stage.
+    schedule: Optional[Schedule] = await process_schedule(
+        sched=sched,
+        action=SchedulerActions.RESCHEDULE,
+        schedule_id=generate_schedule_id(
+            task_id=TaskIds.AUTOSYNC,
+            account_id=account.id,
+            user_id=account.user_id,
+        ),
+        task_id=TaskIds.AUTOSYNC,
+        trigger=IntervalTrigger(seconds=account.config.autosync_interval),
+        account_id=account.id,
+    )
 
-        async with config.postgres.build_scheduler(engine=engine) as sched:
-            if account_proxy is None:
-                await disable_account_proxy(
-                    sched=sched, uow=uow, account=account, proxy=account_proxy
-                )
-                return await bot.send_message(
-                    chat_id=account.user_id,
-                    text=f"""
-❌ Не удалось <b>подключиться к прокси</b> для хомяка {account.full_name}.
+    if not account.config.is_autosync_notifications:
+        return account
 
-Мы выключили <b>автоматические функции для него</b>, проверьте прокси и повторите попытку.
-                        """,
-                )
+    if digest is not None and digest.is_enabled(account):
+        await digest.add_sync(account)
+    else:
+        await sender.put(
+            chat_id=account.user_id,
+            text=await CustomJinja(
+                """
+👍 Аккаунт {{ account.full_name }} (<code>{{ account.id }}</code>) <b>успешно синхронизирован</b> с базой данных.
 
-            proxy_connector: ProxyConnector = ProxyConnector.from_url(account_proxy.url)
-            if not await hamster.check_proxy(
-                proxy_connector=proxy_connector,
-                real_ip=config.common.server_ip,
-                response_timeout=account_proxy.timeout,
-            ):
-                await disable_account_proxy(
-                    sched=sched, uow=uow, account=account, proxy=account_proxy
-                )
-                return await bot.send_message(
-                    chat_id=account.user_id,
-                    text=f"""
-❌ Не удалось <b>подключиться к прокси</b> для хомяка {account.full_name}.
+🔄 <b>Авто-синхронизация:</b>
+{% if next_run_autosync %}
+└ <b>Следующий запуск:</b> <code>{{ next_run_autosync }}</code>
+{% else %}
+└ ⚠️ Не удалось получить <b>дату и время следующего запуска</b>.
+{% endif %}
+                    """,
+                next_run_autosync=(
+                    format_datetime(
+                        schedule.next_fire_time,
+                        "short",
+                        tzinfo=get_timezone("Europe/Moscow"),
+                        locale="ru_RU",
+                    )
+                    if schedule
+                    else None
+                ),
+                account=account,
+            ).render(),
+        )
 
-Мы выключили <b>автоматические функции для него</b>, проверьте прокси и повторите попытку.
-                        """,
-                )
+    return account
 
-            hamster.set_proxy(proxy_connector=proxy_connector)
 
-            success_upgrades, account = await buy_profit_upgrades(
-                uow=uow,
-                account=account,
-                upgrades=account.upgrades,
-                hamster=hamster,
-                sections=["Markets", "PR&Team", "Legal", "Specials"],
-            )
-            success_upgrades: Optional[list[HamsterUpgrade]]
-            account: DBAccount
+async def autofarm_stage(
+    sender: SendQueue,
+    hamster: HamsterKombat,
+    repo: Repository,
+    uow: UoW,
+    sched: AsyncScheduler,
+    account: DBAccount,
+    session: HamsterSession,
+    buffer: Optional[AccountStateBuffer] = None,
+    digest: Optional[NotificationDigest] = None,
+) -> Optional[DBAccount]:
+    energy: int = account.available_taps // account.earn_per_tap
+    random_uniform: int = random.uniform(1.6, 1.8)
+    random_count: int = int(energy // random_uniform)
+    earn_per_tap_before: int = account.earn_per_tap
+    available_taps_before: int = account.available_taps
+
+    try:
+        hamster_data: HamsterData = await hamster.tap(
+            session=session,
+            available_taps=account.available_taps,
+            count=random_count,
+        )
 
-            trigger: IntervalTrigger = IntervalTrigger(
-                seconds=calculate_autoupgrade_interval()
+        account: DBAccount = await sync_account(
+            uow=uow,
+            account=account,
+            hamster_data=hamster_data,
+            commit=False,
+            buffer=buffer,
+        )
+    except RequestError as error:
+        if digest is not None and digest.is_enabled(account):
+            await digest.add_error(account, stage="авто-фарма")
+        else:
+            await sender.put(
+                chat_id=account.user_id,
+                text=f"❌ Ошибка <b>авто-фарма</b>, аккаунт: {account.full_name} (<code>{account.id}</code>).",
             )
+        service.error(error)
+        return None
 
-            schedule: Schedule = await add_schedule(
-                sched=sched,
-                trigger=trigger,
-                schedule_id=generate_schedule_id(
-                    task_id=TaskIds.AUTOUPGRADE,
-                    account_id=account_id,
-                    user_id=account.user_id,
+    # Wait until the energy spent by this run is recovered.
+    account.config.set_autofarm_interval(
+        autofarm_interval=calculate_autofarm_interval(
+            available_taps=account.available_taps,
+            max_taps=account.max_taps,
+            taps_recover_per_sec=account.taps_recover_per_sec,
+            fill_percent=account.config.autofarm_fill_percent,
+        )
+    )
+    await uow.add(account.config, commit=True)
+
+    schedule: Schedule = await process_schedule(
+        sched=sched,
+        action=SchedulerActions.RESCHEDULE,
+        schedule_id=generate_schedule_id(
+            task_id=TaskIds.AUTOFARM,
+            account_id=account.id,
+            user_id=account.user_id,
+        ),
+        task_id=TaskIds.AUTOFARM,
+        trigger=IntervalTrigger(seconds=account.config.autofarm_interval),
+        account_id=account.id,
+    )
+
+    if not account.config.is_autofarm_notifications:
+        return account
+
+    if digest is not None and digest.is_enabled(account):
+        await digest.add_farm(account, tapped_coins=random_count * earn_per_tap_before)
+    else:
+        await sender.put(
+            chat_id=account.user_id,
+            text=await CustomJinja(
+                """
+🐹 <b>Хомячок</b> {{ account.full_name }} (<code>{{ account.id }}</code>)
+├ <b>Баланс:</b> <code>{{ "{:,}".format(account.balance_coins | int) }}</code>
+├ <b>Монет за один тап:</b> <code>{{ account.earn_per_tap }}</code>
+└ <b>Монет за всё время:</b> <code>{{ "{:,}".format(account.total_coins | int) }}</code>
+
+👆 <b>Тапы</b>
+├ <b>Доступно:</b> <code>{{ "{:,}".format(account.available_taps | int) }}</code>
+└ <b>Максимум:</b> <code>{{ "{:,}".format(account.max_taps | int) }}</code>
+
+⛏ <b>Автофарм</b>
+├ <b>Тапнуто:</b> <code>{{ random_count }}</code> * <code>{{ earn_per_tap_before }}</code> (<code>{{ random_count * earn_per_tap_before }}</code>)
+{% if next_run_autofarm %}
+└ <b>Следующий запуск:</b> <code>{{ next_run_autofarm }}</code>
+{% else %}
+└ ⚠️ Не удалось получить <b>дату и время следующего запуска</b>.
+{% endif %}
+                    """,
+                earn_per_tap_before=earn_per_tap_before,
+                available_taps_before=available_taps_before,
+                random_uniform=random_uniform,
+                random_count=random_count,
+                energy=energy,
+                next_run_autofarm=(
+                    format_datetime(
+                        schedule.next_fire_time,
+                        "short",
+                        tzinfo=get_timezone("Europe/Moscow"),
+                        locale="ru_RU",
+                    )
+                    if schedule
+                    else None
                 ),
-                task_id=TaskIds.AUTOUPGRADE,
-                account_id=account.id,
-            )
+                account=account,
+            ).render(),
+        )
 
-        if success_upgrades:
-            try:
-                await sync_upgrades(
-                    repo=repo,
-                    uow=uow,
-                    account=account,
-                    hamster=hamster,
-                )
-            except RequestError as error:
-                await bot.send_message(
+    return account
+
+
+async def autoupgrade_stage(
+    sender: SendQueue,
+    hamster: HamsterKombat,
+    repo: Repository,
+    uow: UoW,
+    sched: AsyncScheduler,
+    account: DBAccount,
+    session: HamsterSession,
+    buffer: Optional[AccountStateBuffer] = None,
+    digest: Optional[NotificationDigest] = None,
+) -> Optional[DBAccount]:
+    success_upgrades, account = await buy_profit_upgrades(
+        uow=uow,
+        account=account,
+        upgrades=account.upgrades,
+        hamster=hamster,
+        session=session,
+        sections=["Markets", "PR&Team", "Legal", "Specials"],
+        buffer=buffer,
+    )
+    success_upgrades: Optional[list[HamsterUpgrade]]
+    account: DBAccount
+
+    trigger: IntervalTrigger = IntervalTrigger(seconds=calculate_autoupgrade_interval())
+
+    schedule: Schedule = await add_schedule(
+        sched=sched,
+        trigger=trigger,
+        schedule_id=generate_schedule_id(
+            task_id=TaskIds.AUTOUPGRADE,
+            account_id=account.id,
+            user_id=account.user_id,
+        ),
+        task_id=TaskIds.AUTOUPGRADE,
+        account_id=account.id,
+    )
+
+    if success_upgrades:
+        try:
+            await sync_upgrades(
+                repo=repo,
+                uow=uow,
+                account=account,
+                hamster=hamster,
+                session=session,
+            )
+        except RequestError as error:
+            if digest is not None and digest.is_enabled(account):
+                await digest.add_error(account, stage="авто-апгрейда")
+            else:
+                await sender.put(
                     chat_id=account.user_id,
                     text=f"❌ Ошибка <b>авто-апгрейда</b>, аккаунт: {account.full_name} (<code>{account.id}</code>).",
                 )
-                return service.error(error)
+            service.error(error)
+            return None
 
-            if account.config.is_autoupgrade_notifications:
-                await bot.send_message(
-                    chat_id=account.user_id,
-                    text=await CustomJinja(
-                        """
+        if not account.config.is_autoupgrade_notifications:
+            return account
+
+        if digest is not None and digest.is_enabled(account):
+            await digest.add_upgrades(account, upgrades=success_upgrades)
+        else:
+            await sender.put(
+                chat_id=account.user_id,
+                text=await CustomJinja(
+                    """
 🐹 <b>Хомячок</b> {{ account.full_name }} (<code>{{ account.id }}</code>)
 └ <b>Баланс:</b> <code>{{ "{:,}".format(account.balance_coins | int) }}</code>
 
@@ -1663,47 +1873,121 @@ async def handle_autoupgrade(
 {% else %}
 └ ⚠️ Не удалось получить <b>дату и время следующего запуска</b>.
 {% endif %}
-                        """,
-                        upgrades=success_upgrades,
-                        next_run_autoupgrade=(
-                            format_datetime(
-                                schedule.next_fire_time,
-                                "short",
-                                tzinfo=get_timezone("Europe/Moscow"),
-                                locale="ru_RU",
-                            )
-                            if schedule
-                            else None
-                        ),
-                        account=account,
-                    ).render(),
-                )
+                    """,
+                    upgrades=success_upgrades,
+                    next_run_autoupgrade=(
+                        format_datetime(
+                            schedule.next_fire_time,
+                            "short",
+                            tzinfo=get_timezone("Europe/Moscow"),
+                            locale="ru_RU",
+                        )
+                        if schedule
+                        else None
+                    ),
+                    account=account,
+                ).render(),
+            )
+
+    return account
+
+
+AccountStage = Callable[..., Awaitable[Optional[DBAccount]]]
+
+# Ordered stages of the per-account pipeline: the task of the stage, the
+# config flag that enables it and the stage itself. The sync goes first,
+# it also refreshes the daily cipher and the tasks of the account.
+ACCOUNT_PIPELINE: Final[tuple[tuple[TaskIds, str, AccountStage], ...]] = (
+    (TaskIds.AUTOSYNC, "is_autosync", autosync_stage),
+    (TaskIds.AUTOFARM, "is_autofarm", autofarm_stage),
+    (TaskIds.AUTOUPGRADE, "is_autoupgrade", autoupgrade_stage),
+)
+
+_pipeline_accounts: set[int] = set()
+
+
+async def get_due_stages(
+    sched: AsyncScheduler,
+    account: DBAccount,
+    task_id: TaskIds,
+    window: int,
+) -> list[AccountStage]:
+    """
+    Stages to run together with the one that was fired: every enabled
+    stage whose schedule is due within ``window`` seconds.
+    """
+    due_at: datetime = datetime.now(timezone.utc) + timedelta(seconds=window)
+
+    stages: list[AccountStage] = []
+    for stage_task_id, flag, stage in ACCOUNT_PIPELINE:
+        if stage_task_id == task_id:
+            stages.append(stage)
+            continue
+
+        if not getattr(account.config, flag):
+            continue
+
+        schedule: Optional[Schedule] = await process_schedule(
+            sched=sched,
+            action=SchedulerActions.GET,
+            schedule_id=generate_schedule_id(
+                task_id=stage_task_id,
+                account_id=account.id,
+                user_id=account.user_id,
+            ),
+            task_id=stage_task_id,
+        )
+        if (
+            schedule is not None
+            and not schedule.paused
+            and schedule.next_fire_time is not None
+            and schedule.next_fire_time <= due_at
+        ):
+            stages.append(stage)
+
+    return stages
 
 
-async def handle_autofarm(
+async def handle_account_pipeline(
     account_id: int,
-    bot: Bot,
+    task_id: TaskIds,
+    sender: SendQueue,
     hamster: HamsterKombat,
     config: AppConfig,
     session: async_sessionmaker[AsyncSession],
-    engine: AsyncEngine,
+    sched: AsyncScheduler,
+    buffer: Optional[AccountStateBuffer] = None,
+    digest: Optional[NotificationDigest] = None,
     **_,
 ) -> None:
-    async with SQLSessionContext(session_pool=session) as (repo, uow):
-        account: Optional[DBAccount] = await repo.accounts.get_one(
-            DBAccount.upgrades, DBAccount.config, account_id=account_id
-        )
+    """
+    Entry point of the automatic functions of an account.
 
-        account_proxy: Optional[DBAccountProxy] = await repo.proxies.get_one(
-            config_id=account.config.id
+    The fired stage and the other stages that are due soon run in order
+    with one database session, one proxy check and one Hamster session.
+    """
+    if account_id in _pipeline_accounts:
+        return service.info(
+            "Skip %s for account %s: pipeline is already running",
+            task_id,
+            account_id,
         )
 
-        async with config.postgres.build_scheduler(engine=engine) as sched:
+    _pipeline_accounts.add(account_id)
+    try:
+        async with SQLSessionContext(session_pool=session) as (repo, uow):
+            account: Optional[DBAccount] = await repo.accounts.get_one(
+                DBAccount.upgrades, DBAccount.config, account_id=account_id
+            )
+
+            account_proxy: Optional[DBAccountProxy] = await repo.proxies.get_one(
+                config_id=account.config.id
+            )
             if account_proxy is None:
                 await disable_account_proxy(
                     sched=sched, uow=uow, account=account, proxy=account_proxy
                 )
-                return await bot.send_message(
+                return await sender.put(
                     chat_id=account.user_id,
                     text=f"""
 ❌ Не удалось <b>подключиться к прокси</b> для хомяка {account.full_name}.
@@ -1712,182 +1996,228 @@ async def handle_autofarm(
                         """,
                 )
 
-            proxy_connector: ProxyConnector = ProxyConnector.from_url(account_proxy.url)
-            if not await hamster.check_proxy(
-                proxy_connector=proxy_connector,
-                real_ip=config.common.server_ip,
-                response_timeout=account_proxy.timeout,
-            ):
-                await disable_account_proxy(
-                    sched=sched, uow=uow, account=account, proxy=account_proxy
-                )
-                return await bot.send_message(
-                    chat_id=account.user_id,
-                    text=f"""
-❌ Не удалось <b>подключиться к прокси</b> для хомяка {account.full_name}.
-
-Мы выключили <b>автоматические функции для него</b>, проверьте прокси и повторите попытку.
-                        """,
+            if not account_proxy.is_active:
+                # The proxy monitor has already disabled the automatic
+                # functions and notified the user.
+                return service.info(
+                    "Skip %s for account %s: proxy is inactive", task_id, account.id
                 )
 
-            hamster.set_proxy(proxy_connector=proxy_connector)
+            # The snapshot is loaded, the read transaction is ended so that
+            # the connection goes back to the pool during the requests.
+            await uow.commit()
 
-            energy: int = account.available_taps // account.earn_per_tap
-            random_uniform: int = random.uniform(1.6, 1.8)
-            random_count: int = int(energy // random_uniform)
-            earn_per_tap_before: int = account.earn_per_tap
-            available_taps_before: int = account.available_taps
-
-            try:
-                hamster_data: HamsterData = await hamster.tap(
-                    bearer_token=account.token,
-                    available_taps=account.available_taps,
-                    count=random_count,
-                )
+            hamster_session: HamsterSession = hamster.create_session(
+                proxy_url=account_proxy.url,
+                bearer_token=account.token,
+                user_agent=await ensure_user_agent(uow=uow, account=account),
+            )
 
-                account: DBAccount = await sync_account(
+            stages: list[AccountStage] = await get_due_stages(
+                sched=sched,
+                account=account,
+                task_id=task_id,
+                window=config.scheduler.pipeline_window,
+            )
+            for stage in stages:
+                result: Optional[DBAccount] = await stage(
+                    sender=sender,
+                    hamster=hamster,
+                    repo=repo,
                     uow=uow,
+                    sched=sched,
                     account=account,
-                    hamster_data=hamster_data,
+                    session=hamster_session,
+                    buffer=buffer,
+                    digest=digest,
                 )
-            except RequestError as error:
-                await bot.send_message(
-                    chat_id=account.user_id,
-                    text=f"❌ Ошибка <b>авто-фарма</b>, аккаунт: {account.full_name} (<code>{account.id}</code>).",
-                )
-                return service.error(error)
+                if result is None:
+                    # The stage has reported its error already. The account
+                    # stays enabled, so the next stages, the fired one among
+                    # them, still run with the last known state.
+                    service.warning(
+                        "Stage %s of account %s failed", stage.__name__, account.id
+                    )
+                    continue
 
-            schedule: Schedule = await process_schedule(
-                sched=sched,
-                action=SchedulerActions.RESCHEDULE,
-                schedule_id=generate_schedule_id(
-                    task_id=TaskIds.AUTOFARM,
-                    account_id=account_id,
-                    user_id=account.user_id,
-                ),
-                task_id=TaskIds.AUTOFARM,
-                trigger=IntervalTrigger(seconds=account.config.autofarm_interval),
-                account_id=account.id,
+                account: DBAccount = result
+    finally:
+        _pipeline_accounts.discard(account_id)
+
+
+async def measure_account_proxy(
+    hamster: HamsterKombat,
+    proxy: DBAccountProxy,
+    real_ip: str,
+    semaphore: asyncio.Semaphore,
+) -> Optional[float]:
+    async with semaphore:
+        try:
+            return await hamster.measure_proxy(
+                proxy_url=proxy.url,
+                real_ip=real_ip,
+                response_timeout=proxy.timeout or 10,
             )
+        except Exception as error:
+            # One broken proxy must not abort the sweep of the others.
+            service.warning("Cannot check proxy %s: %s", proxy.id, error)
+            return None
 
-            if account.config.is_autofarm_notifications:
-                await bot.send_message(
-                    chat_id=account.user_id,
-                    text=await CustomJinja(
-                        """
-🐹 <b>Хомячок</b> {{ account.full_name }} (<code>{{ account.id }}</code>)
-├ <b>Баланс:</b> <code>{{ "{:,}".format(account.balance_coins | int) }}</code>
-├ <b>Монет за один тап:</b> <code>{{ account.earn_per_tap }}</code>
-└ <b>Монет за всё время:</b> <code>{{ "{:,}".format(account.total_coins | int) }}</code>
 
-👆 <b>Тапы</b>
-├ <b>Доступно:</b> <code>{{ "{:,}".format(account.available_taps | int) }}</code>
-└ <b>Максимум:</b> <code>{{ "{:,}".format(account.max_taps | int) }}</code>
+async def handle_proxy_monitor(
+    sender: SendQueue,
+    hamster: HamsterKombat,
+    config: AppConfig,
+    session: async_sessionmaker[AsyncSession],
+    sched: AsyncScheduler,
+    **_,
+) -> None:
+    """
+    Sweep all active proxies and store their health, so the scheduled jobs
+    read ``DBAccountProxy.is_active`` instead of probing the proxy on every
+    run. A proxy disables the automatic functions only after it failed
+    ``proxy_monitor_failures`` sweeps in a row, a lost judge race is not
+    enough.
+    """
+    async with SQLSessionContext(session_pool=session) as (repo, _):
+        proxies: list[DBAccountProxy] = await repo.proxies.get_all(
+            DBAccountProxy.config, is_active=True
+        )
+
+    # The database session is not held while the judges are probed.
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(
+        config.hamster.proxy_monitor_concurrency
+    )
+    latencies: list[Optional[float]] = await asyncio.gather(
+        *[
+            measure_account_proxy(
+                hamster=hamster,
+                proxy=proxy,
+                real_ip=config.common.server_ip,
+                semaphore=semaphore,
+            )
+            for proxy in proxies
+        ]
+    )
 
-⛏ <b>Автофарм</b>
-├ <b>Тапнуто:</b> <code>{{ random_count }}</code> * <code>{{ earn_per_tap_before }}</code> (<code>{{ random_count * earn_per_tap_before }}</code>)
-{% if next_run_autofarm %}
-└ <b>Следующий запуск:</b> <code>{{ next_run_autofarm }}</code>
-{% else %}
-└ ⚠️ Не удалось получить <b>дату и время следующего запуска</b>.
-{% endif %}
-                        """,
-                        earn_per_tap_before=earn_per_tap_before,
-                        available_taps_before=available_taps_before,
-                        random_uniform=random_uniform,
-                        random_count=random_count,
-                        energy=energy,
-                        next_run_autofarm=(
-                            format_datetime(
-                                schedule.next_fire_time,
-                                "short",
-                                tzinfo=get_timezone("Europe/Moscow"),
-                                locale="ru_RU",
-                            )
-                            if schedule
-                            else None
-                        ),
-                        account=account,
-                    ).render(),
-                )
+    checked_at: datetime = datetime.now()
+    failed_proxies: list[DBAccountProxy] = []
+    async with SQLSessionContext(session_pool=session) as (repo, uow):
+        for proxy, latency in zip(proxies, latencies):
+            failures: int = 0 if latency is not None else (proxy.failures or 0) + 1
+            proxy.set_data(checked_at=checked_at, latency=latency, failures=failures)
+            await uow.add(proxy)
+
+            if failures >= config.hamster.proxy_monitor_failures:
+                failed_proxies.append(proxy)
+
+        await uow.commit()
+
+        for proxy in failed_proxies:
+            account: Optional[DBAccount] = await repo.accounts.get_one(
+                DBAccount.config, account_id=proxy.config.account_id
+            )
+            if account is None:
+                continue
+
+            await disable_account_proxy(
+                sched=sched, uow=uow, account=account, proxy=proxy
+            )
+            await sender.put(
+                chat_id=account.user_id,
+                text=f"""
+❌ Не удалось <b>подключиться к прокси</b> для хомяка {account.full_name}.
+
+Мы выключили <b>автоматические функции для него</b>, проверьте прокси и повторите попытку.
+                    """,
+            )
+
+    service.info(
+        "Proxy monitor: %s checked, %s disabled", len(proxies), len(failed_proxies)
+    )
 
 
 async def handle_night_sleep(
     random_seconds_after_midnight: int,
-    bot: Bot,
+    sender: SendQueue,
     config: AppConfig,
     session: async_sessionmaker[AsyncSession],
-    engine: AsyncEngine,
+    sched: AsyncScheduler,
     **_,
 ) -> None:
     async with SQLSessionContext(session_pool=session) as (repo, uow):
         users: list[DBUser] = await repo.users.get_all(DBUser.accounts)
         for user in users:
-            async with config.postgres.build_scheduler(engine=engine) as sched:
-                random_seconds: int = random_seconds_after_midnight + random.randint(
-                    10800, 18000
-                )
-                for account in user.accounts:
-                    account: DBAccount
-
-                    await add_schedule(
-                        sched=sched,
-                        trigger=IntervalTrigger(
-                            seconds=random_seconds + calculate_autofarm_interval()
-                        ),
-                        schedule_id=generate_schedule_id(
-                            task_id=TaskIds.AUTOFARM,
-                            account_id=account.id,
-                            user_id=user.id,
-                        ),
+            random_seconds: int = random_seconds_after_midnight + random.randint(
+                10800, 18000
+            )
+            for account in user.accounts:
+                account: DBAccount
+
+                await add_schedule(
+                    sched=sched,
+                    trigger=IntervalTrigger(
+                        # The energy is full again after the night.
+                        seconds=random_seconds
+                        + calculate_autofarm_interval(
+                            available_taps=account.max_taps,
+                            max_taps=account.max_taps,
+                            taps_recover_per_sec=account.taps_recover_per_sec,
+                        )
+                    ),
+                    schedule_id=generate_schedule_id(
                         task_id=TaskIds.AUTOFARM,
                         account_id=account.id,
-                    )
+                        user_id=user.id,
+                    ),
+                    task_id=TaskIds.AUTOFARM,
+                    account_id=account.id,
+                )
 
-                    await add_schedule(
-                        sched=sched,
-                        trigger=IntervalTrigger(
-                            seconds=random_seconds + calculate_autoupgrade_interval()
-                        ),
-                        schedule_id=generate_schedule_id(
-                            task_id=TaskIds.AUTOUPGRADE,
-                            account_id=account.id,
-                            user_id=user.id,
-                        ),
+                await add_schedule(
+                    sched=sched,
+                    trigger=IntervalTrigger(
+                        seconds=random_seconds + calculate_autoupgrade_interval()
+                    ),
+                    schedule_id=generate_schedule_id(
                         task_id=TaskIds.AUTOUPGRADE,
                         account_id=account.id,
-                    )
+                        user_id=user.id,
+                    ),
+                    task_id=TaskIds.AUTOUPGRADE,
+                    account_id=account.id,
+                )
 
-                    await add_schedule(
-                        sched=sched,
-                        trigger=IntervalTrigger(
-                            seconds=random_seconds + calculate_autosync_interval()
-                        ),
-                        schedule_id=generate_schedule_id(
-                            task_id=TaskIds.AUTOSYNC,
-                            account_id=account.id,
-                            user_id=user.id,
-                        ),
+                await add_schedule(
+                    sched=sched,
+                    trigger=IntervalTrigger(
+                        seconds=random_seconds + calculate_autosync_interval()
+                    ),
+                    schedule_id=generate_schedule_id(
                         task_id=TaskIds.AUTOSYNC,
                         account_id=account.id,
-                    )
+                        user_id=user.id,
+                    ),
+                    task_id=TaskIds.AUTOSYNC,
+                    account_id=account.id,
+                )
 
-                await bot.send_message(
-                    chat_id=user.id,
-                    text=await CustomJinja(
-                        """
+            await sender.put(
+                chat_id=user.id,
+                text=await CustomJinja(
+                    """
 🌙 <b>Автоматические функции</b> всех ваших аккаунтов поставлены на сон до <b>{{ next_run_time }}</b>
 
 Это <b>необходимая процедура</b> для имитации реального человека.
                         """,
-                        next_run_time=format_datetime(
-                            datetime.now() + timedelta(seconds=random_seconds),
-                            "short",
-                            tzinfo=get_timezone("Europe/Moscow"),
-                            locale="ru_RU",
-                        ),
-                    ).render(),
-                )
+                    next_run_time=format_datetime(
+                        datetime.now() + timedelta(seconds=random_seconds),
+                        "short",
+                        tzinfo=get_timezone("Europe/Moscow"),
+                        locale="ru_RU",
+                    ),
+                ).render(),
+            )
 
 
 async def on_start_account_boosts_dialog(
@@ -1909,9 +2239,8 @@ async def on_start_account_boosts_dialog(
         config_id=account.config.id
     )
 
-    proxy_connector: ProxyConnector = ProxyConnector.from_url(account_proxy.url)
     if not await hamster.check_proxy(
-        proxy_connector=proxy_connector,
+        proxy_url=account_proxy.url,
         real_ip=config.common.server_ip,
         response_timeout=account_proxy.timeout,
     ):
@@ -1927,7 +2256,11 @@ async def on_start_account_boosts_dialog(
             show_alert=True,
         )
 
-    hamster.set_proxy(proxy_connector=proxy_connector)
+    session: HamsterSession = hamster.create_session(
+        proxy_url=account_proxy.url,
+        bearer_token=account.token,
+        user_agent=await ensure_user_agent(uow=uow, account=account),
+    )
 
     try:
         await sync_boosts(
@@ -1935,6 +2268,7 @@ async def on_start_account_boosts_dialog(
             uow=uow,
             account=account,
             hamster=hamster,
+            session=session,
         )
     except RequestError as error:
         service.error(error)
@@ -1977,9 +2311,8 @@ async def on_button_buy_boost(_: CallbackQuery, __: Button, manager: DialogManag
         config_id=account.config.id
     )
 
-    proxy_connector: ProxyConnector = ProxyConnector.from_url(account_proxy.url)
     if not await hamster.check_proxy(
-        proxy_connector=proxy_connector,
+        proxy_url=account_proxy.url,
         real_ip=config.common.server_ip,
         response_timeout=account_proxy.timeout,
     ):
@@ -1995,11 +2328,15 @@ async def on_button_buy_boost(_: CallbackQuery, __: Button, manager: DialogManag
             show_alert=True,
         )
 
-    hamster.set_proxy(proxy_connector=proxy_connector)
+    session: HamsterSession = hamster.create_session(
+        proxy_url=account_proxy.url,
+        bearer_token=account.token,
+        user_agent=await ensure_user_agent(uow=uow, account=account),
+    )
 
     try:
         hamster_data: HamsterData = await hamster.buy_boost(
-            bearer_token=account.token, boost_id=boost_type
+            session=session, boost_id=boost_type
         )
         service.info("Bought boost: %d | %s", account.id, account.full_name)
         await sync_account(
@@ -2012,6 +2349,7 @@ async def on_button_buy_boost(_: CallbackQuery, __: Button, manager: DialogManag
             uow=uow,
             account=account,
             hamster=hamster,
+            session=session,
         )
     except RequestError as error:
         service.error(error)
@@ -2037,9 +2375,8 @@ async def on_start_account_upgrades_dialog(
         config_id=account.config.id
     )
 
-    proxy_connector: ProxyConnector = ProxyConnector.from_url(account_proxy.url)
     if not await hamster.check_proxy(
-        proxy_connector=proxy_connector,
+        proxy_url=account_proxy.url,
         real_ip=config.common.server_ip,
         response_timeout=account_proxy.timeout,
     ):
@@ -2055,7 +2392,11 @@ async def on_start_account_upgrades_dialog(
             show_alert=True,
         )
 
-    hamster.set_proxy(proxy_connector=proxy_connector)
+    session: HamsterSession = hamster.create_session(
+        proxy_url=account_proxy.url,
+        bearer_token=account.token,
+        user_agent=await ensure_user_agent(uow=uow, account=account),
+    )
 
     try:
         await sync_upgrades(
@@ -2063,6 +2404,7 @@ async def on_start_account_upgrades_dialog(
             uow=uow,
             account=account,
             hamster=hamster,
+            session=session,
         )
     except RequestError as error:
         service.error(error)
@@ -2135,9 +2477,8 @@ async def on_button_buy_upgrade(_: CallbackQuery, __: Button, manager: DialogMan
         config_id=account.config.id
     )
 
-    proxy_connector: ProxyConnector = ProxyConnector.from_url(account_proxy.url)
     if not await hamster.check_proxy(
-        proxy_connector=proxy_connector,
+        proxy_url=account_proxy.url,
         real_ip=config.common.server_ip,
         response_timeout=account_proxy.timeout,
     ):
@@ -2153,11 +2494,15 @@ async def on_button_buy_upgrade(_: CallbackQuery, __: Button, manager: DialogMan
             show_alert=True,
         )
 
-    hamster.set_proxy(proxy_connector=proxy_connector)
+    session: HamsterSession = hamster.create_session(
+        proxy_url=account_proxy.url,
+        bearer_token=account.token,
+        user_agent=await ensure_user_agent(uow=uow, account=account),
+    )
 
     try:
         hamster_data: Optional[HamsterData] = await hamster.buy_upgrade(
-            bearer_token=account.token, upgrade_id=upgrade_type
+            session=session, upgrade_id=upgrade_type
         )
         service.info("Bought upgrade: %d | %s", account.id, account.full_name)
         await sync_account(
@@ -2170,6 +2515,7 @@ async def on_button_buy_upgrade(_: CallbackQuery, __: Button, manager: DialogMan
             uow=uow,
             account=account,
             hamster=hamster,
+            session=session,
         )
     except RequestError as error:
         service.error(error)
@@ -2220,9 +2566,8 @@ async def on_button_buy_profit_upgrades_thread(
         account_proxy: Optional[DBAccountProxy] = await repo.proxies.get_one(
             config_id=account.config.id
         )
-        proxy_connector: ProxyConnector = ProxyConnector.from_url(account_proxy.url)
         if not await hamster.check_proxy(
-            proxy_connector=proxy_connector,
+            proxy_url=account_proxy.url,
             real_ip=config.common.server_ip,
             response_timeout=account_proxy.timeout,
         ):
@@ -2238,13 +2583,18 @@ async def on_button_buy_profit_upgrades_thread(
                     """,
             )
 
-        hamster.set_proxy(proxy_connector=proxy_connector)
+        session: HamsterSession = hamster.create_session(
+            proxy_url=account_proxy.url,
+            bearer_token=account.token,
+            user_agent=await ensure_user_agent(uow=uow, account=account),
+        )
 
         success_upgrades, account = await buy_profit_upgrades(
             uow=uow,
             account=account,
             upgrades=account.upgrades,
             hamster=hamster,
+            session=session,
             sections=["Markets", "PR&Team", "Legal", "Specials"],
         )
         success_upgrades: Optional[list[HamsterUpgrade]]
@@ -2256,6 +2606,7 @@ async def on_button_buy_profit_upgrades_thread(
                 uow=uow,
                 account=account,
                 hamster=hamster,
+                session=session,
             )
         except RequestError as error:
             return service.error(error)
@@ -51,6 +51,8 @@ account_config_dialog = Dialog(
 ├ <b>Активен:</b> <code>{{ 'Да' if is_autosync else 'Нет' }}</code>
 └ <b>Следующий запуск:</b> <code>{{ 'Неизвестно' if not next_run_autosync else next_run_autosync }}</code>
 
+📊 <b>Уведомления сводкой:</b> <code>{{ 'Да' if is_digest_notifications else 'Нет' }}</code>
+
 🌐 <b>Прокси</b>
 {% if proxy is none or not proxy.is_active %}
 └ ❗️ Не удалось <b>подключиться к прокси</b>.
@@ -80,6 +82,18 @@ account_config_dialog = Dialog(
                 id="start_proxy",
                 on_click=handlers.on_start_account_config_proxy_dialog,
             ),
+            Button(
+                Case(
+                    {
+                        None: Const("⚠️ Сводка"),
+                        True: Const("📊 Сводка"),
+                        False: Const("🔔 Каждое событие"),
+                    },
+                    selector="is_digest_notifications",
+                ),
+                id="digest_notifications",
+                on_click=handlers.on_button_set_any_notifications,
+            ),
             width=2,
         ),
         Button(
@@ -124,6 +138,7 @@ account_autofarm_config_dialog = Dialog(
 ├ <b>Активен:</b> <code>{{ 'Да' if is_autofarm else 'Нет' }}</code>
 ├ <b>Уведомления:</b> <code>{{ 'Да' if is_autofarm_notifications else 'Нет' }}</code>
 ├ <b>Интервал запуска:</b> <code>{{ "{:,}".format((config.autofarm_interval // 60) | int) }}</code> мин.
+├ <b>Запуск при энергии:</b> <code>{{ config.autofarm_fill_percent }}%</code>
 └ <b>Следующий запуск:</b> <code>{{ 'Неизвестно' if not next_run_autofarm else next_run_autofarm }}</code>
             """
         ),
@@ -155,6 +170,15 @@ account_autofarm_config_dialog = Dialog(
             when="is_proxy_active",
             width=2,
         ),
+        Radio(
+            Format("☑️ {item}%"),
+            Format("⚪️ {item}%"),
+            id="autofarm_fill_percent",
+            item_id_getter=lambda x: x,
+            items=["50", "75", "90", "100"],
+            type_factory=int,
+            on_click=handlers.on_button_set_autofarm_fill_percent,
+        ),
         BACK_DIALOG_BUTTON,
         getter=getters.get_account_config,
         state=states.AccountConfigAutofarmDialog.INFO,
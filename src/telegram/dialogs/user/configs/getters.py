@@ -1,18 +1,15 @@
 from typing import Any, Optional
 
 from aiogram_dialog import DialogManager
-from aiohttp_socks import ProxyConnector
 from apscheduler import AsyncScheduler, Schedule
 from babel.dates import format_datetime, get_timezone
 
-from src.app_config import AppConfig
 from src.database import Repository, UoW
 from src.database.models import DBAccount, DBAccountConfig, DBAccountProxy
 from src.enums import SchedulerActions, TaskIds
 from src.utils.formatters import calculate_profit_upgrades
 from src.hamster import (
     generate_schedule_id,
-    HamsterKombat,
     HamsterUpgrade,
     process_schedule,
 )
@@ -33,8 +30,6 @@ async def get_account_configs(dialog_manager: DialogManager, **_):
 async def get_account_config(dialog_manager: DialogManager, **_):
     repo: Repository = dialog_manager.middleware_data["repo"]
     uow: UoW = dialog_manager.middleware_data["uow"]
-    config: AppConfig = dialog_manager.middleware_data["config"]
-    hamster: HamsterKombat = dialog_manager.middleware_data["hamster"]
     sched: AsyncScheduler = dialog_manager.middleware_data["sched"]
     account_id: int = dialog_manager.start_data["account_id"]
     account: DBAccount = await repo.accounts.get_one(
@@ -45,17 +40,6 @@ async def get_account_config(dialog_manager: DialogManager, **_):
     account_proxy: Optional[DBAccountProxy] = await repo.proxies.get_one(
         config_id=account.config.id
     )
-    if account_proxy and account_proxy.is_active:
-        proxy_connector: ProxyConnector = ProxyConnector.from_url(account_proxy.url)
-        is_proxy_active: bool = await hamster.check_proxy(
-            proxy_connector=proxy_connector,
-            real_ip=config.common.server_ip,
-            response_timeout=account_proxy.timeout,
-        )
-        if account_proxy.is_active != is_proxy_active:
-            account_proxy.set_data(is_active=is_proxy_active)
-            await uow.add(account_proxy, commit=True)
-
     autofarm_schedule: Optional[Schedule] = await process_schedule(
         sched=sched,
         action=SchedulerActions.GET,
@@ -103,6 +87,10 @@ async def get_account_config(dialog_manager: DialogManager, **_):
     if widget:
         await widget.set_checked(account_config.limit_percent)
 
+    widget: Any = dialog_manager.find("autofarm_fill_percent")
+    if widget:
+        await widget.set_checked(account_config.autofarm_fill_percent)
+
     return {
         "account": account,
         "config": account_config,
@@ -112,6 +100,7 @@ async def get_account_config(dialog_manager: DialogManager, **_):
         "is_autoupgrade_notifications": account_config.is_autoupgrade_notifications,
         "is_autosync": account_config.is_autosync,
         "is_autosync_notifications": account_config.is_autosync_notifications,
+        "is_digest_notifications": account_config.is_digest_notifications,
         "next_run_autofarm": (
             format_datetime(
                 autofarm_schedule.next_fire_time,
@@ -1,5 +1,6 @@
 import asyncio
 import random
+from datetime import datetime
 from typing import Any, Optional
 
 from aiogram import Bot
@@ -8,7 +9,6 @@ from aiogram.types import CallbackQuery, Message
 from aiogram_dialog import DialogManager, ShowMode
 from aiogram_dialog.widgets.input import MessageInput
 from aiogram_dialog.widgets.kbd import Button, ManagedCheckbox, ManagedRadio
-from aiohttp_socks import ProxyConnector
 from apscheduler import AsyncScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
@@ -20,6 +20,7 @@ from src.hamster import (
     add_schedule,
     generate_schedule_id,
     HamsterKombat,
+    HamsterSession,
     process_schedule,
     RequestError,
 )
@@ -27,6 +28,7 @@ from src.telegram.dialogs import states
 from src.telegram.dialogs.common import texts as common_texts
 from src.telegram.dialogs.user.accounts.handlers import (
     disable_account_proxy,
+    ensure_user_agent,
     sync_account,
     sync_tasks,
 )
@@ -141,6 +143,7 @@ async def on_button_set_autofarm(_: CallbackQuery, __: Button, manager: DialogMa
                     available_taps=account.available_taps,
                     max_taps=account.max_taps,
                     taps_recover_per_sec=account.taps_recover_per_sec,
+                    fill_percent=account.config.autofarm_fill_percent,
                 ),
             ),
             schedule_id=schedule_id,
@@ -181,6 +184,10 @@ async def on_button_set_any_notifications(
         account.config.set_autosync_notifications(
             is_autosync_notifications=not account.config.is_autosync_notifications
         )
+    elif widget_id == "digest_notifications":
+        account.config.set_digest_notifications(
+            is_digest_notifications=not account.config.is_digest_notifications
+        )
     else:
         return await manager.event.answer(common_texts.ERROR_TEXT)
 
@@ -319,6 +326,19 @@ async def on_button_set_autoupgrade_limit(
     await uow.add(account.config, commit=True)
 
 
+async def on_button_set_autofarm_fill_percent(
+    _: CallbackQuery, __: ManagedRadio, manager: DialogManager, percent: int
+):
+    repo: Repository = manager.middleware_data["repo"]
+    uow: UoW = manager.middleware_data["uow"]
+    account_id: int = manager.start_data["account_id"]
+    account: Optional[DBAccount] = await repo.accounts.get_one(
+        DBAccount.config, account_id=account_id
+    )
+    account.config.set_autofarm_fill_percent(autofarm_fill_percent=percent)
+    await uow.add(account.config, commit=True)
+
+
 async def on_button_set_autosync_all(
     _: CallbackQuery, checkbox: ManagedCheckbox, manager: DialogManager
 ):
@@ -439,15 +459,17 @@ async def on_button_check_proxy(_: CallbackQuery, __: Button, manager: DialogMan
     if account_proxy is None:
         return await manager.event.answer(common_texts.PROXY_NOT_FOUND_TEXT)
 
-    proxy_connector: ProxyConnector = ProxyConnector.from_url(account_proxy.url)
-    if not await hamster.check_proxy(
-        proxy_connector=proxy_connector,
+    latency: Optional[float] = await hamster.measure_proxy(
+        proxy_url=account_proxy.url,
         real_ip=config.common.server_ip,
         response_timeout=account_proxy.timeout,
-    ):
+    )
+    if latency is None:
         return await manager.event.answer(common_texts.BAD_PROXY_DATA_TEXT)
     else:
-        account_proxy.set_data(is_active=True)
+        account_proxy.set_data(
+            is_active=True, checked_at=datetime.now(), latency=latency, failures=0
+        )
         await uow.add(account_proxy, commit=True)
         return await manager.event.answer(common_texts.SUCCESS_TEXT)
 
@@ -494,9 +516,8 @@ async def on_input_proxy_data(_: Message, __: MessageInput, manager: DialogManag
     if proxy_data is None:
         return await manager.event.answer(common_texts.INCORRECT_PROXY_DATA_TEXT)
 
-    proxy_connector: ProxyConnector = ProxyConnector.from_url(proxy_data.url)
     if not await hamster.check_proxy(
-        proxy_connector=proxy_connector, real_ip=config.common.server_ip
+        proxy_url=proxy_data.url, real_ip=config.common.server_ip, use_cache=False
     ):
         return await manager.event.answer(common_texts.BAD_PROXY_DATA_TEXT)
 
@@ -517,6 +538,7 @@ async def on_input_proxy_data(_: Message, __: MessageInput, manager: DialogManag
             username=proxy_data.username,
             password=proxy_data.password,
             is_active=True,
+            failures=0,
         )
 
     await uow.add(account_proxy, commit=True)
@@ -575,9 +597,8 @@ async def claim_daily_reward_thread(
             account_proxy: Optional[DBAccountProxy] = await repo.proxies.get_one(
                 config_id=account.config.id
             )
-            proxy_connector: ProxyConnector = ProxyConnector.from_url(account_proxy.url)
             if not await hamster.check_proxy(
-                proxy_connector=proxy_connector,
+                proxy_url=account_proxy.url,
                 real_ip=config.common.server_ip,
                 response_timeout=account_proxy.timeout,
             ):
@@ -594,11 +615,15 @@ async def claim_daily_reward_thread(
                 )
                 continue
 
-            hamster.set_proxy(proxy_connector=proxy_connector)
+            session: HamsterSession = hamster.create_session(
+                proxy_url=account_proxy.url,
+                bearer_token=account.token,
+                user_agent=await ensure_user_agent(uow=uow, account=account),
+            )
 
             try:
                 task, hamster_data = await hamster.check_task(
-                    bearer_token=account.token, task_id=task_id
+                    session=session, task_id=task_id
                 )
                 if not task.is_completed:
                     is_not_completed_rewards += 1
@@ -610,7 +635,13 @@ async def claim_daily_reward_thread(
                 service.info(
                     "Task %s checked: %d | %s", task.type, account.id, account.full_name
                 )
-                await sync_tasks(repo=repo, uow=uow, account=account, hamster=hamster)
+                await sync_tasks(
+                    repo=repo,
+                    uow=uow,
+                    account=account,
+                    hamster=hamster,
+                    session=session,
+                )
                 await sync_account(uow=uow, account=account, hamster_data=hamster_data)
             except RequestError as error:
                 service.error(error)
@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import suppress
 from typing import Optional
 
@@ -17,9 +18,11 @@ from src.database.models import (
     DBUser,
 )
 from src.telegram.dialogs import states
+from src.telegram.delivery import Broadcaster, BroadcastProgress
 from src.telegram.dialogs.common import texts as common_texts
 from src.telegram.filters import IsAdminFilter
 from src.telegram.keyboards import build_reply_keyboard
+from src.utils.loggers import service
 from src.utils.redis import process_message
 
 user_router = Router()
@@ -105,15 +108,91 @@ async def on_set_account_limit(
     )
 
 
+_broadcast: Optional[asyncio.Task] = None
+
+
+def _build_broadcaster(dialog_manager: DialogManager) -> Broadcaster:
+    config: AppConfig = dialog_manager.middleware_data["config"]
+    return Broadcaster(
+        bot=dialog_manager.event.bot,
+        redis=dialog_manager.middleware_data["redis"],
+        session_pool=dialog_manager.middleware_data["db_session"],
+        page_size=config.telegram.broadcast_page_size,
+        concurrency=config.telegram.broadcast_concurrency,
+    )
+
+
+def _start_broadcast(broadcaster: Broadcaster, progress: BroadcastProgress) -> None:
+    global _broadcast
+
+    _broadcast = asyncio.create_task(
+        on_send_mailing_thread(broadcaster=broadcaster, progress=progress)
+    )
+
+
+async def on_send_mailing_thread(
+    broadcaster: Broadcaster, progress: BroadcastProgress
+) -> None:
+    try:
+        progress: BroadcastProgress = await broadcaster.run(progress)
+    except Exception as error:
+        service.exception("Broadcast failed: %s", error)
+        return await broadcaster.bot.send_message(
+            chat_id=progress.admin_id,
+            text="Broadcast interrupted, continue: /send_resume",
+        )
+
+    await broadcaster.bot.send_message(
+        chat_id=progress.admin_id,
+        text=f"Broadcast finished | delivered: {progress.delivered} | failed: {progress.failed}",
+    )
+
+
 @admin_router.message(Command("send"))
-async def on_send_mailing(_: Message, dialog_manager: DialogManager, repo: Repository):
-    text = dialog_manager.event.html_text.replace("/send", "")
+async def on_send_mailing(_: Message, dialog_manager: DialogManager):
+    text = dialog_manager.event.html_text.replace("/send", "", 1).strip()
     if not text:
         return
 
-    users: list[Optional[DBUser]] = await repo.users.get_all()
-    for user in users:
-        try:
-            await dialog_manager.event.bot.send_message(chat_id=user.id, text=text)
-        except:
-            pass
+    if _broadcast is not None and not _broadcast.done():
+        return await dialog_manager.event.answer("Broadcast is already running.")
+
+    broadcaster: Broadcaster = _build_broadcaster(dialog_manager)
+    progress: Optional[BroadcastProgress] = await broadcaster.load()
+    if progress is not None and not progress.is_finished:
+        return await dialog_manager.event.answer(
+            "Previous broadcast is not finished: /send_resume or /send_cancel"
+        )
+
+    _start_broadcast(
+        broadcaster=broadcaster,
+        progress=BroadcastProgress(
+            text=text, admin_id=dialog_manager.event.from_user.id
+        ),
+    )
+    return await dialog_manager.event.answer("Broadcast started.")
+
+
+@admin_router.message(Command("send_resume"))
+async def on_resume_mailing(_: Message, dialog_manager: DialogManager):
+    if _broadcast is not None and not _broadcast.done():
+        return await dialog_manager.event.answer("Broadcast is already running.")
+
+    broadcaster: Broadcaster = _build_broadcaster(dialog_manager)
+    progress: Optional[BroadcastProgress] = await broadcaster.load()
+    if progress is None or progress.is_finished:
+        return await dialog_manager.event.answer("Nothing to resume.")
+
+    _start_broadcast(broadcaster=broadcaster, progress=progress)
+    return await dialog_manager.event.answer(
+        f"Broadcast resumed | delivered: {progress.delivered} | failed: {progress.failed}"
+    )
+
+
+@admin_router.message(Command("send_cancel"))
+async def on_cancel_mailing(_: Message, dialog_manager: DialogManager):
+    if _broadcast is not None and not _broadcast.done():
+        _broadcast.cancel()
+
+    await _build_broadcaster(dialog_manager).clear()
+    return await dialog_manager.event.answer("Broadcast cancelled.")
@@ -1,13 +1,26 @@
 import random
-from typing import Optional
+from typing import Final, Optional
+
+MIN_AUTOFARM_INTERVAL: Final[int] = 300
 
 
 def calculate_autofarm_interval(
     available_taps: Optional[int] = None,
     max_taps: Optional[int] = None,
     taps_recover_per_sec: Optional[int] = None,
+    fill_percent: Optional[int] = 90,
 ) -> int:
-    """Calculate autofarm interval, return seconds"""
-    _, _, _ = available_taps, max_taps, taps_recover_per_sec
-    # cr = (max_taps - available_taps) // taps_recover_per_sec
-    return random.randint(523, 1291)
+    """
+    Calculate autofarm interval, return seconds.
+
+    The next run is planned for the moment the energy recovers to
+    ``fill_percent`` of ``max_taps``. Without the tap data a random interval
+    is returned.
+    """
+    if not max_taps or not taps_recover_per_sec:
+        return random.randint(523, 1291)
+
+    target_taps: float = max_taps * (fill_percent or 100) / 100
+    seconds: float = max(target_taps - (available_taps or 0), 0) / taps_recover_per_sec
+    # A small jitter keeps the accounts from tapping at the same moment.
+    return max(int(seconds * random.uniform(1.0, 1.1)), MIN_AUTOFARM_INTERVAL)
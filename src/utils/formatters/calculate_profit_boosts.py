@@ -28,15 +28,15 @@ def calculate_profit_upgrades(
         if best_upgrade:
             profit_upgrades.append(
                 HamsterUpgrade(
-                    id=best_upgrade.type,
+                    type=best_upgrade.type,
                     section=best_upgrade.section,
                     level=best_upgrade.level,
                     price=best_upgrade.price,
-                    profitPerTime=min_ratio,
-                    profitPerTap=best_upgrade.profit_per_hour,
-                    isExpired=best_upgrade.is_expired,
-                    isAvailable=best_upgrade.is_active,
-                    lastUpgradeAt=best_upgrade.last_upgrade_at,
+                    profit_per_time=min_ratio,
+                    profit_per_hour=best_upgrade.profit_per_hour,
+                    is_expired=best_upgrade.is_expired,
+                    is_active=best_upgrade.is_active,
+                    last_upgrade_at=best_upgrade.last_upgrade_at,
                 )
             )
 
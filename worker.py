@@ -0,0 +1,19 @@
+import asyncio
+
+from aiogram import Bot
+
+from src.app_config import AppConfig
+from src.factory import create_bot
+from src.runners import run_worker
+from src.utils.loggers import setup_logger
+
+
+async def main() -> None:
+    setup_logger()
+    config: AppConfig = AppConfig.create()
+    bot: Bot = create_bot(config=config)
+    return await run_worker(bot=bot, config=config)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())